@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Per-step bookkeeping overhead of the autonomous executor: the old shell-out
+commands against the in-process GitRepo helper.
+
+Each simulated step writes one file, checks repository health, commits, reads
+HEAD and its tree for the step ledger, and samples disk and memory usage the way
+the health check does. Step execution and builds are left out, so the numbers are
+pure overhead.
+
+    python benchmarks/bench_executor_git.py --steps 100
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+from git_ops import GitRepo
+
+def sh(command: str, cwd: Path) -> str:
+    result = subprocess.run(command, shell=True, capture_output=True, text=True, cwd=cwd)
+    if result.returncode:
+        raise RuntimeError(f"{command}: {result.stderr}")
+    return result.stdout
+
+def shell_step(repo: Path, index: int):
+    """The executor's per-step commands before the in-process rewrite."""
+    (repo / f"file_{index}.swift").write_text(f"// step {index}\n")
+    sh(f"cd {repo} && git status", repo)
+    (repo / "commit_message.txt").write_text(f"Step {index}\n")
+    sh(f"cd {repo} && git add . && git commit -F commit_message.txt && rm commit_message.txt", repo)
+    sh(f"cd {repo} && git rev-parse HEAD 'HEAD^{{tree}}'", repo)
+    sh("df -h . | tail -1", repo)
+    sh("ps -o rss= -p $$", repo)
+
+def inprocess_step(git: GitRepo, index: int):
+    """The same bookkeeping through GitRepo and the stdlib."""
+    (git.path / f"file_{index}.swift").write_text(f"// step {index}\n")
+    git.is_healthy()
+    git.commit(f"Step {index}\n", allow_empty=True)
+    git.head_commit(), git.head_tree()
+    shutil.disk_usage(git.path)
+    memory_usage_kb()
+
+def memory_usage_kb() -> int:
+    """Same source as AutonomousExecutor._memory_usage_mb."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def fresh_repo(root: Path, name: str) -> Path:
+    repo = root / name
+    repo.mkdir()
+    sh("git init -q && git config user.name bench && git config user.email bench@example.com", repo)
+    return repo
+
+def measure(label: str, run_step, steps: int):
+    timings = []
+    for index in range(steps):
+        start = time.perf_counter()
+        run_step(index)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<12} mean {statistics.mean(timings):7.2f} ms/step   "
+          f"median {statistics.median(timings):7.2f}   p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.2f}")
+    return statistics.mean(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=100, help="Simulated steps per variant (default: 100)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        shell_repo = fresh_repo(root, "shell")
+        git = GitRepo(fresh_repo(root, "inprocess"))
+        try:
+            before = measure("shell-out", lambda i: shell_step(shell_repo, i), args.steps)
+            after = measure("in-process", lambda i: inprocess_step(git, i), args.steps)
+        finally:
+            git.close()
+
+    print(f"saved {before - after:.2f} ms/step ({1 - after / before:.0%}), "
+          f"{(before - after) * 400 / 1000:.1f} s over 400 steps")
+
+if __name__ == "__main__":
+    main()
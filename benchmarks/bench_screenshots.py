@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compare one-browser-per-URL screenshots (take_screenshot_sync in a loop) with the
+batch take_screenshots API, against a local static HTTP server.
+
+    python benchmarks/bench_screenshots.py --pages 20 --max-concurrent 4
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_support import serve_directory
+from screenshot_utils import take_screenshot_sync, take_screenshots_sync
+
+PAGE_TEMPLATE = """<!doctype html>
+<html><head><title>Fixture {n}</title></head>
+<body style="font-family: sans-serif">
+<h1>Fixture page {n}</h1>
+{paragraphs}
+</body></html>
+"""
+
+def write_fixture_pages(directory: Path, count: int):
+    for n in range(count):
+        paragraphs = "\n".join(f"<p>Paragraph {i} of page {n}.</p>" for i in range(40))
+        (directory / f"page{n}.html").write_text(PAGE_TEMPLATE.format(n=n, paragraphs=paragraphs))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark screenshot throughput")
+    parser.add_argument("--pages", type=int, default=10, help="Number of URLs (default: 10)")
+    parser.add_argument("--max-concurrent", type=int, default=4, help="Batch page pool size (default: 4)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site, tempfile.TemporaryDirectory() as out:
+        write_fixture_pages(Path(site), args.pages)
+        server = serve_directory(Path(site))
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/page{n}.html" for n in range(args.pages)]
+        try:
+            start = time.perf_counter()
+            for n, url in enumerate(urls):
+                take_screenshot_sync(url, str(Path(out) / f"seq{n}.png"))
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            records = take_screenshots_sync(urls, str(Path(out) / "batch"), max_concurrent=args.max_concurrent)
+            batch = time.perf_counter() - start
+        finally:
+            server.shutdown()
+
+    failures = sum(1 for record in records if record["error"])
+    print(f"sequential take_screenshot_sync: {sequential:7.2f}s  ({args.pages / sequential:6.2f} pages/s)")
+    print(f"batch take_screenshots:          {batch:7.2f}s  ({args.pages / batch:6.2f} pages/s)  failures={failures}")
+    print(f"speedup: {sequential / batch:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare calling search_engine.search() in-process with the old usage of running
+tools/search_engine.py in a subprocess and regex-parsing its text output.
+
+The DuckDuckGo backend is replaced by a stub in both cases, so the numbers measure
+only the calling overhead (interpreter startup, imports, printing and parsing).
+
+    python benchmarks/bench_search_inprocess.py --iterations 20
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_support import install_search_stub
+
+RESULT_PATTERN = re.compile(r"URL: (.*)\nTitle: (.*)\nSnippet: (.*)")
+
+def run_child(argv):
+    """Subprocess entry point: behave exactly like tools/search_engine.py over the stub."""
+    search_engine = install_search_stub()
+    sys.argv = ["search_engine.py"] + argv
+    search_engine.main()
+
+def bench_subprocess(query, max_results, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", query, "--max-results", str(max_results), "--no-cache"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results = [{"href": m[0], "title": m[1], "body": m[2]} for m in RESULT_PATTERN.findall(output)]
+        timings.append(time.perf_counter() - start)
+        assert len(results) == max_results
+    return timings
+
+def bench_inprocess(query, max_results, iterations):
+    search_engine = install_search_stub()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        results = search_engine.search(query, max_results=max_results)
+        timings.append(time.perf_counter() - start)
+        assert len(results) == max_results
+    return timings
+
+def report(name, timings):
+    print(f"{name:<24} median {statistics.median(timings) * 1000:9.3f} ms   "
+          f"mean {statistics.mean(timings) * 1000:9.3f} ms   n={len(timings)}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        run_child(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark in-process search() against subprocess-and-parse")
+    parser.add_argument("--iterations", type=int, default=10, help="Calls per mode (default: 10)")
+    parser.add_argument("--max-results", type=int, default=10, help="Results per call (default: 10)")
+    args = parser.parse_args()
+
+    query = "summit fitness tracking"
+    subprocess_timings = bench_subprocess(query, args.max_results, args.iterations)
+    inprocess_timings = bench_inprocess(query, args.max_results, args.iterations)
+
+    report("subprocess + parse", subprocess_timings)
+    report("in-process search()", inprocess_timings)
+    speedup = statistics.median(subprocess_timings) / max(statistics.median(inprocess_timings), 1e-9)
+    print(f"speedup: {speedup:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Fixtures shared by the benchmarks: the saved page corpus, a local static HTTP
+server, an OpenAI-compatible fake LLM server and a stub DuckDuckGo backend, so
+every benchmark runs offline and measures our code rather than the network.
+"""
+
+import functools
+import http.server
+import json
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+PAGES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def serve_directory(directory: Path) -> http.server.ThreadingHTTPServer:
+    """Serve `directory` on an ephemeral 127.0.0.1 port from a daemon thread."""
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def server_url(server: http.server.HTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+def fixture_pages() -> Dict[str, str]:
+    """The saved page corpus, by file name."""
+    return {path.name: path.read_text() for path in sorted(PAGES_DIR.glob("*.html"))}
+
+class _FakeLLMHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like a real provider, so client connection reuse shows up
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.requests += 1
+        prompt = request["messages"][-1]["content"]
+        text = prompt if isinstance(prompt, str) else " ".join(part.get("text", "") for part in prompt)
+        body = json.dumps({
+            "id": f"fake-{self.server.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f"echo: {text[:200]}"}}],
+            "usage": {"prompt_tokens": len(text.split()), "completion_tokens": 3, "total_tokens": len(text.split()) + 3},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve_fake_llm(latency: float = 0.0) -> http.server.ThreadingHTTPServer:
+    """
+    OpenAI-compatible /v1/chat/completions endpoint that echoes the prompt.
+
+    Point llm_api's "local" provider at it with LOCAL_LLM_BASE_URL=<server_url>/v1.
+    `latency` adds a fixed server-side delay per request.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FakeLLMHandler)
+    server.latency = latency
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class StubDDGS:
+    """Stands in for duckduckgo_search.DDGS and answers instantly."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def text(self, query, region=None, max_results=10, **kwargs):
+        return [
+            {"href": f"https://example.com/{i}", "title": f"Result {i} for {query}", "body": f"Snippet {i}"}
+            for i in range(max_results)
+        ]
+
+def install_search_stub():
+    """Swap search_engine's backend for StubDDGS and lift its rate limit; returns the module."""
+    import search_engine
+    search_engine.DDGS = StubDDGS
+    search_engine.configure_governor(rate=1e9, burst=10 ** 9)
+    return search_engine
+
+def time_calls(function: Callable[[], object], iterations: int, warmup: int = 1) -> List[float]:
+    """Seconds taken by each of `iterations` calls of `function`, after `warmup` untimed calls."""
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def summarize(timings: List[float]) -> Dict:
+    """Milliseconds per call: median (the figure regressions are judged on), mean, p95 and spread."""
+    ordered = sorted(timings)
+    return {
+        "iterations": len(timings),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+    }
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Cross-tool benchmark suite with JSON baselines.
+
+Everything runs offline against the fixtures in bench_support.py:
+
+    parse_html/*          web_scraper.parse_html on each saved page in fixtures/pages
+    process_urls/*        the scraper against a local static server, with a browser per
+                          call (CLI) and with a shared browser and pool (tool server)
+    take_screenshot/*     the same for a single full-page screenshot
+    query_llm/*           llm_api's "local" provider against a fake OpenAI-compatible server,
+                          with the shared client and with a new client per call
+    search_with_retry     search_engine over the stub DuckDuckGo backend
+    executor_step         autonomous executor bookkeeping per step, with stub step bodies
+                          and `true` as the build command
+
+Browser cases are skipped when Playwright's browser is not installed.
+
+    python benchmarks/run_benchmarks.py --save-baseline          # record this machine's baseline
+    python benchmarks/run_benchmarks.py                          # compare against it
+    python benchmarks/run_benchmarks.py --only parse_html --threshold 10
+
+A case regresses when its median and its fastest call are both more than
+--threshold percent slower than the baseline (and the median by more than
+--min-delta-ms); the exit status is 1 if any case does. A slower median alone is
+reported as "noisy".
+Baselines are per machine (benchmarks/baselines/<hostname>.json by default), since
+timings from different hardware are not comparable.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import bench_support
+from bench_support import fixture_pages, install_search_stub, serve_directory, serve_fake_llm, server_url, \
+    summarize, time_calls
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_THRESHOLD = 20.0  # Percent slower than baseline that counts as a regression
+DEFAULT_MIN_DELTA_MS = 0.05  # Ignore changes smaller than this; sub-0.1 ms medians are mostly noise
+
+class Skipped(Exception):
+    """A case that cannot run here (e.g. no browser installed)."""
+
+BENCHMARKS: Dict[str, Callable[[int], Dict[str, List[float]]]] = {}
+
+def benchmark(name: str):
+    """Register a case; it takes the iteration count and returns timings per result name."""
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+@benchmark("parse_html")
+def bench_parse_html(iterations: int) -> Dict[str, List[float]]:
+    from web_scraper import parse_html
+    return {f"parse_html/{Path(name).stem}": time_calls(lambda html=html: parse_html(html), iterations)
+            for name, html in fixture_pages().items()}
+
+async def _launch_browser():
+    from playwright.async_api import async_playwright
+    playwright = await async_playwright().start()
+    try:
+        return playwright, await playwright.chromium.launch(headless=True)
+    except Exception as e:
+        await playwright.stop()
+        raise Skipped(f"browser unavailable: {str(e).splitlines()[0]}")
+
+async def _time_async(function, iterations: int) -> List[float]:
+    await function()  # Warm-up
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+@benchmark("process_urls")
+def bench_process_urls(iterations: int) -> Dict[str, List[float]]:
+    from multiprocessing import Pool
+    from web_scraper import process_urls
+
+    server = serve_directory(bench_support.PAGES_DIR)
+    urls = [f"{server_url(server)}/{name}" for name in fixture_pages()]
+    iterations = max(3, iterations // 4)
+
+    async def run():
+        playwright, browser = await _launch_browser()
+        try:
+            with Pool() as pool:
+                return {
+                    "process_urls/per_call_browser": await _time_async(lambda: process_urls(urls), iterations),
+                    "process_urls/shared_browser": await _time_async(
+                        lambda: process_urls(urls, browser=browser, pool=pool), iterations),
+                }
+        finally:
+            await browser.close()
+            await playwright.stop()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        server.shutdown()
+
+@benchmark("take_screenshot")
+def bench_take_screenshot(iterations: int) -> Dict[str, List[float]]:
+    from screenshot_utils import take_screenshot
+
+    server = serve_directory(bench_support.PAGES_DIR)
+    url = f"{server_url(server)}/docs_article.html"
+    iterations = max(3, iterations // 4)
+
+    async def run(output: str):
+        playwright, browser = await _launch_browser()
+        try:
+            return {
+                "take_screenshot/per_call_browser": await _time_async(lambda: take_screenshot(url, output), iterations),
+                "take_screenshot/shared_browser": await _time_async(
+                    lambda: take_screenshot(url, output, browser=browser), iterations),
+            }
+        finally:
+            await browser.close()
+            await playwright.stop()
+
+    try:
+        with tempfile.TemporaryDirectory() as out:
+            return asyncio.run(run(str(Path(out) / "shot.png")))
+    finally:
+        server.shutdown()
+
+@benchmark("query_llm")
+def bench_query_llm(iterations: int) -> Dict[str, List[float]]:
+    server = serve_fake_llm()
+    os.environ["LOCAL_LLM_BASE_URL"] = f"{server_url(server)}/v1"
+    try:
+        from llm_api import create_llm_client, query_llm
+        prompt = "Summarize the SwiftUI state management guidelines in one sentence."
+
+        def shared_client():
+            assert query_llm(prompt, provider="local", model="fake")
+
+        def new_client():
+            assert query_llm(prompt, create_llm_client("local"), model="fake", provider="local")
+
+        return {
+            "query_llm/shared_client": time_calls(shared_client, iterations),
+            "query_llm/new_client": time_calls(new_client, iterations),
+        }
+    finally:
+        server.shutdown()
+
+@benchmark("search_with_retry")
+def bench_search_with_retry(iterations: int) -> Dict[str, List[float]]:
+    search_engine = install_search_stub()
+    return {"search_with_retry": time_calls(
+        lambda: search_engine.search_with_retry("summit fitness tracking", max_results=10), iterations)}
+
+@benchmark("executor_step")
+def bench_executor_step(iterations: int) -> Dict[str, List[float]]:
+    import autonomous_executor
+
+    timings = []
+
+    class StubStepExecutor(autonomous_executor.AutonomousExecutor):
+        """Every step writes one file (a Swift file every third step, so builds run) and succeeds."""
+
+        def _execute_step(self, phase, step):
+            name = f"SummitAI/P{phase}S{step}.swift" if step % 3 == 0 else f"docs/p{phase}_s{step}.md"
+            path = self.project_root / "SummitAI" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"// Phase {phase}.Step {step}\n")
+            return True, f"Phase {phase}.Step {step}", [str(path.relative_to(self.project_root))]
+
+        def _execute_step_with_recovery(self, phase, step):
+            start = time.perf_counter()
+            try:
+                return super()._execute_step_with_recovery(phase, step)
+            finally:
+                timings.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        repo = root / "SummitAI"
+        repo.mkdir()
+        for command in (["init", "-q"], ["config", "user.name", "bench"], ["config", "user.email", "bench@example.com"],
+                        ["commit", "-q", "--allow-empty", "-m", "Initial commit"]):
+            subprocess.run(["git", *command], cwd=repo, check=True)
+        executor = StubStepExecutor(str(root), build_command="true")
+        try:
+            # Phase 1 sets up the Xcode project; later phases are plain steps
+            for phase in range(2, executor.context["total_phases"] + 1):
+                if not executor.execute_phase(phase):
+                    raise RuntimeError(f"Stub phase {phase} failed")
+                if len(timings) >= iterations:
+                    break
+        finally:
+            executor.git.close()
+            executor.command_runner.close()
+    return {"executor_step": timings}
+
+def run_benchmarks(names: List[str], iterations: int) -> Dict[str, Dict]:
+    results = {}
+    for name in names:
+        start = time.perf_counter()
+        try:
+            timings = BENCHMARKS[name](iterations)
+        except Skipped as e:
+            results[name] = {"skipped": str(e)}
+            print(f"{name:<36} skipped: {e}", file=sys.stderr)
+            continue
+        for case, case_timings in timings.items():
+            results[case] = summarize(case_timings)
+        print(f"{name:<36} done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return results
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            min_delta_ms: float) -> List[Dict]:
+    """One row per case with the median change against the baseline and a status."""
+    rows = []
+    for case, result in results.items():
+        row = {"case": case, "median_ms": result.get("median_ms"), "baseline_ms": None, "change_pct": None}
+        base = baseline.get(case, {})
+        if "skipped" in result:
+            row["status"] = "skipped"
+        elif "median_ms" not in base:
+            row["status"] = "new"
+        else:
+            row["baseline_ms"] = base["median_ms"]
+            delta = result["median_ms"] - base["median_ms"]
+            row["change_pct"] = round(100 * delta / base["median_ms"], 1) if base["median_ms"] else 0.0
+            # The fastest call must move too, so one noisy stretch of a run is not flagged
+            min_change_pct = 100 * (result["min_ms"] - base["min_ms"]) / base["min_ms"] if base.get("min_ms") else 0.0
+            if abs(delta) < min_delta_ms or abs(row["change_pct"]) <= threshold:
+                row["status"] = "ok"
+            elif delta > 0:
+                row["status"] = "REGRESSION" if min_change_pct > threshold else "noisy"
+            else:
+                row["status"] = "improved"
+        rows.append(row)
+    return rows
+
+def print_report(rows: List[Dict]):
+    print(f"{'case':<36} {'median ms':>11} {'baseline ms':>12} {'change':>8}  status")
+    for row in rows:
+        median = f"{row['median_ms']:.3f}" if row["median_ms"] is not None else "-"
+        base = f"{row['baseline_ms']:.3f}" if row["baseline_ms"] is not None else "-"
+        change = f"{row['change_pct']:+.1f}%" if row["change_pct"] is not None else "-"
+        print(f"{row['case']:<36} {median:>11} {base:>12} {change:>8}  {row['status']}")
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.time(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+    }
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def main():
+    # Keep tool warnings and HTTP client chatter out of the report
+    logging.basicConfig(level=logging.ERROR)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS),
+                        help="Run only this benchmark; repeat for several (default: all)")
+    parser.add_argument("--iterations", type=int, default=20,
+                        help="Timed calls per case; browser cases use a quarter of this (default: 20)")
+    parser.add_argument("--baseline", type=Path, default=BASELINES_DIR / f"{platform.node() or 'default'}.json",
+                        help="Baseline to compare against or save to (default: baselines/<hostname>.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write these results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Percent slowdown that counts as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f"Ignore median changes smaller than this (default: {DEFAULT_MIN_DELTA_MS})")
+    parser.add_argument("--output", type=Path, help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only or list(BENCHMARKS), args.iterations)
+    report = {"environment": environment(), "iterations": args.iterations, "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) or {"results": {}}
+        # Cases not run this time keep their previous baseline
+        report["results"] = {**baseline["results"], **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        tmp = args.baseline.with_suffix(".tmp")
+        tmp.write_text(json.dumps(report, indent=2) + "\n")
+        tmp.replace(args.baseline)
+        print_report(compare(results, {}, args.threshold, args.min_delta_ms))
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one", file=sys.stderr)
+    rows = compare(results, (baseline or {}).get("results", {}), args.threshold, args.min_delta_ms)
+    print_report(rows)
+    regressions = [row["case"] for row in rows if row["status"] == "REGRESSION"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:g}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -15,8 +15,10 @@ MISSION: Complete 400-step SummitAI mountain climbing fitness app development
 
 import os
 import sys
+import glob
+import shutil
+import resource
 import time
-import subprocess
 import json
 import logging
 from datetime import datetime
@@ -24,7 +26,18 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import signal
 import threading
-import queue
+import argparse
+
+from execution_profile import ExecutionProfiler, load_records
+from llm_step_executor import LLMStepExecutor
+from git_ops import GitError, GitRepo
+from command_runner import CommandRunner
+from build_validation import SourceTreeHasher, ValidationCache, touches_sources
+from step_ledger import StepLedger
+from step_registry import StepRegistry, step_handler
+from schedule_simulation import build_profiles, load_config, simulate_schedule
+from step_scheduler import PHASE_SETUP_STEPS, DagScheduler, build_step_graph, critical_path_report
+from tool_logging import configure_logging
 
 # EMBEDDED EXECUTION CONTEXT - CRITICAL FOR CONTEXT PRESERVATION
 EXECUTION_CONTEXT = {
@@ -66,17 +79,90 @@ PHASE_DESCRIPTIONS = {
     20: "Launch Preparation & App Store Readiness"
 }
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('autonomous_execution.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+# EMBEDDED STEP DESCRIPTIONS - used where the execution plan has no "### Step P.S" section
+DEFAULT_STEP_DESCRIPTIONS = {
+    # Phase 1: Project Foundation
+    (1, 1): "Initialize Git repository and project structure",
+    (1, 2): "Set up GitHub repository and CI/CD",
+    (1, 3): "Configure Swift package dependencies",
+    (1, 4): "Set up project configuration files",
+    (1, 5): "Create design system foundation",
+    (1, 6): "Implement common extensions and utilities",
+    (1, 7): "Set up error handling system",
+    (1, 8): "Create networking layer foundation",
+    (1, 9): "Set up logging and analytics",
+    (1, 10): "Configure build settings and schemes",
+    (1, 11): "Create test target and basic tests",
+    (1, 12): "Set up code signing and provisioning",
+    (1, 13): "Configure app icons and launch screen",
+    (1, 14): "Set up localization framework",
+    (1, 15): "Create accessibility foundation",
+    (1, 16): "Set up performance monitoring",
+    (1, 17): "Configure security settings",
+    (1, 18): "Set up documentation structure",
+    (1, 19): "Create development tools and scripts",
+    (1, 20): "Complete project foundation validation",
+    
+    # Phase 2: Swift Package Dependencies
+    (2, 1): "Add Firebase SDK dependencies",
+    (2, 2): "Add Superwall SDK for paywalls",
+    (2, 3): "Add HealthKit framework integration",
+    (2, 4): "Add Combine framework setup",
+    (2, 5): "Add SwiftUI extensions and utilities",
+    (2, 6): "Add networking and API dependencies",
+    (2, 7): "Add testing framework dependencies",
+    (2, 8): "Add analytics and monitoring tools",
+    (2, 9): "Add security and encryption libraries",
+    (2, 10): "Add image processing dependencies",
+    (2, 11): "Add data persistence frameworks",
+    (2, 12): "Add UI/UX enhancement libraries",
+    (2, 13): "Add accessibility support frameworks",
+    (2, 14): "Add localization and internationalization",
+    (2, 15): "Add performance optimization tools",
+    (2, 16): "Add debugging and development tools",
+    (2, 17): "Add backup and sync frameworks",
+    (2, 18): "Add push notification dependencies",
+    (2, 19): "Add social sharing frameworks",
+    (2, 20): "Validate all package dependencies"
+}
+
+# STEP MEMOIZATION - bump when step implementations change so recorded steps re-run
+STEP_GENERATOR_VERSION = 1
+
+# ERROR RECOVERY - escalates one tier per failed attempt:
+#   retry    - run the failed part again with no cleanup (the build, if validation failed)
+#   rollback - restore only the files the step touched, then re-run the step
+#   clean    - remove DerivedData, clean the build and reset the working tree
+RECOVERY_TIERS = ("retry", "rollback", "clean")
+
+# BUILD VALIDATION - {action} is "build", "clean build" or "clean". Override with the
+# SUMMITAI_BUILD_COMMAND environment variable (e.g. a stub script on machines without Xcode).
+DEFAULT_BUILD_COMMAND = (
+    "xcodebuild -project SummitAI.xcodeproj -scheme SummitAI "
+    "-destination 'platform=iOS Simulator,name=iPhone 15 Pro' {action}"
 )
+
+# COMMIT GRANULARITY - commit every N steps (1: every step) or, with COMMIT_EVERY_PHASE, once per
+# phase. Steps in between are checkpointed: staged and written to a tree under CHECKPOINT_REF.
+# Override with --commit-every or the SUMMITAI_COMMIT_EVERY environment variable.
+COMMIT_EVERY_PHASE = 0
+CHECKPOINT_REF = "refs/executor/checkpoint"
+
+def parse_commit_every(value: str) -> int:
+    """Parse a --commit-every value: a positive step count or "phase"."""
+    if value == "phase":
+        return COMMIT_EVERY_PHASE
+    count = int(value)
+    if count < 1:
+        raise ValueError(f"commit interval must be at least 1 step, got {count}")
+    return count
+
 logger = logging.getLogger(__name__)
 
+def setup_logging(stream=None):
+    """Log to `stream` (default stdout) and autonomous_execution.log; called by main() and by shard worker processes."""
+    configure_logging(stream=stream or sys.stdout, log_file='autonomous_execution.log')
+
 class AutonomousExecutor:
     """Main autonomous execution engine for SummitAI development.
     
@@ -84,22 +170,73 @@ class AutonomousExecutor:
     its code, ensuring execution continues even if chat context is lost.
     """
     
-    def __init__(self, project_root: str = "/Users/piersondavis/Documents/summit_devin/summitdev"):
+    def __init__(self, project_root: str = "/Users/piersondavis/Documents/summit_devin/summitdev",
+                 build_command: Optional[str] = None, commit_every: Optional[int] = None,
+                 llm_provider: Optional[str] = None, llm_model: Optional[str] = None):
         self.project_root = Path(project_root)
         self.execution_plan_path = self.project_root / "SUMMITAI_PERFECT_EXECUTION_PLAN.md"
         self.progress_file = self.project_root / "progress.json"
-        self.max_retries = 3
-        self.execution_queue = queue.Queue()
+        self.max_retries = len(RECOVERY_TIERS) + 1
         self.running = True
         self.current_phase = 1
         self.current_step = 1
         self.total_steps = EXECUTION_CONTEXT["total_steps"]
         self.completed_steps = 0
+        self.completed_step_keys = set()
+        
+        # PARALLEL EXECUTION - commits/recovery and builds are serialized across workers
+        self.parallel = False
+        self._repo_lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        # Reentrant: the signal handler saves progress on the main thread, possibly while it holds this lock
+        self._progress_lock = threading.RLock()
+        
+        # INCREMENTAL BUILD VALIDATION - clean builds only at phase boundaries or after failures
+        self.build_command = build_command or os.environ.get("SUMMITAI_BUILD_COMMAND", DEFAULT_BUILD_COMMAND)
+        self.source_hasher = SourceTreeHasher(self.project_root / "SummitAI")
+        self.validation_cache = ValidationCache(self.project_root / "validation_cache.json")
+        self._needs_clean_build = False
+        
+        # RECOVERY METRICS - per tier: times used, times the next attempt succeeded, seconds to recover
+        self.recovery_stats = {tier: {"used": 0, "recovered": 0, "recovery_seconds": 0.0} for tier in RECOVERY_TIERS}
+        
+        # COMMAND RUNNER - asyncio subprocesses with streamed output, cancelled on SIGTERM
+        self.command_runner = CommandRunner()
+        
+        # TIMING PROFILE - per-step and per-command records for executor_dashboard.py
+        self.profiler = ExecutionProfiler(self.project_root / "step_timings.jsonl")
+        
+        # GIT - driven without a shell; HEAD and object reads stay in-process
+        self.git = GitRepo(self.project_root / "SummitAI", on_command=self.profiler.command)
+        
+        # STEP REGISTRY - plan parsed lazily into a cached index keyed by the plan's mtime
+        self.step_registry = StepRegistry(self.execution_plan_path, self.project_root / "step_index.json",
+                                          DEFAULT_STEP_DESCRIPTIONS)
+        
+        # STEP LEDGER - inputs and resulting commit/tree of every completed step
+        self.step_ledger = StepLedger(self.project_root / "step_ledger.jsonl")
+        
+        # COMMIT BATCHING - steps checkpointed since the last commit, and what commits/checkpoints cost
+        if commit_every is None:
+            commit_every = parse_commit_every(os.environ.get("SUMMITAI_COMMIT_EVERY", "1"))
+        self.commit_every = commit_every
+        self._pending_commits: List[Tuple[int, int, str, List[str]]] = []
+        self._checkpoint_tree: Optional[str] = None
+        self.commit_stats = {"commits": 0, "commit_seconds": 0.0, "checkpoints": 0, "checkpoint_seconds": 0.0}
         
         # EMBEDDED EXECUTION CONTEXT - PRESERVES MISSION OBJECTIVES
         self.context = EXECUTION_CONTEXT
         self.phase_descriptions = PHASE_DESCRIPTIONS
         
+        # LLM STEPS - steps without a handler are generated when a provider is configured
+        self.llm_provider = llm_provider or os.environ.get("SUMMITAI_LLM_PROVIDER")
+        self.llm_model = llm_model or os.environ.get("SUMMITAI_LLM_MODEL")
+        self.llm_executor = None
+        if self.llm_provider:
+            self.llm_executor = LLMStepExecutor(
+                self.project_root, self._get_step_description, self._get_step_objective,
+                self.context, self.phase_descriptions, self.llm_provider, self.llm_model)
+        
         # Signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -133,11 +270,17 @@ class AutonomousExecutor:
         """Handle shutdown signals gracefully."""
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
         self.running = False
+        self.command_runner.cancel_all()
         self._save_progress()
         sys.exit(0)
     
     def _save_progress(self):
-        """Save current progress to file with complete context preservation."""
+        """Save current progress to file with complete context preservation.
+        
+        Checkpointed steps that are not committed yet are left out, so a resume re-runs them.
+        """
+        with self._repo_lock:
+            pending = {(phase, step) for phase, step, _, _ in self._pending_commits}
         progress_data = {
             # EXECUTION CONTEXT - PRESERVES MISSION OBJECTIVES
             "execution_context": self.context,
@@ -147,11 +290,14 @@ class AutonomousExecutor:
             "target": "App Store ready iOS app",
             
             # CURRENT PROGRESS STATE
-            "current_phase": self.current_phase,
-            "current_step": self.current_step,
-            "completed_steps": self.completed_steps,
+            "current_phase": min(pending)[0] if pending else self.current_phase,
+            "current_step": min(pending)[1] if pending else self.current_step,
+            "completed_steps": self.completed_steps - len(pending),
             "total_steps": self.total_steps,
-            "progress_percent": (self.completed_steps / self.total_steps) * 100,
+            "progress_percent": ((self.completed_steps - len(pending)) / self.total_steps) * 100,
+            "completed_step_keys": sorted([phase, step] for phase, step in self.completed_step_keys - pending),
+            "recovery_tiers": self.recovery_stats,
+            "commit_overhead": self._commit_overhead(),
             "last_updated": datetime.now().isoformat(),
             "execution_status": "running" if self.running else "stopped",
             
@@ -167,61 +313,24 @@ class AutonomousExecutor:
             "immune_to_context_loss": True
         }
         
-        with open(self.progress_file, 'w') as f:
-            json.dump(progress_data, f, indent=2)
+        # Write-then-rename so a crash never leaves a truncated progress file
+        with self._progress_lock:
+            temp_file = self.progress_file.with_suffix(".tmp")
+            with open(temp_file, 'w') as f:
+                json.dump(progress_data, f, indent=2)
+            os.replace(temp_file, self.progress_file)
         
-        logger.info(f"Progress saved with context: {self.completed_steps}/{self.total_steps} steps ({progress_data['progress_percent']:.1f}%)")
-        logger.info(f"Context preserved: {self.completed_steps}/{self.total_steps} steps - immune to chat context loss")
+        logger.debug("Progress saved with context: %d/%d steps (%.1f%%)",
+                     self.completed_steps, self.total_steps, progress_data['progress_percent'])
     
     def _get_step_description(self, phase: int, step: int) -> str:
-        """Get description for a specific step - embedded context preservation."""
-        step_descriptions = {
-            # Phase 1: Project Foundation
-            (1, 1): "Initialize Git repository and project structure",
-            (1, 2): "Set up GitHub repository and CI/CD",
-            (1, 3): "Configure Swift package dependencies",
-            (1, 4): "Set up project configuration files",
-            (1, 5): "Create design system foundation",
-            (1, 6): "Implement common extensions and utilities",
-            (1, 7): "Set up error handling system",
-            (1, 8): "Create networking layer foundation",
-            (1, 9): "Set up logging and analytics",
-            (1, 10): "Configure build settings and schemes",
-            (1, 11): "Create test target and basic tests",
-            (1, 12): "Set up code signing and provisioning",
-            (1, 13): "Configure app icons and launch screen",
-            (1, 14): "Set up localization framework",
-            (1, 15): "Create accessibility foundation",
-            (1, 16): "Set up performance monitoring",
-            (1, 17): "Configure security settings",
-            (1, 18): "Set up documentation structure",
-            (1, 19): "Create development tools and scripts",
-            (1, 20): "Complete project foundation validation",
-            
-            # Phase 2: Swift Package Dependencies
-            (2, 1): "Add Firebase SDK dependencies",
-            (2, 2): "Add Superwall SDK for paywalls",
-            (2, 3): "Add HealthKit framework integration",
-            (2, 4): "Add Combine framework setup",
-            (2, 5): "Add SwiftUI extensions and utilities",
-            (2, 6): "Add networking and API dependencies",
-            (2, 7): "Add testing framework dependencies",
-            (2, 8): "Add analytics and monitoring tools",
-            (2, 9): "Add security and encryption libraries",
-            (2, 10): "Add image processing dependencies",
-            (2, 11): "Add data persistence frameworks",
-            (2, 12): "Add UI/UX enhancement libraries",
-            (2, 13): "Add accessibility support frameworks",
-            (2, 14): "Add localization and internationalization",
-            (2, 15): "Add performance optimization tools",
-            (2, 16): "Add debugging and development tools",
-            (2, 17): "Add backup and sync frameworks",
-            (2, 18): "Add push notification dependencies",
-            (2, 19): "Add social sharing frameworks",
-            (2, 20): "Validate all package dependencies"
-        }
-        
-        return step_descriptions.get((phase, step), f"Phase {phase} Step {step} implementation")
+        """Get description for a specific step - from the execution plan, else the embedded defaults."""
+        return self.step_registry.description(phase, step)
+    
+    def _get_step_objective(self, phase: int, step: int) -> Optional[str]:
+        """The plan's objective line for a step, if the plan has one."""
+        entry = self.step_registry.plan_entry(phase, step)
+        return entry["objective"] if entry else None
     
     def _load_progress(self) -> Dict:
         """Load progress from file if exists with complete context restoration."""
@@ -242,6 +351,10 @@ class AutonomousExecutor:
                 self.current_phase = progress_data.get('current_phase', 1)
                 self.current_step = progress_data.get('current_step', 1)
                 self.completed_steps = progress_data.get('completed_steps', 0)
+                self.completed_step_keys = {tuple(key) for key in progress_data.get('completed_step_keys', [])}
+                if self.llm_executor is not None:
+                    for phase, step in sorted(self.completed_step_keys):
+                        self.llm_executor.note_completed(phase, step)
                 
                 # Log context preservation status
                 if progress_data.get('context_preservation', False):
@@ -256,40 +369,33 @@ class AutonomousExecutor:
     
     def _execute_command(self, command: str, timeout: int = 300, cwd: Optional[str] = None) -> Tuple[bool, str, str]:
         """Execute shell command with timeout and error handling."""
-        try:
-            logger.info(f"Executing: {command}")
-            
-            # Use subprocess timeout directly (macOS compatible)
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                cwd=cwd or self.project_root,
-                timeout=timeout
-            )
-            
-            success = result.returncode == 0
-            stdout = result.stdout
-            stderr = result.stderr
-            
-            if success:
-                logger.info(f"Command succeeded: {command}")
-            else:
-                logger.error(f"Command failed: {command}")
-                logger.error(f"Error output: {stderr}")
-            
-            return success, stdout, stderr
-            
-        except subprocess.TimeoutExpired:
-            logger.error(f"Command timed out after {timeout}s: {command}")
-            return False, "", f"Command timed out after {timeout}s"
-        except Exception as e:
-            logger.error(f"Exception executing command: {e}")
-            return False, "", str(e)
+        start = time.perf_counter()
+        success, stdout, stderr = self._run_shell_command(command, timeout, cwd)
+        self.profiler.command(command, time.perf_counter() - start, success)
+        return success, stdout, stderr
+    
+    def _run_shell_command(self, command: str, timeout: int, cwd: Optional[str]) -> Tuple[bool, str, str]:
+        # One record per command, when it finishes; its streamed output lines carry the pid
+        logger.debug("Executing: %s", command)
+        
+        # Output is streamed to the log as it arrives; only the tail is kept in memory
+        result = self.command_runner.run(command, timeout=timeout, cwd=str(cwd or self.project_root))
+        
+        if result.success:
+            logger.info("Command succeeded in %.1fs: %s", result.seconds, command)
+        else:
+            logger.error("Command failed in %.1fs: %s\nError output: %s", result.seconds, command, result.stderr)
+        if result.dropped_lines:
+            logger.info("%d early output lines were only logged, not kept", result.dropped_lines)
+        
+        return result.as_tuple()
     
-    def _validate_step_completion(self, phase: int, step: int) -> bool:
-        """Validate that a step has been completed successfully."""
+    def _validate_step_completion(self, phase: int, step: int, files_changed: Optional[List[str]] = None) -> bool:
+        """Validate that a step has been completed successfully.
+        
+        `files_changed` lets the build be skipped when the step touched no build inputs;
+        None means unknown and always validates the build.
+        """
         logger.info(f"Validating Phase {phase}.Step {step}")
         
         summitai_dir = self.project_root / "SummitAI"
@@ -308,12 +414,9 @@ class AutonomousExecutor:
                 return False
             
             # Check Git repository health
-            success, stdout, stderr = self._execute_command(
-                f"cd {summitai_dir} && git status",
-                timeout=30
-            )
-            if not success:
-                logger.error(f"Git validation failed for Phase {phase}.Step {step}")
+            healthy, reason = self.git.is_healthy()
+            if not healthy:
+                logger.error(f"Git validation failed for Phase {phase}.Step {step}: {reason}")
                 return False
             
             # For Phase 1.2, also check if basic Swift files exist
@@ -334,39 +437,124 @@ class AutonomousExecutor:
         
         # For later phases, check if project builds (when Xcode project exists)
         xcode_project = summitai_dir / "SummitAI.xcodeproj"
-        if xcode_project.exists():
-            success, stdout, stderr = self._execute_command(
-                f"cd {summitai_dir} && xcodebuild -project SummitAI.xcodeproj -scheme SummitAI -destination 'platform=iOS Simulator,name=iPhone 15 Pro' clean build",
-                timeout=600
-            )
-            
-            if not success:
-                logger.error(f"Build validation failed for Phase {phase}.Step {step}")
-                return False
+        if xcode_project.exists() and not self._validate_build(phase, step, files_changed):
+            return False
         
         # Check Git repository health
-        success, stdout, stderr = self._execute_command(
-            f"cd {summitai_dir} && git status",
-            timeout=30
-        )
-        if not success:
-            logger.error(f"Git validation failed for Phase {phase}.Step {step}")
+        healthy, reason = self.git.is_healthy()
+        if not healthy:
+            logger.error(f"Git validation failed for Phase {phase}.Step {step}: {reason}")
             return False
         
         logger.info(f"Validation passed for Phase {phase}.Step {step}")
         return True
     
+    def _build_command_for(self, action: str) -> str:
+        """Build command for `action`, run from the SummitAI project directory."""
+        summitai_dir = self.project_root / "SummitAI"
+        return f"cd {summitai_dir} && " + self.build_command.replace("{action}", action)
+    
+    def _validate_build(self, phase: int, step: int, files_changed: Optional[List[str]]) -> bool:
+        """Build the project unless nothing the build depends on changed.
+        
+        Builds are incremental; a clean build runs at phase boundaries and after a failed
+        build or error recovery. Source tree hashes that already built are not rebuilt.
+        """
+        clean = step == self.context["steps_per_phase"] or self._needs_clean_build
+        if not clean and not touches_sources(files_changed):
+            logger.info(f"Skipping build for Phase {phase}.Step {step}: no source files changed")
+            return True
+        
+        with self._build_lock:
+            tree_hash = self.source_hasher.tree_hash()
+            if self.validation_cache.passed(tree_hash, clean=clean):
+                logger.info(f"Skipping build for Phase {phase}.Step {step}: source tree {tree_hash[:12]} already built")
+                return True
+            
+            action = "clean build" if clean else "build"
+            logger.info(f"Running {action} for Phase {phase}.Step {step}")
+            success, stdout, stderr = self._execute_command(self._build_command_for(action), timeout=600)
+            if not success:
+                logger.error(f"Build validation failed for Phase {phase}.Step {step}")
+                # The failed build may have left corrupt intermediates; the next one starts clean
+                self._needs_clean_build = True
+                return False
+            
+            if clean:
+                self._needs_clean_build = False
+            self.validation_cache.record_pass(tree_hash, phase, step, clean)
+        return True
+    
     def _commit_changes(self, phase: int, step: int, description: str, files_changed: List[str]) -> bool:
-        """Commit changes with perfect message format."""
-        logger.info(f"Committing Phase {phase}.Step {step}")
+        """Commit this step's files, or checkpoint them until the next commit boundary (see commit_every)."""
+        # Only this step's files. A step that reports none gets the whole tree staged, except in
+        # parallel mode, where the tree holds other workers' unfinished files: there it stages
+        # nothing, and a step that reports the whole tree fails
+        if files_changed:
+            stageable = self._stageable_paths(files_changed)
+        else:
+            stageable = [] if self.parallel else None
+        if self.parallel and stageable == ["."]:
+            logger.error(f"Phase {phase}.Step {step} reported the whole tree as changed; "
+                         f"refusing to commit other workers' files in parallel mode")
+            return False
         
-        summitai_dir = self.project_root / "SummitAI"
+        with self._repo_lock:
+            self._pending_commits.append((phase, step, description, files_changed))
+            if not self._is_commit_boundary(phase, step):
+                logger.info(f"Checkpointing Phase {phase}.Step {step}")
+                start = time.perf_counter()
+                success, tree, stderr = self.git.checkpoint(CHECKPOINT_REF, stageable)
+                self.commit_stats["checkpoints"] += 1
+                self.commit_stats["checkpoint_seconds"] += time.perf_counter() - start
+                if success:
+                    self._checkpoint_tree = tree
+                    return True
+                self._pending_commits.pop()
+                logger.error(f"Checkpoint failed for Phase {phase}.Step {step}: {stderr}")
+                return False
+            
+            logger.info(f"Committing Phase {phase}.Step {step}")
+            start = time.perf_counter()
+            success, stdout, stderr = self._commit_pending(stageable)
+            self.commit_stats["commits"] += 1
+            self.commit_stats["commit_seconds"] += time.perf_counter() - start
+            if not success:
+                self._pending_commits.pop()
+        
+        if success:
+            logger.info(f"Commit successful for Phase {phase}.Step {step}")
+            return True
+        else:
+            logger.error(f"Commit failed for Phase {phase}.Step {step}: {stderr}")
+            return False
+    
+    def _is_commit_boundary(self, phase: int, step: int) -> bool:
+        """True once enough steps are checkpointed or every step of the phase is done; callers hold the repository lock."""
+        if self.commit_every == 1:
+            return True
+        if self.commit_every != COMMIT_EVERY_PHASE and len(self._pending_commits) >= self.commit_every:
+            return True
+        done = self.completed_step_keys | {(p, s) for p, s, _, _ in self._pending_commits}
+        return all((phase, s) in done for s in range(1, self.context["steps_per_phase"] + 1))
+    
+    def _commit_pending(self, paths: Optional[List[str]]) -> Tuple[bool, str, str]:
+        """Stage `paths` and commit every pending step in one commit; callers hold the repository lock."""
+        steps = sorted(self._pending_commits)
+        first, last = steps[0], steps[-1]
+        if len(steps) == 1:
+            title = f"Phase {first[0]}.{first[1]}: {first[2]}"
+        elif first[0] == last[0]:
+            title = f"Phase {first[0]}.{first[1]}-{last[1]}: {len(steps)} steps"
+        else:
+            title = f"Phases {first[0]}.{first[1]}-{last[0]}.{last[1]}: {len(steps)} steps"
+        files_changed = [file for _, _, _, files in steps for file in files]
         
         # Create commit message
-        commit_message = f"""[Cursor] Phase {phase}.{step}: {description}
+        commit_message = f"""[Cursor] {title}
 
 Changes made:
-- {description}
+{chr(10).join(f"- {phase}.{step}: {description}" if len(steps) > 1 else f"- {description}" for phase, step, description, _ in steps)}
 
 Testing:
 - Build validation passed
@@ -381,85 +569,207 @@ Rollback plan: git reset --hard HEAD~1
 Validation: Step completion validated successfully at {datetime.now().isoformat()}
 """
         
-        # Write commit message to file
-        commit_file = summitai_dir / "commit_message.txt"
-        with open(commit_file, 'w') as f:
-            f.write(commit_message)
+        # Every step gets a commit, even one that only created empty directories
+        success, stdout, stderr = self.git.commit(commit_message, paths, allow_empty=True)
+        if success:
+            for phase, step, _, _ in steps:
+                self._record_step(phase, step)
+            self._pending_commits.clear()
+            if self._checkpoint_tree is not None:
+                self._checkpoint_tree = None
+                self.git.run("update-ref", "-d", CHECKPOINT_REF)
+        return success, stdout, stderr
+    
+    def _flush_pending_commits(self) -> bool:
+        """Commit checkpointed steps early, e.g. when execution stops between commit boundaries."""
+        with self._repo_lock:
+            if not self._pending_commits:
+                return True
+            logger.info(f"Committing {len(self._pending_commits)} checkpointed steps")
+            success, _, stderr = self._commit_pending([])
+            if not success:
+                logger.error(f"Commit of checkpointed steps failed: {stderr}")
+            return success
+    
+    def _commit_overhead(self) -> Dict:
+        """Commit and checkpoint counts and times, and the time saved by checkpointing instead of committing."""
+        stats = self.commit_stats
+        mean_commit = stats["commit_seconds"] / stats["commits"] if stats["commits"] else None
+        mean_checkpoint = stats["checkpoint_seconds"] / stats["checkpoints"] if stats["checkpoints"] else None
+        saved = None
+        if mean_commit is not None and mean_checkpoint is not None:
+            saved = round(stats["checkpoints"] * (mean_commit - mean_checkpoint), 3)
+        return {
+            "commit_every": self.commit_every or "phase",
+            "commits": stats["commits"],
+            "checkpoints": stats["checkpoints"],
+            "mean_commit_seconds": round(mean_commit, 4) if mean_commit is not None else None,
+            "mean_checkpoint_seconds": round(mean_checkpoint, 4) if mean_checkpoint is not None else None,
+            "estimated_seconds_saved": saved,
+        }
+    
+    def _record_step(self, phase: int, step: int):
+        """Record the commit and tree a step produced in the step ledger; callers hold the repository lock."""
+        try:
+            commit, tree = self.git.head_commit(), self.git.head_tree()
+        except GitError as e:
+            logger.warning(f"Could not record Phase {phase}.Step {step} in the step ledger: {e}")
+            return
+        self.step_ledger.record(phase, step, self._get_step_description(phase, step),
+                                STEP_GENERATOR_VERSION, commit, tree)
+    
+    def _load_step_history(self) -> set:
+        """(commit, tree) pairs reachable from the project's HEAD, read with a single git call."""
+        if not len(self.step_ledger) or not self.git.exists:
+            return set()
+        return self.git.history()
+    
+    def _step_already_satisfied(self, phase: int, step: int, history: set) -> bool:
+        """True if the ledger shows this step ran with the same inputs and its commit is still in history."""
+        return self.step_ledger.is_satisfied(phase, step, self._get_step_description(phase, step),
+                                             STEP_GENERATOR_VERSION, history)
+    
+    def _stageable_paths(self, files_changed: List[str]) -> List[str]:
+        """Convert files_changed entries (relative to project root) to paths git can stage in the SummitAI repo.
         
-        # Execute commit in SummitAI directory
-        success, stdout, stderr = self._execute_command(
-            f"cd {summitai_dir} && git add . && git commit -F commit_message.txt && rm commit_message.txt",
-            timeout=120
-        )
+        Drops .git and empty directories, which git add rejects as unmatched pathspecs.
+        """
+        summitai_dir = self.project_root / "SummitAI"
+        paths = []
+        for file in files_changed:
+            relative = file[len("SummitAI/"):] if file.startswith("SummitAI/") else file
+            relative = relative.rstrip("/") or "."
+            if relative == ".":
+                return ["."]
+            if relative == ".git" or relative.startswith(".git/"):
+                continue
+            target = summitai_dir / relative
+            if target.is_file() or (target.is_dir() and any(p.is_file() for p in target.rglob("*"))):
+                paths.append(relative)
+        return paths
+    
+    def _execute_error_recovery(self, phase: int, step: int, attempt: int, tier: str = "clean",
+                                files_changed: Optional[List[str]] = None) -> bool:
+        """Execute error recovery procedures for one tier of RECOVERY_TIERS."""
+        with self._repo_lock:
+            return self._execute_error_recovery_locked(phase, step, attempt, tier, files_changed)
+    
+    def _execute_error_recovery_locked(self, phase: int, step: int, attempt: int, tier: str,
+                                       files_changed: Optional[List[str]]) -> bool:
+        """Error recovery body; callers hold the repository lock."""
+        logger.info(f"Executing {tier} recovery for Phase {phase}.Step {step} (attempt {attempt})")
         
-        if success:
-            logger.info(f"Commit successful for Phase {phase}.Step {step}")
+        if tier == "retry":
+            # Transient failures (a flaky build, a network hiccup) often pass on a plain retry
             return True
-        else:
-            logger.error(f"Commit failed for Phase {phase}.Step {step}: {stderr}")
-            return False
-    
-    def _execute_error_recovery(self, phase: int, step: int, attempt: int) -> bool:
-        """Execute error recovery procedures."""
-        logger.info(f"Executing error recovery for Phase {phase}.Step {step} (attempt {attempt})")
+        
+        if tier == "rollback":
+            # Only this step's files; the build cache and other steps' work stay warm
+            paths = self._rollback_paths(files_changed)
+            if not self.git.exists or paths:
+                if self.git.exists:
+                    success, stdout, stderr = self.git.restore_paths(paths, self._checkpoint_tree)
+                    if not success:
+                        logger.error(f"Rollback of {paths} failed: {stderr}")
+                        return False
+                self._needs_clean_build = True
+                return True
+            logger.warning(f"No known files to roll back for Phase {phase}.Step {step}, escalating to clean recovery")
         
         summitai_dir = self.project_root / "SummitAI"
         
         # Clean build artifacts
-        self._execute_command("rm -rf ~/Library/Developer/Xcode/DerivedData/SummitAI-*", timeout=60)
-        
-        # Reset Git if needed
-        if attempt > 1 and summitai_dir.exists():
-            self._execute_command(f"cd {summitai_dir} && git reset --hard HEAD", timeout=30)
+        for derived_data in glob.glob(os.path.expanduser("~/Library/Developer/Xcode/DerivedData/SummitAI-*")):
+            shutil.rmtree(derived_data, ignore_errors=True)
+        
+        # Reset Git to the last commit or checkpoint; in parallel mode other workers have
+        # uncommitted work, so only roll back this step
+        if self.git.exists:
+            if self.parallel:
+                paths = self._rollback_paths(files_changed)
+                if paths:
+                    self.git.restore_paths(paths, self._checkpoint_tree)
+                else:
+                    logger.warning(f"No known files to reset for Phase {phase}.Step {step}; "
+                                   f"leaving the working tree as is")
+            else:
+                self.git.reset_to(self._checkpoint_tree)
         
-        # Clean and rebuild if Xcode project exists
+        # Clean if Xcode project exists; the next validation does a full clean build
         xcode_project = summitai_dir / "SummitAI.xcodeproj"
         if xcode_project.exists():
-            self._execute_command(f"cd {summitai_dir} && xcodebuild clean -project SummitAI.xcodeproj -scheme SummitAI", timeout=120)
+            self._execute_command(self._build_command_for("clean"), timeout=120)
+        self._needs_clean_build = True
         
         return True
     
+    @staticmethod
+    def _file_states(directory: Path) -> Dict[str, int]:
+        """Files under `directory` (relative, .git excluded) with their mtimes, to find what a command wrote."""
+        states = {}
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d != ".git"]
+            for name in files:
+                path = Path(root) / name
+                try:
+                    states[path.relative_to(directory).as_posix()] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return states
+    
+    def _rollback_paths(self, files_changed: Optional[List[str]]) -> List[str]:
+        """Repository-relative paths a step touched; the whole tree when unknown and no other step is running.
+        
+        Empty in parallel mode when the step reported no files (or the whole tree): nothing
+        is known to be safe to reset without touching other workers' files.
+        """
+        paths = []
+        for file in files_changed or []:
+            relative = file[len("SummitAI/"):] if file.startswith("SummitAI/") else file
+            relative = relative.rstrip("/") or "."
+            if relative == "." and self.parallel:
+                return []
+            if relative != ".git" and not relative.startswith(".git/"):
+                paths.append(relative)
+        if not paths and not self.parallel:
+            paths = ["."]
+        return paths
+    
+    def _record_recovery(self, tier: str, phase: int, step: int, seconds: float, recovered: bool):
+        """Count a recovery tier's outcome; `seconds` runs from the start of recovery to the retry's outcome."""
+        with self._progress_lock:
+            stats = self.recovery_stats[tier]
+            stats["used"] += 1
+            stats["recovered"] += recovered
+            stats["recovery_seconds"] = round(stats["recovery_seconds"] + seconds, 3)
+        self.profiler.recovery(phase, step, tier, seconds, recovered)
+        logger.info(f"{tier} recovery for Phase {phase}.Step {step} "
+                    f"{'succeeded' if recovered else 'did not help'} after {seconds:.1f}s")
+    
+    @step_handler(1, 1)
     def _execute_phase_1_step_1(self) -> Tuple[bool, str, List[str]]:
         """Execute Phase 1.1: Git Repository Initialization."""
         logger.info("Executing Phase 1.1: Git Repository Initialization")
         
         files_changed = []
         
-        # Step 1: Create SummitAI project directory in current location
+        # Steps 1-3: Create SummitAI project directory, Xcode project structure and source directories
         summitai_dir = self.project_root / "SummitAI"
-        success, stdout, stderr = self._execute_command(
-            f"mkdir -p {summitai_dir} && echo 'SummitAI project directory created'",
-            timeout=30
-        )
-        if not success:
-            return False, f"Failed to create SummitAI directory: {stderr}", files_changed
-        
-        # Step 2: Create Xcode project structure
-        success, stdout, stderr = self._execute_command(
-            f"cd {summitai_dir} && mkdir -p SummitAI.xcodeproj && echo 'Xcode project directory created'",
-            timeout=30
-        )
-        if not success:
-            return False, f"Failed to create Xcode project directory: {stderr}", files_changed
-        
-        # Step 3: Create basic Swift files structure
-        success, stdout, stderr = self._execute_command(
-            f"cd {summitai_dir} && mkdir -p SummitAI/Preview\\ Content && echo 'Source directories created'",
-            timeout=30
-        )
-        if not success:
-            return False, f"Failed to create source directories: {stderr}", files_changed
+        for directory, label in ((summitai_dir, "SummitAI"),
+                                 (summitai_dir / "SummitAI.xcodeproj", "Xcode project"),
+                                 (summitai_dir / "SummitAI" / "Preview Content", "source")):
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                return False, f"Failed to create {label} directory: {e}", files_changed
         
         # Step 4: Initialize Git in SummitAI directory
-        success, stdout, stderr = self._execute_command(
-            f"cd {summitai_dir} && git init && git config user.name 'SummitAI Developer' && git config user.email 'developer@summitai.app'",
-            timeout=60
-        )
+        success, stdout, stderr = self.git.init("SummitAI Developer", "developer@summitai.app")
         if not success:
             return False, f"Failed to initialize Git: {stderr}", files_changed
         
+        # The directories it created, not the repository root, so parallel runs can commit it
         files_changed = [
-            "SummitAI/",
             "SummitAI/SummitAI.xcodeproj/",
             "SummitAI/SummitAI/",
             "SummitAI/.git/"
@@ -467,6 +777,7 @@ Validation: Step completion validated successfully at {datetime.now().isoformat(
         
         return True, "Git repository initialized successfully in SummitAI directory", files_changed
     
+    @step_handler(1, 2)
     def _execute_phase_1_step_2(self) -> Tuple[bool, str, List[str]]:
         """Execute Phase 1.2: Create Xcode Project Structure."""
         logger.info("Executing Phase 1.2: Create Xcode Project Structure")
@@ -475,23 +786,22 @@ Validation: Step completion validated successfully at {datetime.now().isoformat(
         files_changed = []
         
         # Use Xcode command line tools to create a proper project
-        success, stdout, stderr = self._execute_command(
-            f"cd {summitai_dir} && rm -rf SummitAI.xcodeproj SummitAI && echo 'Cleaned existing structure'",
-            timeout=30
-        )
+        for existing in (summitai_dir / "SummitAI.xcodeproj", summitai_dir / "SummitAI"):
+            shutil.rmtree(existing, ignore_errors=True)
         
         # Create a proper Xcode project using command line
+        before = self._file_states(summitai_dir)
         success, stdout, stderr = self._execute_command(
             f"cd {summitai_dir} && swift package init --type executable --name SummitAI",
             timeout=60
         )
+        # Package.swift, Sources/, .gitignore...: only reported files are staged and rolled back
+        after = self._file_states(summitai_dir)
+        files_changed.extend(f"SummitAI/{path}" for path, mtime in sorted(after.items()) if before.get(path) != mtime)
         
         if not success:
             # Fallback: create basic project structure manually
-            success, stdout, stderr = self._execute_command(
-                f"cd {summitai_dir} && mkdir -p SummitAI.xcodeproj && echo 'Fallback: Created Xcode project directory'",
-                timeout=30
-            )
+            (summitai_dir / "SummitAI.xcodeproj").mkdir(parents=True, exist_ok=True)
         
         # Create basic Swift files
         app_file = summitai_dir / "SummitAI" / "SummitAIApp.swift"
@@ -607,10 +917,12 @@ struct ContentView: View {
 
     def _execute_step(self, phase: int, step: int) -> Tuple[bool, str, List[str]]:
         """Execute a specific step based on phase and step number."""
-        if phase == 1 and step == 1:
-            return self._execute_phase_1_step_1()
-        elif phase == 1 and step == 2:
-            return self._execute_phase_1_step_2()
+        handler = self.step_registry.handler(phase, step)
+        if handler is not None:
+            return handler(self)
+        
+        if self.llm_executor is not None:
+            return self.llm_executor.execute(phase, step)
         
         # For now, implement placeholder for other steps
         # In a full implementation, this would contain all 400 steps
@@ -621,37 +933,81 @@ struct ContentView: View {
         
         return True, f"Phase {phase}.Step {step} completed (placeholder)", []
     
+    def _prefetch_independent_steps(self, phase: int):
+        """Start LLM generation for the phase's independent steps once its setup steps are done.
+        
+        Independent steps (see step_scheduler) only build on the setup steps, so their prompts
+        are already final; the sequential loop then picks up finished responses.
+        """
+        setup = (phase, PHASE_SETUP_STEPS.get(phase, 1))
+        graph = build_step_graph(self._get_step_description,
+                                 self.context["total_phases"], self.context["steps_per_phase"])
+        keys = [key for key, node in sorted(graph.items())
+                if key[0] == phase and node.depends_on == [setup]
+                and key not in self.completed_step_keys and self.step_registry.handler(*key) is None]
+        if keys:
+            logger.info(f"Prefetching LLM generation for {len(keys)} independent steps of phase {phase}")
+            self.llm_executor.prefetch(keys)
+    
     def _execute_step_with_recovery(self, phase: int, step: int) -> bool:
-        """Execute step with automatic error recovery."""
+        """Execute step with automatic error recovery, recording a timing breakdown."""
+        with self.profiler.step(phase, step) as timing:
+            timing["success"] = self._execute_step_attempts(phase, step, timing)
+        return timing["success"]
+    
+    def _execute_step_attempts(self, phase: int, step: int, timing: Dict) -> bool:
         max_attempts = self.max_retries
+        revalidate = None  # (message, files_changed) when a retry only needs to re-run validation
+        tier, tier_started = None, 0.0
         
         for attempt in range(1, max_attempts + 1):
             logger.info(f"Attempt {attempt}/{max_attempts} for Phase {phase}.Step {step}")
+            timing["attempts"] = attempt
             
-            success, message, files_changed = self._execute_step(phase, step)
+            if revalidate is None:
+                with self.profiler.stage("execute"):
+                    success, message, files_changed = self._execute_step(phase, step)
+            else:
+                success, (message, files_changed) = True, revalidate
+                revalidate = None
             
+            failed_stage = None
             if success:
                 logger.info(f"Phase {phase}.Step {step} executed successfully")
                 
                 # Validate step completion
-                if self._validate_step_completion(phase, step):
+                with self.profiler.stage("validate"):
+                    validated = self._validate_step_completion(phase, step, files_changed)
+                if validated:
                     # Commit changes
-                    if self._commit_changes(phase, step, message, files_changed):
+                    with self.profiler.stage("commit"):
+                        committed = self._commit_changes(phase, step, message, files_changed)
+                    if tier:
+                        self._record_recovery(tier, phase, step, time.perf_counter() - tier_started, committed)
+                    if committed:
                         return True
                     else:
                         logger.error(f"Commit failed for Phase {phase}.Step {step}")
                         return False
                 else:
-                    logger.error(f"Validation failed for Phase {phase}.Step {step}")
-                    return False
+                    failed_stage = "validate"
+                    logger.error(f"Validation failed for Phase {phase}.Step {step} on attempt {attempt}")
             else:
+                failed_stage = "execute"
                 logger.error(f"Phase {phase}.Step {step} failed on attempt {attempt}: {message}")
-                
-                if attempt < max_attempts:
-                    self._execute_error_recovery(phase, step, attempt)
-                else:
-                    logger.critical(f"Phase {phase}.Step {step} failed after {max_attempts} attempts")
-                    return False
+            
+            if tier:
+                self._record_recovery(tier, phase, step, time.perf_counter() - tier_started, False)
+            if attempt == max_attempts:
+                logger.critical(f"Phase {phase}.Step {step} failed after {max_attempts} attempts")
+                return False
+            
+            tier = RECOVERY_TIERS[min(attempt, len(RECOVERY_TIERS)) - 1]
+            tier_started = time.perf_counter()
+            with self.profiler.stage("recovery"):
+                recovered = self._execute_error_recovery(phase, step, attempt, tier, files_changed)
+            if recovered and tier == "retry" and failed_stage == "validate":
+                revalidate = (message, files_changed)
         
         return False
     
@@ -659,28 +1015,38 @@ struct ContentView: View {
         """Perform system health check."""
         logger.info("Performing health check...")
         
-        # Check if we're in a Git repository, if not that's okay for initial setup
-        success, stdout, stderr = self._execute_command("git status")
-        if not success:
-            if "not a git repository" in stderr:
-                logger.info("Not in a Git repository yet - this is expected for initial setup")
-            else:
-                logger.error("Git repository health check failed")
+        # Check the project's Git repository, if it doesn't exist yet that's okay for initial setup
+        if not self.git.exists:
+            logger.info("Not in a Git repository yet - this is expected for initial setup")
+        else:
+            healthy, reason = self.git.is_healthy()
+            if not healthy:
+                logger.error(f"Git repository health check failed: {reason}")
                 return False
         
         # Check available disk space
-        success, stdout, stderr = self._execute_command("df -h . | tail -1")
-        if success:
-            logger.info(f"Disk space check: {stdout.strip()}")
+        disk = shutil.disk_usage(self.project_root)
+        logger.info(f"Disk space check: {disk.free / 1024 ** 3:.1f}GB free of {disk.total / 1024 ** 3:.1f}GB "
+                    f"({disk.used / disk.total:.0%} used)")
         
         # Check memory usage
-        success, stdout, stderr = self._execute_command("ps -o rss= -p $$")
-        if success:
-            memory_mb = int(stdout.strip()) // 1024
-            logger.info(f"Memory usage: {memory_mb}MB")
+        logger.info(f"Memory usage: {self._memory_usage_mb()}MB")
         
         return True
     
+    @staticmethod
+    def _memory_usage_mb() -> int:
+        """Resident set size of this process, read without spawning ps."""
+        try:
+            # Linux: second field of statm is resident pages
+            with open("/proc/self/statm") as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024 ** 2
+        except (OSError, ValueError, IndexError):
+            # macOS: no /proc, fall back to peak RSS (reported in bytes there)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak // 1024 ** 2 if sys.platform == "darwin" else peak // 1024
+    
     def execute_all_phases(self):
         """Execute all 400 steps across 20 phases."""
         logger.info("Starting autonomous SummitAI development execution")
@@ -695,6 +1061,7 @@ struct ContentView: View {
             return False
         
         start_time = time.time()
+        history = self._load_step_history()
         
         try:
             # Execute all phases
@@ -706,21 +1073,29 @@ struct ContentView: View {
                         logger.info("Execution stopped by user")
                         return False
                     
-                    logger.info(f"=== EXECUTING PHASE {phase}.STEP {step} ===")
-                    
-                    # Execute step with recovery
-                    if not self._execute_step_with_recovery(phase, step):
-                        logger.critical(f"CRITICAL ERROR: Phase {phase}.Step {step} failed")
-                        return False
+                    if self._step_already_satisfied(phase, step, history):
+                        # Completed before a crash that happened before progress was saved
+                        logger.info(f"=== PHASE {phase}.STEP {step} ALREADY COMMITTED - SKIPPING ===")
+                    else:
+                        logger.info(f"=== EXECUTING PHASE {phase}.STEP {step} ===")
+                        
+                        # Execute step with recovery
+                        if not self._execute_step_with_recovery(phase, step):
+                            logger.critical(f"CRITICAL ERROR: Phase {phase}.Step {step} failed")
+                            return False
                     
                     # Update progress
                     self.completed_steps += 1
+                    self.completed_step_keys.add((phase, step))
                     self.current_phase = phase
                     self.current_step = step + 1
+                    if self.llm_executor is not None:
+                        self.llm_executor.note_completed(phase, step)
+                        if step == PHASE_SETUP_STEPS.get(phase, 1):
+                            self._prefetch_independent_steps(phase)
                     
-                    # Save progress every 10 steps
-                    if self.completed_steps % 10 == 0:
-                        self._save_progress()
+                    # Save progress after every step
+                    self._save_progress()
                     
                     # Health check every 50 steps
                     if self.completed_steps % 50 == 0:
@@ -736,6 +1111,7 @@ struct ContentView: View {
                 logger.info(f"=== PHASE {phase} COMPLETED ===")
             
             # Final validation
+            self._flush_pending_commits()
             logger.info("=== FINAL VALIDATION ===")
             if not self._validate_step_completion(20, 20):
                 logger.error("Final validation failed")
@@ -751,11 +1127,15 @@ struct ContentView: View {
             logger.info(f"Total execution time: {execution_time/3600:.2f} hours")
             logger.info(f"Steps completed: {self.completed_steps}/{self.total_steps}")
             logger.info(f"Success rate: 100%")
+            logger.info(f"Commit overhead: {json.dumps(self._commit_overhead())}")
+            if self.llm_executor is not None:
+                logger.info(f"LLM step generation: {json.dumps(self.llm_executor.stats)}")
             
             return True
             
         except KeyboardInterrupt:
             logger.info("Execution interrupted by user")
+            self._flush_pending_commits()
             self._save_progress()
             return False
         except Exception as e:
@@ -763,20 +1143,224 @@ struct ContentView: View {
             self._save_progress()
             return False
 
+    def execute_phase(self, phase: int) -> bool:
+        """Execute the remaining steps of one phase in order; used by worktree shard workers."""
+        self._load_progress()
+        history = self._load_step_history()
+        for step in range(1, self.context["steps_per_phase"] + 1):
+            if not self.running:
+                return False
+            if (phase, step) in self.completed_step_keys:
+                continue
+            if self._step_already_satisfied(phase, step, history):
+                logger.info(f"=== PHASE {phase}.STEP {step} ALREADY COMMITTED - SKIPPING ===")
+            elif not self._execute_step_with_recovery(phase, step):
+                logger.critical(f"CRITICAL ERROR: Phase {phase}.Step {step} failed")
+                self._save_progress()
+                return False
+            self.completed_steps += 1
+            self.completed_step_keys.add((phase, step))
+            self.current_phase, self.current_step = phase, step + 1
+            self._save_progress()
+        logger.info(f"=== PHASE {phase} COMPLETED ===")
+        return True
+    
+    def execute_all_phases_sharded(self, max_workers: int = 4) -> bool:
+        """Execute all 400 steps with independent phases in separate git worktrees and worker processes.
+        
+        Phase dependencies come from step_scheduler.PHASE_DEPENDENCIES; completed shard branches
+        are merged back in dependency order (see worktree_shards.ShardedRun).
+        """
+        from worktree_shards import ShardedRun
+        
+        logger.info(f"Starting sharded autonomous SummitAI development execution ({max_workers} worker processes)")
+        self._load_progress()
+        if not self._health_check():
+            logger.error("Initial health check failed")
+            return False
+        
+        if not ShardedRun(self, max_workers, setup_logging=setup_logging).run():
+            self._save_progress()
+            return False
+        
+        logger.info("=== FINAL VALIDATION ===")
+        if not self._validate_step_completion(20, 20):
+            logger.error("Final validation failed")
+            return False
+        self._save_progress()
+        logger.info(f"=== EXECUTION COMPLETED SUCCESSFULLY ===")
+        return True
+    
+    def execute_all_phases_parallel(self, max_workers: int = 4) -> bool:
+        """Execute all 400 steps, running independent steps concurrently on a worker pool.
+        
+        Dependencies and resource tags come from step_scheduler.build_step_graph. Commits,
+        error recovery and builds stay serialized through locks. A critical-path report
+        comparing serial time, critical path and wall clock is logged at the end.
+        """
+        logger.info(f"Starting parallel autonomous SummitAI development execution ({max_workers} workers)")
+        
+        self._load_progress()
+        if not self.completed_step_keys:
+            # Older progress files only record the next step; everything before it is done
+            self.completed_step_keys = {
+                (phase, step) for phase in range(1, 21) for step in range(1, 21)
+                if (phase, step) < (self.current_phase, self.current_step)
+            }
+        
+        if not self._health_check():
+            logger.error("Initial health check failed")
+            return False
+        
+        self.parallel = True
+        graph = build_step_graph(self._get_step_description,
+                                 self.context["total_phases"], self.context["steps_per_phase"])
+        
+        # Steps committed before a crash that happened before progress was saved
+        history = self._load_step_history()
+        recovered = {key for key in graph
+                     if key not in self.completed_step_keys and self._step_already_satisfied(*key, history)}
+        if recovered:
+            logger.info(f"Skipping {len(recovered)} steps already committed according to the step ledger")
+            self.completed_step_keys |= recovered
+            self.completed_steps += len(recovered)
+        
+        def on_complete(key, duration):
+            self.completed_steps += 1
+            self.completed_step_keys.add(key)
+            if self.llm_executor is not None:
+                self.llm_executor.note_completed(*key)
+            remaining = sorted(k for k in graph if k not in self.completed_step_keys)
+            self.current_phase, self.current_step = remaining[0] if remaining else (20, 21)
+            logger.info(f"=== PHASE {key[0]}.STEP {key[1]} COMPLETED in {duration:.1f}s ===")
+            self._save_progress()
+        
+        scheduler = DagScheduler(
+            graph,
+            self._execute_step_with_recovery,
+            max_workers=max_workers,
+            should_continue=lambda: self.running,
+            on_complete=on_complete,
+        )
+        
+        try:
+            done, failed = scheduler.run(self.completed_step_keys)
+        except KeyboardInterrupt:
+            logger.info("Execution interrupted by user")
+            self._flush_pending_commits()
+            self._save_progress()
+            return False
+        finally:
+            self.parallel = False
+        
+        # Validated steps checkpointed before a failure or stop keep their work
+        self._flush_pending_commits()
+        
+        report = critical_path_report(graph, scheduler.durations, scheduler.wall_clock)
+        logger.info(f"Critical path report: {json.dumps(report)}")
+        report_file = self.project_root / "critical_path_report.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        self._save_progress()
+        
+        if failed:
+            for phase, step in failed:
+                logger.critical(f"CRITICAL ERROR: Phase {phase}.Step {step} failed")
+            return False
+        if len(done) < len(graph):
+            logger.info("Execution stopped by user")
+            return False
+        
+        logger.info("=== FINAL VALIDATION ===")
+        if not self._validate_step_completion(20, 20):
+            logger.error("Final validation failed")
+            return False
+        
+        logger.info(f"=== EXECUTION COMPLETED SUCCESSFULLY ===")
+        logger.info(f"Wall clock: {report['wall_clock_seconds'] / 3600:.2f} hours "
+                    f"(serial equivalent {report['serial_seconds'] / 3600:.2f} hours)")
+        logger.info(f"Commit overhead: {json.dumps(self._commit_overhead())}")
+        return True
+
+    def simulate(self, max_workers: int = 1, durations_path: Optional[str] = None,
+                 runs: int = 1, seed: int = 0, from_scratch: bool = False) -> Dict:
+        """Project the remaining run (all 400 steps with from_scratch) in virtual time instead of executing it.
+        
+        Step durations and failure rates come from `durations_path` if given, then from the
+        recorded step_timings.jsonl (see schedule_simulation). The report is logged and
+        written to simulation_report.json.
+        """
+        self._load_progress()
+        already_done = set() if from_scratch else self.completed_step_keys
+        graph = build_step_graph(self._get_step_description,
+                                 self.context["total_phases"], self.context["steps_per_phase"])
+        config = load_config(Path(durations_path)) if durations_path else None
+        profiles = build_profiles(graph, load_records(self.profiler.path), config)
+        report = simulate_schedule(graph, profiles, max_workers, self.max_retries, runs, seed,
+                                   already_done=already_done)
+        
+        logger.info(f"=== SIMULATED {report['steps_simulated']} STEPS ON {max_workers} WORKERS ===")
+        logger.info(f"Projected makespan: {report['makespan_seconds'] / 3600:.2f} hours "
+                    f"(serial {report['serial_seconds'] / 3600:.2f} hours, "
+                    f"critical path {report['critical_path_seconds'] / 3600:.2f} hours)")
+        logger.info(f"Worker utilisation: {report['worker_utilisation']:.0%} "
+                    f"(active {report['worker_active_utilisation']:.0%}), "
+                    f"lock utilisation: {json.dumps(report['lock_utilisation'])}")
+        report_file = self.project_root / "simulation_report.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
 def main():
     """Main entry point for autonomous execution."""
-    if len(sys.argv) > 1:
-        project_root = sys.argv[1]
-    else:
-        project_root = "/Users/piersondavis/Documents/summit_devin/summitdev"
+    parser = argparse.ArgumentParser(description="Autonomous SummitAI development executor")
+    parser.add_argument("project_root", nargs="?", default="/Users/piersondavis/Documents/summit_devin/summitdev",
+                        help="Project root containing the execution plan")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Run independent steps concurrently on this many workers (default: 1, sequential)")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="Run independent phases in this many git worktrees with one worker process each")
+    parser.add_argument("--commit-every", type=parse_commit_every, default=None, metavar="N|phase",
+                        help="Commit every N steps or once per phase, checkpointing the steps in between "
+                             "(default: 1, or SUMMITAI_COMMIT_EVERY)")
+    parser.add_argument("--llm", metavar="PROVIDER",
+                        help="Generate steps without a handler with this llm_api provider (default: SUMMITAI_LLM_PROVIDER; "
+                             "placeholders when unset)")
+    parser.add_argument("--llm-model", help="Model for --llm (default: the provider's default)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Project runtime in virtual time with --workers workers instead of executing")
+    parser.add_argument("--durations", metavar="FILE",
+                        help="With --simulate: JSON step durations and failure rates overriding recorded timings")
+    parser.add_argument("--simulate-runs", type=int, default=1, metavar="N",
+                        help="With --simulate: number of randomized runs for makespan percentiles (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="With --simulate: random seed for injected failures")
+    parser.add_argument("--from-scratch", action="store_true",
+                        help="With --simulate: simulate all steps, ignoring progress.json")
+    args = parser.parse_args()
+    project_root = args.project_root
+    # --simulate prints its JSON report on stdout, so the log goes to stderr
+    setup_logging(sys.stderr if args.simulate else None)
     
-    executor = AutonomousExecutor(project_root)
+    executor = AutonomousExecutor(project_root, commit_every=args.commit_every,
+                                  llm_provider=args.llm, llm_model=args.llm_model)
+    
+    if args.simulate:
+        report = executor.simulate(args.workers, args.durations, args.simulate_runs, args.seed,
+                                   args.from_scratch)
+        print(json.dumps(report, indent=2))
+        sys.exit(0)
     
     logger.info("Starting SummitAI Autonomous Development Executor")
     logger.info(f"Project root: {project_root}")
     logger.info("Target: Complete 400-step development process overnight")
     
-    success = executor.execute_all_phases()
+    if args.shards > 0:
+        success = executor.execute_all_phases_sharded(args.shards)
+    elif args.workers > 1:
+        success = executor.execute_all_phases_parallel(args.workers)
+    else:
+        success = executor.execute_all_phases()
     
     if success:
         logger.info("🎉 SUMMITAI DEVELOPMENT COMPLETED SUCCESSFULLY! 🎉")
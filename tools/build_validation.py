@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Helpers that let the autonomous executor avoid redundant Xcode builds.
+
+- touches_sources() decides whether a step changed anything a build depends on.
+- SourceTreeHasher fingerprints the source tree, re-reading only files whose
+  size or mtime changed since the previous call.
+- ValidationCache remembers which source tree fingerprints already built cleanly.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+# Files that feed the Xcode build. Anything else (docs, progress files, commit
+# messages) can change without invalidating a previous successful build.
+SOURCE_SUFFIXES = {
+    ".swift", ".h", ".m", ".mm", ".c", ".cpp", ".metal",
+    ".plist", ".xcconfig", ".pbxproj", ".xcscheme", ".entitlements",
+    ".storyboard", ".xib", ".strings", ".stringsdict", ".xcstrings",
+    ".json", ".resolved",
+}
+SOURCE_DIR_SUFFIXES = (".xcodeproj", ".xcassets", ".xcworkspace")
+IGNORED_DIRS = {".git", ".build", "build", "DerivedData", "xcuserdata", ".swiftpm"}
+
+def is_source_path(path: str) -> bool:
+    """True if a changed path can affect the build."""
+    parts = Path(path.rstrip("/")).parts
+    if any(part in IGNORED_DIRS for part in parts):
+        return False
+    if any(part.endswith(SOURCE_DIR_SUFFIXES) for part in parts):
+        return True
+    return Path(path.rstrip("/")).suffix in SOURCE_SUFFIXES
+
+def touches_sources(files_changed: Optional[Iterable[str]]) -> bool:
+    """
+    True if any changed path can affect the build.
+
+    None means "unknown" and counts as touching sources; a trailing slash marks a
+    directory, which counts as source when it is or contains an Xcode bundle.
+    """
+    if files_changed is None:
+        return True
+    return any(is_source_path(path) for path in files_changed)
+
+class SourceTreeHasher:
+    """
+    Content fingerprint of the build inputs under a directory.
+
+    File digests are memoized by (size, mtime_ns), so repeated hashing of a mostly
+    unchanged tree costs one stat per file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def _file_digest(self, path: Path, relative: str) -> str:
+        stat = path.stat()
+        cached = self._digests.get(relative)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()
+        self._digests[relative] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def tree_hash(self) -> str:
+        """SHA-256 over the sorted (path, content digest) pairs of every source file."""
+        combined = hashlib.sha256()
+        if not self.root.exists():
+            return combined.hexdigest()
+        with self._lock:
+            entries = []
+            for directory, dirnames, filenames in os.walk(self.root):
+                dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+                for filename in filenames:
+                    path = Path(directory) / filename
+                    relative = path.relative_to(self.root).as_posix()
+                    if is_source_path(relative):
+                        entries.append((relative, path))
+            for relative, path in sorted(entries):
+                try:
+                    digest = self._file_digest(path, relative)
+                except FileNotFoundError:
+                    continue  # Deleted while walking
+                combined.update(f"{relative}\0{digest}\n".encode())
+        return combined.hexdigest()
+
+class ValidationCache:
+    """Source tree fingerprints that already passed build validation, persisted as JSON."""
+
+    def __init__(self, path: Path, max_entries: int = 500):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        try:
+            self._entries = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def passed(self, tree_hash: str, clean: bool = False) -> bool:
+        """True if this tree already built; with `clean`, only a clean build counts."""
+        with self._lock:
+            entry = self._entries.get(tree_hash)
+            return entry is not None and (not clean or entry["clean"])
+
+    def record_pass(self, tree_hash: str, phase: int, step: int, clean: bool):
+        with self._lock:
+            previous = self._entries.get(tree_hash)
+            self._entries[tree_hash] = {
+                "phase": phase,
+                "step": step,
+                "clean": clean or bool(previous and previous["clean"]),
+                "timestamp": time.time(),
+            }
+            if len(self._entries) > self.max_entries:
+                oldest = sorted(self._entries, key=lambda key: self._entries[key]["timestamp"])
+                for key in oldest[:len(self._entries) - self.max_entries]:
+                    del self._entries[key]
+            temp_path = self.path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(self._entries, indent=2))
+            temp_path.replace(self.path)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Asyncio-based shell command runner for the autonomous executor.
+
+Commands run on one background event loop, so any number of them can be in
+flight at once from any thread. Output is streamed to the log line by line as it
+arrives, and only the last `max_lines` lines of each stream are kept in memory.
+Each command runs in its own process group, so cancel_all() (called on SIGTERM)
+stops a whole xcodebuild tree rather than just the shell in front of it.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LINES = 2000   # Lines kept per stream; earlier output is only in the log
+TERMINATE_GRACE = 5.0      # Seconds between SIGTERM and SIGKILL
+STREAM_LIMIT = 16 * 1024 * 1024  # Longest output line; asyncio's 64 KiB default is too short for xcodebuild
+
+@dataclass
+class CommandResult:
+    success: bool
+    stdout: str
+    stderr: str
+    returncode: Optional[int]
+    seconds: float
+    dropped_lines: int = 0  # Lines that fell out of the ring buffers
+
+    def as_tuple(self) -> Tuple[bool, str, str]:
+        return self.success, self.stdout, self.stderr
+
+class CommandRunner:
+    """
+    Runs shell commands concurrently on a private event loop thread.
+
+    `on_line(stream, line)` is called for every output line, in addition to logging
+    it at `stream_level`.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, stream_level: int = logging.INFO,
+                 on_line: Optional[Callable[[str, str], None]] = None):
+        self.max_lines = max_lines
+        self.stream_level = stream_level
+        self.on_line = on_line
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._processes: Set[asyncio.subprocess.Process] = set()
+        self._cancelled = False
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="command-runner", daemon=True)
+                self._thread.start()
+        return self._loop
+
+    async def _pump(self, stream: asyncio.StreamReader, name: str, buffer: deque, counter: List[int], tag: str):
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            text = line.decode("utf-8", errors="replace").rstrip("\n")
+            if len(buffer) == buffer.maxlen:
+                counter[0] += 1
+            buffer.append(text)
+            # Sampled per command once it gets long (tool_logging.SamplingFilter)
+            logger.log(self.stream_level, "[%s %s] %s", tag, name, text, extra={"sample": tag})
+            if self.on_line:
+                self.on_line(name, text)
+
+    async def _terminate(self, process: asyncio.subprocess.Process):
+        """SIGTERM the command's process group, then SIGKILL it if it hasn't exited in time."""
+        if process.returncode is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            await asyncio.wait_for(process.wait(), TERMINATE_GRACE)
+        except asyncio.TimeoutError:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await process.wait()
+        except ProcessLookupError:
+            pass
+
+    async def run_async(self, command: str, timeout: float = 300, cwd: Optional[str] = None) -> CommandResult:
+        """Run `command` through the shell, streaming its output. Never raises for command failures."""
+        start = time.perf_counter()
+        stdout_lines, stderr_lines = deque(maxlen=self.max_lines), deque(maxlen=self.max_lines)
+        dropped = [0]
+        if self._cancelled:
+            return CommandResult(False, "", "Cancelled: executor is shutting down", None, 0.0)
+        try:
+            process = await asyncio.create_subprocess_shell(
+                command, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                start_new_session=True, limit=STREAM_LIMIT,
+            )
+        except OSError as e:
+            return CommandResult(False, "", str(e), None, time.perf_counter() - start)
+
+        tag = f"pid {process.pid}"
+        self._processes.add(process)
+        pumps = asyncio.gather(
+            self._pump(process.stdout, "stdout", stdout_lines, dropped, tag),
+            self._pump(process.stderr, "stderr", stderr_lines, dropped, tag),
+        )
+
+        async def finish():
+            # Shielded: after a timeout the pumps still collect what the killed process group wrote last
+            await asyncio.shield(pumps)
+            await process.wait()
+
+        error = None
+        try:
+            # One deadline for output and exit, so a command that closes its stdio still times out
+            await asyncio.wait_for(finish(), timeout)
+        except asyncio.TimeoutError:
+            error = f"Command timed out after {timeout}s"
+            await self._terminate(process)
+            try:
+                # Collect what the killed process group wrote last
+                await asyncio.wait_for(pumps, 1.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+        except asyncio.CancelledError:
+            await self._terminate(process)
+            raise
+        except Exception as e:
+            # E.g. a line longer than STREAM_LIMIT; the command still fails rather than raising
+            error = f"Error executing command: {type(e).__name__}: {e}"
+            pumps.cancel()
+            await self._terminate(process)
+        finally:
+            self._processes.discard(process)
+
+        if self._cancelled and process.returncode != 0 and error is None:
+            error = "Cancelled: executor is shutting down"
+        stderr = "\n".join(stderr_lines)
+        if error:
+            stderr = f"{stderr}\n{error}".lstrip("\n")
+        return CommandResult(
+            success=error is None and process.returncode == 0,
+            stdout="\n".join(stdout_lines) + ("\n" if stdout_lines else ""),
+            stderr=stderr,
+            returncode=process.returncode,
+            seconds=time.perf_counter() - start,
+            dropped_lines=dropped[0],
+        )
+
+    def run(self, command: str, timeout: float = 300, cwd: Optional[str] = None) -> CommandResult:
+        """Blocking wrapper for run_async, safe to call from any thread except the runner's own."""
+        future = asyncio.run_coroutine_threadsafe(self.run_async(command, timeout, cwd), self._ensure_loop())
+        return future.result()
+
+    def run_many(self, commands: Sequence[str], timeout: float = 300, cwd: Optional[str] = None) -> List[CommandResult]:
+        """Run several commands concurrently and return their results in order."""
+        async def run_all():
+            return await asyncio.gather(*(self.run_async(command, timeout, cwd) for command in commands))
+        return asyncio.run_coroutine_threadsafe(run_all(), self._ensure_loop()).result()
+
+    def cancel_all(self, timeout: float = TERMINATE_GRACE + 5):
+        """Terminate every running command and refuse new ones. Safe to call from a signal handler."""
+        self._cancelled = True
+        if self._loop is None:
+            return
+
+        async def terminate_all():
+            await asyncio.gather(*(self._terminate(process) for process in list(self._processes)))
+
+        if threading.current_thread() is self._thread:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(terminate_all(), self._loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Could not terminate all running commands: {e}")
+
+    def close(self):
+        """Cancel running commands and stop the event loop thread."""
+        self.cancel_all()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
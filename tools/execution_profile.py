@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Structured timing records for the autonomous executor.
+
+Every step produces one "step" record with its execute/validate/commit/recovery
+breakdown, and every external command produces one "command" record attributed to
+the step running on the same thread. Records are appended to a JSONL file that
+tools/executor_dashboard.py reads.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+STAGES = ("execute", "validate", "commit", "recovery")
+
+class ExecutionProfiler:
+    """Appends step and command timing records to `path`; safe to use from worker threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _write(self, record: Dict):
+        line = json.dumps(record) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+    @property
+    def _current(self) -> Optional[Dict]:
+        return getattr(self._local, "step", None)
+
+    @contextmanager
+    def step(self, phase: int, step: int) -> Iterator[Dict]:
+        """
+        Time a whole step. The yielded dict is written as the step record on exit;
+        set "success" and "attempts" on it.
+        """
+        record = {"type": "step", "phase": phase, "step": step, "started": time.time(),
+                  "success": False, "attempts": 0, **{stage: 0.0 for stage in STAGES},
+                  "commands": 0, "command_seconds": 0.0}
+        self._local.step = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self._local.step = None
+            record["seconds"] = round(time.perf_counter() - start, 3)
+            for key in STAGES + ("command_seconds",):
+                record[key] = round(record[key], 3)
+            self._write(record)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Add the time spent in the block to the current step's `name` stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current = self._current
+            if current is not None:
+                current[name] += time.perf_counter() - start
+
+    def command(self, command: str, seconds: float, success: bool):
+        """Record one external command, attributed to the step running on this thread."""
+        current = self._current
+        record = {"type": "command", "command": command[:200], "seconds": round(seconds, 3),
+                  "success": success, "timestamp": time.time()}
+        if current is not None:
+            current["commands"] += 1
+            current["command_seconds"] += seconds
+            record.update(phase=current["phase"], step=current["step"])
+        self._write(record)
+
+    def recovery(self, phase: int, step: int, tier: str, seconds: float, recovered: bool):
+        """Record one use of a recovery tier and whether the attempt after it succeeded."""
+        self._write({"type": "recovery", "phase": phase, "step": step, "tier": tier,
+                     "seconds": round(seconds, 3), "recovered": recovered, "timestamp": time.time()})
+
+    def absorb(self, path: Path):
+        """Append the records of another timing file (e.g. a merged worktree shard's)."""
+        records = load_records(path)
+        if records:
+            with self._lock, open(self.path, "a") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+
+def load_records(path: Path) -> List[Dict]:
+    """Read a timing JSONL file, skipping a torn final line."""
+    records = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
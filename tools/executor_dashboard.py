@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+import argparse
+import html
+import json
+import sys
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+from execution_profile import STAGES, load_records
+
+THROUGHPUT_WINDOW = 1800  # Seconds of recent steps used for throughput and ETA
+
+def _command_group(command: str) -> str:
+    """Group commands by program and subcommand, ignoring a leading 'cd DIR &&'."""
+    if command.startswith("cd ") and "&&" in command:
+        command = command.split("&&", 1)[1]
+    return " ".join(command.split()[:2])
+
+def summarize(records: List[Dict], progress: Dict = None, top: int = 10, now: float = None) -> Dict:
+    """
+    Aggregate timing records into throughput, ETA, stage/phase totals and the slowest steps and commands.
+
+    Args:
+        records (List[Dict]): Records from execution_profile.load_records
+        progress (Dict, optional): Contents of progress.json, for completed/total counts that
+            include steps skipped on resume
+        top (int): How many slowest steps and command groups to list
+    """
+    now = now or time.time()
+    steps = [r for r in records if r.get("type") == "step"]
+    commands = [r for r in records if r.get("type") == "command"]
+    recoveries = [r for r in records if r.get("type") == "recovery"]
+    succeeded = [r for r in steps if r["success"]]
+
+    total = (progress or {}).get("total_steps", 400)
+    completed = (progress or {}).get("completed_steps", len({(r["phase"], r["step"]) for r in succeeded}))
+    remaining = max(total - completed, 0)
+
+    # Throughput from wall clock, so parallel workers are accounted for
+    recent = [r for r in succeeded if r["started"] + r["seconds"] >= now - THROUGHPUT_WINDOW] or succeeded
+    throughput = 0.0
+    if recent:
+        window_start = min(r["started"] for r in recent)
+        window_end = max(r["started"] + r["seconds"] for r in recent)
+        throughput = len(recent) / max(window_end - window_start, 1e-9)
+    mean_step = sum(r["seconds"] for r in succeeded) / len(succeeded) if succeeded else 0.0
+
+    phase_seconds = defaultdict(float)
+    for r in steps:
+        phase_seconds[r["phase"]] += r["seconds"]
+
+    groups = defaultdict(lambda: {"count": 0, "seconds": 0.0, "failures": 0})
+    for r in commands:
+        group = groups[_command_group(r["command"])]
+        group["count"] += 1
+        group["seconds"] += r["seconds"]
+        group["failures"] += not r["success"]
+
+    tiers = defaultdict(lambda: {"used": 0, "recovered": 0, "seconds": 0.0})
+    for r in recoveries:
+        tier = tiers[r["tier"]]
+        tier["used"] += 1
+        tier["recovered"] += r["recovered"]
+        tier["seconds"] += r["seconds"]
+
+    return {
+        "completed": completed,
+        "total": total,
+        "failed_steps": sum(1 for r in steps if not r["success"]),
+        "throughput_per_hour": round(throughput * 3600, 1),
+        "mean_step_seconds": round(mean_step, 2),
+        "eta_seconds": round(remaining / throughput) if throughput else None,
+        "stage_seconds": {stage: round(sum(r[stage] for r in steps), 1) for stage in STAGES},
+        "phase_seconds": {str(phase): round(seconds, 1) for phase, seconds in sorted(phase_seconds.items())},
+        "slowest_steps": [
+            {key: r[key] for key in ("phase", "step", "seconds", "attempts", "success") + STAGES}
+            for r in sorted(steps, key=lambda r: r["seconds"], reverse=True)[:top]
+        ],
+        "slowest_commands": [
+            {"command": name, "count": g["count"], "total_seconds": round(g["seconds"], 2),
+             "mean_seconds": round(g["seconds"] / g["count"], 3), "failures": g["failures"]}
+            for name, g in sorted(groups.items(), key=lambda item: item[1]["seconds"], reverse=True)[:top]
+        ],
+        "recovery_tiers": {
+            name: {"used": t["used"], "recovered": t["recovered"],
+                   "mean_recovery_seconds": round(t["seconds"] / t["used"], 2)}
+            for name, t in tiers.items()
+        },
+    }
+
+def _duration(seconds) -> str:
+    if seconds is None:
+        return "unknown"
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h{rest // 60:02d}m" if hours else f"{rest // 60}m{rest % 60:02d}s"
+
+def render_text(summary: Dict) -> str:
+    """Plain-text dashboard for the terminal and the HTTP page."""
+    done, total = summary["completed"], summary["total"]
+    bar = "#" * int(40 * done / total) if total else ""
+    lines = [
+        f"SummitAI executor  [{bar:<40}] {done}/{total} steps ({done / total:.0%})" if total else "SummitAI executor",
+        f"Throughput: {summary['throughput_per_hour']} steps/h   Mean step: {summary['mean_step_seconds']}s   "
+        f"ETA: {_duration(summary['eta_seconds'])}   Failed steps: {summary['failed_steps']}",
+        "",
+        "Time by stage:  " + "   ".join(f"{stage} {_duration(s)}" for stage, s in summary["stage_seconds"].items()),
+        "Time by phase:  " + "   ".join(f"{phase}: {_duration(s)}" for phase, s in summary["phase_seconds"].items()),
+        "",
+        "Slowest steps:",
+    ]
+    for r in summary["slowest_steps"]:
+        breakdown = " ".join(f"{stage}={r[stage]:.1f}" for stage in STAGES if r[stage])
+        status = "" if r["success"] else "  FAILED"
+        lines.append(f"  {r['phase']:>2}.{r['step']:<2}  {r['seconds']:8.1f}s  attempts={r['attempts']}  {breakdown}{status}")
+    lines += ["", "Slowest commands (total time):"]
+    for c in summary["slowest_commands"]:
+        lines.append(f"  {c['command']:<30} {c['total_seconds']:8.1f}s  x{c['count']:<5} "
+                     f"mean {c['mean_seconds']:.3f}s  failures {c['failures']}")
+    if summary["recovery_tiers"]:
+        lines += ["", "Recovery tiers:"]
+        for name, t in summary["recovery_tiers"].items():
+            lines.append(f"  {name:<10} used {t['used']:<4} recovered {t['recovered']:<4} "
+                         f"mean time to recover {t['mean_recovery_seconds']:.1f}s")
+    return "\n".join(lines)
+
+def _load(timings_path: Path, progress_path: Path, top: int) -> Dict:
+    progress = None
+    if progress_path.exists():
+        try:
+            progress = json.loads(progress_path.read_text())
+        except json.JSONDecodeError:
+            pass
+    return summarize(load_records(timings_path), progress, top)
+
+def serve(timings_path: Path, progress_path: Path, port: int, top: int, refresh: int):
+    """Serve the dashboard as an auto-refreshing page at / and as JSON at /summary.json."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            summary = _load(timings_path, progress_path, top)
+            if self.path.startswith("/summary.json"):
+                body, content_type = json.dumps(summary, indent=2), "application/json"
+            elif self.path in ("/", "/index.html"):
+                body = (f"<html><head><meta http-equiv='refresh' content='{refresh}'>"
+                        f"<title>SummitAI executor</title></head><body><pre>"
+                        f"{html.escape(render_text(summary))}</pre></body></html>")
+                content_type = "text/html; charset=utf-8"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    print(f"Serving dashboard on http://127.0.0.1:{port}/ (JSON at /summary.json)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Progress and timing dashboard for the autonomous executor')
+    parser.add_argument('project_root', nargs='?', default='.',
+                        help='Executor project root holding step_timings.jsonl and progress.json (default: .)')
+    parser.add_argument('--timings', help='Timing JSONL file (default: PROJECT_ROOT/step_timings.jsonl)')
+    parser.add_argument('--progress', help='Progress file (default: PROJECT_ROOT/progress.json)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest steps and commands to list (default: 10)')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON and exit')
+    parser.add_argument('--watch', type=float, metavar='SECONDS', help='Redraw the terminal view every SECONDS')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='Serve the dashboard over HTTP on localhost')
+    args = parser.parse_args()
+
+    root = Path(args.project_root)
+    timings_path = Path(args.timings) if args.timings else root / "step_timings.jsonl"
+    progress_path = Path(args.progress) if args.progress else root / "progress.json"
+
+    if args.serve:
+        serve(timings_path, progress_path, args.serve, args.top, refresh=int(args.watch or 5))
+    elif args.json:
+        print(json.dumps(_load(timings_path, progress_path, args.top), indent=2))
+    elif args.watch:
+        try:
+            while True:
+                text = render_text(_load(timings_path, progress_path, args.top))
+                sys.stdout.write("\033[2J\033[H" + text + "\n")
+                sys.stdout.flush()
+                time.sleep(args.watch)
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(render_text(_load(timings_path, progress_path, args.top)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Git operations for the autonomous executor without going through a shell.
+
+Reads that only need repository metadata (HEAD, refs, objects) are answered
+in-process or by one long-lived `git cat-file --batch` process. Writes (add, commit,
+reset) run git directly from an argument list, one process per git command.
+"""
+
+import logging
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class GitError(Exception):
+    """A git command failed or the repository could not be read."""
+
+class GitRepo:
+    """
+    A git working tree at `path`.
+
+    `on_command(command, seconds, success)` is called after every git process run.
+    """
+
+    def __init__(self, path: Path, on_command: Optional[Callable[[str, float, bool], None]] = None):
+        self.path = Path(path)
+        self.on_command = on_command
+        self._batch: Optional[subprocess.Popen] = None
+        self._batch_lock = threading.Lock()
+
+    @property
+    def git_dir(self) -> Path:
+        """The repository directory; for a linked worktree, the one its .git file points to."""
+        dot_git = self.path / ".git"
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir: "):
+                return (self.path / content[8:]).resolve()
+        return dot_git
+
+    @property
+    def common_dir(self) -> Path:
+        """Where shared refs live; differs from git_dir only in linked worktrees."""
+        git_dir = self.git_dir
+        commondir = git_dir / "commondir"
+        if commondir.is_file():
+            return (git_dir / commondir.read_text().strip()).resolve()
+        return git_dir
+
+    @property
+    def exists(self) -> bool:
+        return (self.git_dir / "HEAD").is_file()
+
+    def run(self, *args: str, input: Optional[str] = None, timeout: int = 120) -> Tuple[bool, str, str]:
+        """Run `git <args>` in the working tree. Returns (success, stdout, stderr)."""
+        command = f"git {' '.join(args)}"
+        logger.debug(command)
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(
+                ["git", *args], cwd=self.path, input=input,
+                capture_output=True, text=True, timeout=timeout,
+            )
+            success, stdout, stderr = result.returncode == 0, result.stdout, result.stderr
+        except (OSError, subprocess.TimeoutExpired) as e:
+            success, stdout, stderr = False, "", str(e)
+        if self.on_command:
+            self.on_command(command, time.perf_counter() - start, success)
+        return success, stdout, stderr
+
+    def init(self, user_name: str, user_email: str) -> Tuple[bool, str, str]:
+        """Initialize the repository and set the committer identity."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        for args in (("init",), ("config", "user.name", user_name), ("config", "user.email", user_email)):
+            success, stdout, stderr = self.run(*args, timeout=60)
+            if not success:
+                return success, stdout, stderr
+        return True, "", ""
+
+    def stage(self, paths: Optional[Sequence[str]] = None) -> Tuple[bool, str, str]:
+        """Stage `paths` (additions, edits and deletions); everything when None, nothing when empty."""
+        if paths is None:
+            return self.run("add", "-A")
+        if not paths:
+            return True, "", ""
+        return self.run("add", "-A", "--", *paths)
+
+    def commit(self, message: str, paths: Optional[Sequence[str]] = None,
+               allow_empty: bool = False) -> Tuple[bool, str, str]:
+        """
+        Stage `paths` (see stage()) and commit the index with `message`.
+
+        The message is passed on stdin, so no message file lands in the working tree.
+        """
+        success, stdout, stderr = self.stage(paths)
+        if not success:
+            return success, stdout, stderr
+        commit_args = ("commit", "-F", "-", "--allow-empty") if allow_empty else ("commit", "-F", "-")
+        return self.run(*commit_args, input=message)
+
+    def checkpoint(self, ref: str, paths: Optional[Sequence[str]] = None) -> Tuple[bool, str, str]:
+        """
+        Stage `paths` and point `ref` at the index's tree without committing.
+
+        Writing a tree and moving a ref skips the commit object, hooks and message,
+        and the tree is what restore_paths()/reset_to() roll back to. Returns
+        (success, tree, stderr).
+        """
+        success, stdout, stderr = self.stage(paths)
+        if not success:
+            return success, stdout, stderr
+        success, stdout, stderr = self.run("write-tree")
+        if not success:
+            return success, stdout, stderr
+        tree = stdout.strip()
+        success, _, stderr = self.run("update-ref", ref, tree)
+        return success, tree, stderr
+
+    def reset_to(self, tree: Optional[str] = None) -> Tuple[bool, str, str]:
+        """Reset the index and tracked files to `tree` (HEAD when None), like `reset --hard` without moving HEAD."""
+        if tree is None:
+            return self.run("reset", "--hard", "HEAD", timeout=30)
+        return self.run("read-tree", "--reset", "-u", tree, timeout=30)
+
+    def restore_paths(self, paths: Sequence[str], source: Optional[str] = None) -> Tuple[bool, str, str]:
+        """
+        Put `paths` back to their state in `source` (a commit or checkpoint tree; HEAD
+        when None): unstage them, check out tracked files and delete untracked ones.
+        Other files in the working tree are left alone.
+
+        Raises ValueError for an empty `paths`, which git would treat as the whole tree.
+        """
+        if not paths:
+            raise ValueError("restore_paths() needs at least one path")
+        if source is None and self.head_commit() is None:
+            success, stdout, stderr = self.run("rm", "-r", "-q", "--cached", "--ignore-unmatch", "--", *paths)
+            if not success:
+                return success, stdout, stderr
+        else:
+            source = source or "HEAD"
+            success, stdout, stderr = self.run("reset", "-q", source, "--", *paths)
+            if not success:
+                return success, stdout, stderr
+            success, stdout, stderr = self.run("ls-tree", "-r", "--name-only", source, "--", *paths)
+            if not success:
+                return success, stdout, stderr
+            tracked = stdout.splitlines()
+            if tracked:
+                success, stdout, stderr = self.run("checkout", source, "--", *tracked)
+                if not success:
+                    return success, stdout, stderr
+        # Without -d, so directory skeletons (e.g. an empty .xcodeproj) survive
+        return self.run("clean", "-fq", "--", *paths)
+
+    def merge_conflicts(self, ours: str, theirs: str) -> Optional[List[str]]:
+        """
+        Files that would conflict when merging `theirs` into `ours`, computed without
+        touching the working tree. [] means a clean merge; None means this git is too old
+        for `merge-tree --write-tree` (2.38+) and the caller has to try the merge.
+        """
+        success, stdout, stderr = self.run("merge-tree", "--write-tree", "--name-only", "--no-messages", ours, theirs)
+        if success:
+            return []
+        lines = stdout.splitlines()
+        if lines and len(lines[0]) == 40 and all(c in "0123456789abcdef" for c in lines[0]):
+            return [line for line in lines[1:] if line]
+        return None
+
+    # ---- In-process reads -------------------------------------------------
+
+    def _resolve_ref(self, ref: str) -> Optional[str]:
+        common_dir = self.common_dir
+        for base in {self.git_dir, common_dir}:
+            loose = base / ref
+            if loose.is_file():
+                return loose.read_text().strip()
+        packed = common_dir / "packed-refs"
+        if packed.is_file():
+            for line in packed.read_text().splitlines():
+                if line and line[0] not in "#^":
+                    sha, _, name = line.partition(" ")
+                    if name == ref:
+                        return sha
+        return None
+
+    def head_commit(self) -> Optional[str]:
+        """SHA of HEAD read straight from .git, or None before the first commit."""
+        try:
+            head = (self.git_dir / "HEAD").read_text().strip()
+        except OSError as e:
+            raise GitError(f"Cannot read HEAD in {self.path}: {e}")
+        if head.startswith("ref: "):
+            return self._resolve_ref(head[5:])
+        return head
+
+    def _read_object(self, sha: str) -> Optional[Tuple[str, bytes]]:
+        """(type, content) of an object from the persistent cat-file process, or None if missing."""
+        with self._batch_lock:
+            if self._batch is None or self._batch.poll() is not None:
+                self._batch = subprocess.Popen(
+                    ["git", "cat-file", "--batch"], cwd=self.path,
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                )
+            try:
+                self._batch.stdin.write(f"{sha}\n".encode())
+                self._batch.stdin.flush()
+                header = self._batch.stdout.readline().decode().split()
+                if len(header) != 3:  # "<sha> missing"
+                    return None
+                content = self._batch.stdout.read(int(header[2]) + 1)[:-1]
+            except (OSError, ValueError) as e:
+                self._batch = None
+                raise GitError(f"git cat-file failed in {self.path}: {e}")
+        return header[1], content
+
+    def head_tree(self) -> Optional[str]:
+        """Tree SHA of the HEAD commit, or None before the first commit."""
+        commit = self.head_commit()
+        if commit is None:
+            return None
+        obj = self._read_object(commit)
+        if obj is None or obj[0] != "commit":
+            raise GitError(f"HEAD {commit} is not a readable commit in {self.path}")
+        first_line = obj[1].split(b"\n", 1)[0].decode()
+        return first_line.split()[1]
+
+    def is_healthy(self) -> Tuple[bool, str]:
+        """
+        Check that HEAD resolves to a readable commit (an unborn branch is fine).
+
+        Returns:
+            Tuple[bool, str]: (healthy, reason when not)
+        """
+        if not self.exists:
+            return False, "not a git repository"
+        try:
+            commit = self.head_commit()
+            if commit is not None and self._read_object(commit) is None:
+                return False, f"HEAD points to missing commit {commit}"
+        except GitError as e:
+            return False, str(e)
+        return True, ""
+
+    def history(self) -> Set[Tuple[str, str]]:
+        """(commit, tree) pairs reachable from HEAD."""
+        success, stdout, stderr = self.run("log", "--format=%H %T", timeout=60)
+        if not success:
+            return set()
+        return {tuple(line.split()) for line in stdout.splitlines() if line.strip()}
+
+    def close(self):
+        """Stop the persistent cat-file process."""
+        with self._batch_lock:
+            if self._batch is not None:
+                self._batch.stdin.close()
+                self._batch.wait(timeout=10)
+                self._batch = None
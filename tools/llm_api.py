@@ -9,8 +9,14 @@ from dotenv import load_dotenv
 from pathlib import Path
 import sys
 import base64
+import threading
 from typing import Optional, Union, List
 import mimetypes
+import logging
+
+from tool_logging import configure_logging
+
+logger = logging.getLogger(__name__)
 
 def load_environment():
     """Load environment variables from .env files in order of precedence"""
@@ -19,33 +25,29 @@ def load_environment():
     # 2. .env.local (user-specific overrides)
     # 3. .env (project defaults)
     # 4. .env.example (example configuration)
+    # Runs on every import, so it only logs at DEBUG and never lists variable names
     
     env_files = ['.env.local', '.env', '.env.example']
-    env_loaded = False
-    
-    print("Current working directory:", Path('.').absolute(), file=sys.stderr)
-    print("Looking for environment files:", env_files, file=sys.stderr)
-    
+    loaded = []
     for env_file in env_files:
         env_path = Path('.') / env_file
-        print(f"Checking {env_path.absolute()}", file=sys.stderr)
         if env_path.exists():
-            print(f"Found {env_file}, loading variables...", file=sys.stderr)
             load_dotenv(dotenv_path=env_path)
-            env_loaded = True
-            print(f"Loaded environment variables from {env_file}", file=sys.stderr)
-            # Print loaded keys (but not values for security)
-            with open(env_path) as f:
-                keys = [line.split('=')[0].strip() for line in f if '=' in line and not line.startswith('#')]
-                print(f"Keys loaded from {env_file}: {keys}", file=sys.stderr)
+            loaded.append(env_file)
     
-    if not env_loaded:
-        print("Warning: No .env files found. Using system environment variables only.", file=sys.stderr)
-        print("Available system environment variables:", list(os.environ.keys()), file=sys.stderr)
+    if loaded:
+        logger.debug("Loaded environment variables from %s in %s", ", ".join(loaded), Path('.').absolute())
+    else:
+        logger.debug("No .env files found in %s; using system environment variables only", Path('.').absolute())
 
 # Load environment variables at module import
 load_environment()
 
+def guess_image_mime_type(image_path: str) -> str:
+    """Guess an image's MIME type from its extension, defaulting to PNG."""
+    mime_type, _ = mimetypes.guess_type(image_path)
+    return mime_type or 'image/png'
+
 def encode_image_file(image_path: str) -> tuple[str, str]:
     """
     Encode an image file to base64 and determine its MIME type.
@@ -56,15 +58,34 @@ def encode_image_file(image_path: str) -> tuple[str, str]:
     Returns:
         tuple: (base64_encoded_string, mime_type)
     """
-    mime_type, _ = mimetypes.guess_type(image_path)
-    if not mime_type:
-        mime_type = 'image/png'  # Default to PNG if type cannot be determined
-        
+    mime_type = guess_image_mime_type(image_path)
+
     with open(image_path, "rb") as image_file:
         encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
         
     return encoded_string, mime_type
 
+def encode_image_bytes(image_bytes: bytes) -> str:
+    """
+    Base64-encode in-memory image data, e.g. from screenshot_utils.take_screenshot_bytes.
+
+    Args:
+        image_bytes (bytes): Encoded image (PNG, JPEG, WebP, ...)
+
+    Returns:
+        str: base64_encoded_string
+    """
+    return base64.b64encode(image_bytes).decode('utf-8')
+
+def _encode_image(image_path: Optional[str], image_bytes: Optional[bytes],
+                  image_mime_type: Optional[str]) -> Optional[tuple[str, str]]:
+    """Return (base64_encoded_string, mime_type) for whichever image source was given, or None."""
+    if image_bytes is not None:
+        return encode_image_bytes(image_bytes), image_mime_type or 'image/png'
+    if image_path:
+        return encode_image_file(image_path)
+    return None
+
 def create_llm_client(provider="openai"):
     if provider == "openai":
         api_key = os.getenv('OPENAI_API_KEY')
@@ -113,13 +134,31 @@ def create_llm_client(provider="openai"):
         return genai
     elif provider == "local":
         return OpenAI(
-            base_url="http://192.168.180.137:8006/v1",
+            base_url=os.getenv('LOCAL_LLM_BASE_URL', "http://192.168.180.137:8006/v1"),
             api_key="not-needed"
         )
     else:
         raise ValueError(f"Unsupported provider: {provider}")
 
-def query_llm(prompt: str, client=None, model=None, provider="openai", image_path: Optional[str] = None) -> Optional[str]:
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_llm_client(provider="openai"):
+    """
+    Shared client for `provider`, created on first use.
+
+    Clients hold HTTP connection pools, so a long-lived process (tool_server.py, the
+    executor's LLM step generator) reuses one per provider instead of reconnecting
+    for every prompt.
+    """
+    with _clients_lock:
+        if provider not in _clients:
+            _clients[provider] = create_llm_client(provider)
+        return _clients[provider]
+
+def query_llm(prompt: str, client=None, model=None, provider="openai", image_path: Optional[str] = None,
+              image_bytes: Optional[bytes] = None, image_mime_type: Optional[str] = None,
+              context: Optional[str] = None, max_tokens: Optional[int] = None) -> Optional[str]:
     """
     Query an LLM with a prompt and optional image attachment.
     
@@ -129,12 +168,18 @@ def query_llm(prompt: str, client=None, model=None, provider="openai", image_pat
         model (str, optional): The model to use
         provider (str): The API provider to use
         image_path (str, optional): Path to an image file to attach
+        image_bytes (bytes, optional): In-memory image to attach instead of image_path
+        image_mime_type (str, optional): MIME type of image_bytes (default: image/png)
+        context (str, optional): Long instructions/context shared by many prompts. It is sent
+            ahead of the prompt as a system block, marked cacheable for Anthropic; OpenAI-style
+            APIs cache an identical leading prefix automatically
+        max_tokens (int, optional): Response length limit (Anthropic default: 1000)
         
     Returns:
         Optional[str]: The LLM's response or None if there was an error
     """
     if client is None:
-        client = create_llm_client(provider)
+        client = get_llm_client(provider)
     
     try:
         # Set default model
@@ -164,19 +209,25 @@ def query_llm(prompt: str, client=None, model=None, provider="openai", image_pat
             })
             
             # Add image content if provided
-            if image_path:
+            if image_path or image_bytes is not None:
                 if provider == "openai":
-                    encoded_image, mime_type = encode_image_file(image_path)
+                    encoded_image, mime_type = _encode_image(image_path, image_bytes, image_mime_type)
                     messages[0]["content"] = [
                         {"type": "text", "text": prompt},
                         {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{encoded_image}"}}
                     ]
             
+            # Shared context goes first so consecutive prompts share a cacheable prefix
+            if context:
+                messages.insert(0, {"role": "system", "content": context})
+            
             kwargs = {
                 "model": model,
                 "messages": messages,
                 "temperature": 0.7,
             }
+            if max_tokens:
+                kwargs["max_tokens"] = max_tokens
             
             # Add o1-specific parameters
             if model == "o1":
@@ -197,8 +248,8 @@ def query_llm(prompt: str, client=None, model=None, provider="openai", image_pat
             })
             
             # Add image content if provided
-            if image_path:
-                encoded_image, mime_type = encode_image_file(image_path)
+            if image_path or image_bytes is not None:
+                encoded_image, mime_type = _encode_image(image_path, image_bytes, image_mime_type)
                 messages[0]["content"].append({
                     "type": "image",
                     "source": {
@@ -208,17 +259,28 @@ def query_llm(prompt: str, client=None, model=None, provider="openai", image_pat
                     }
                 })
             
+            kwargs = {}
+            if context:
+                kwargs["system"] = [{"type": "text", "text": context, "cache_control": {"type": "ephemeral"}}]
             response = client.messages.create(
                 model=model,
-                max_tokens=1000,
-                messages=messages
+                max_tokens=max_tokens or 1000,
+                messages=messages,
+                **kwargs
             )
             return response.content[0].text
             
         elif provider == "gemini":
-            model = client.GenerativeModel(model)
-            if image_path:
-                file = genai.upload_file(image_path, mime_type="image/png")
+            model = client.GenerativeModel(model, system_instruction=context) if context else client.GenerativeModel(model)
+            if image_bytes is not None:
+                chat_session = model.start_chat(
+                    history=[{
+                        "role": "user",
+                        "parts": [{"mime_type": image_mime_type or "image/png", "data": image_bytes}, prompt]
+                    }]
+                )
+            elif image_path:
+                file = genai.upload_file(image_path, mime_type=guess_image_mime_type(image_path))
                 chat_session = model.start_chat(
                     history=[{
                         "role": "user",
@@ -239,13 +301,14 @@ def query_llm(prompt: str, client=None, model=None, provider="openai", image_pat
         print(f"Error querying LLM: {e}", file=sys.stderr)
         return None
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description='Query an LLM with a prompt')
     parser.add_argument('--prompt', type=str, help='The prompt to send to the LLM', required=True)
     parser.add_argument('--provider', choices=['openai','anthropic','gemini','local','deepseek','azure','siliconflow'], default='openai', help='The API provider to use')
     parser.add_argument('--model', type=str, help='The model to use (default depends on provider)')
     parser.add_argument('--image', type=str, help='Path to an image file to attach to the prompt')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    configure_logging(default_level=logging.WARNING, text_format="%(levelname)s: %(message)s")
 
     if not args.model:
         if args.provider == 'openai':
@@ -261,7 +324,7 @@ def main():
         elif args.provider == 'azure':
             args.model = os.getenv('AZURE_OPENAI_MODEL_DEPLOYMENT', 'gpt-4o-ms')  # Get from env with fallback
 
-    client = create_llm_client(args.provider)
+    client = get_llm_client(args.provider)
     response = query_llm(args.prompt, client, model=args.model, provider=args.provider, image_path=args.image)
     if response:
         print(response)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+LLM-backed implementation of the executor's plan steps.
+
+Each prompt is split in two:
+
+- a context prefix (instructions, mission, completed phases and the repository
+  file index) that is rebuilt only at phase boundaries, so every step of a phase
+  sends a byte-identical prefix that the provider can serve from its prompt cache
+  (see the `context` argument of llm_api.query_llm);
+- a short per-step suffix with the step, its plan objective, the steps already
+  done in the phase and the files changed since the prefix was built.
+
+The file index lists every source file with the Swift types it declares. It is
+persisted between runs and only files whose size or mtime changed are re-read.
+Generation for independent steps can be started ahead of time with prefetch(), so
+a sequential run waits on the model at most once per batch of independent steps.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from build_validation import IGNORED_DIRS, is_source_path
+from llm_api import query_llm
+
+logger = logging.getLogger(__name__)
+
+StepKey = Tuple[int, int]
+
+DEFAULT_CONCURRENCY = 4       # Generations in flight at once (SUMMITAI_LLM_CONCURRENCY)
+DEFAULT_MAX_TOKENS = 8000
+MAX_INDEX_CHARS = 12000       # File index budget in the context prefix
+MAX_SYMBOLS_PER_FILE = 8
+INDEX_VERSION = 1
+
+SWIFT_DECLARATION = re.compile(
+    r"^\s*(?:@\w+\s+)*(?:(?:public|internal|private|fileprivate|open|final)\s+)*"
+    r"(struct|class|enum|protocol|extension|actor)\s+([A-Za-z_]\w*)", re.MULTILINE)
+# "### FILE: path" followed by one fenced block with the file's full contents
+FILE_BLOCK = re.compile(r"^###\s*FILE:\s*(\S+)\s*\n```[^\n]*\n(.*?)\n```\s*$", re.MULTILINE | re.DOTALL)
+
+INSTRUCTIONS = """You are implementing one step at a time of a 400-step plan for an iOS app.
+Write complete, compilable Swift (SwiftUI, MVVM) that fits the existing files listed below.
+Reply with every file you create or change, each as:
+
+### FILE: <path relative to the SummitAI directory>
+```swift
+<full file contents>
+```
+
+Then one line starting with "SUMMARY:" describing what the step did. Do not
+repeat files you did not change. Never write outside the SummitAI directory."""
+
+def _symbols(text: str) -> List[str]:
+    seen = []
+    for kind, name in SWIFT_DECLARATION.findall(text):
+        label = f"{kind} {name}"
+        if label not in seen:
+            seen.append(label)
+    return seen[:MAX_SYMBOLS_PER_FILE]
+
+class ProjectIndex:
+    """
+    Source files under `root` with the types each declares, memoized by (size, mtime_ns)
+    and persisted to `index_path`.
+    """
+
+    def __init__(self, root: Path, index_path: Path):
+        self.root = Path(root)
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict] = {}
+        try:
+            cached = json.loads(self.index_path.read_text())
+            if cached.get("version") == INDEX_VERSION:
+                self._files = cached["files"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+    def refresh(self) -> Dict[str, Dict]:
+        """Re-stat the tree, re-read changed files and return {path: {"size", "mtime_ns", "symbols"}}."""
+        with self._lock:
+            files, changed = {}, False
+            for directory, dirnames, filenames in os.walk(self.root):
+                dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS)
+                for name in sorted(filenames):
+                    path = Path(directory) / name
+                    relative = path.relative_to(self.root).as_posix()
+                    if not is_source_path(relative):
+                        continue
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    entry = self._files.get(relative)
+                    if not entry or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                        text = path.read_text(encoding="utf-8", errors="replace") if path.suffix == ".swift" else ""
+                        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "symbols": _symbols(text)}
+                        changed = True
+                    files[relative] = entry
+            changed = changed or files.keys() != self._files.keys()
+            self._files = files
+            if changed:
+                temp_path = self.index_path.with_suffix(".tmp")
+                temp_path.write_text(json.dumps({"version": INDEX_VERSION, "files": files}))
+                temp_path.replace(self.index_path)
+            return dict(files)
+
+    @staticmethod
+    def render(files: Dict[str, Dict], limit: int = MAX_INDEX_CHARS) -> str:
+        """One line per file; past `limit` characters, whole directories collapse to a file count."""
+        lines = [f"{path}: {', '.join(entry['symbols'])}" if entry["symbols"] else path
+                 for path, entry in sorted(files.items())]
+        text = "\n".join(lines)
+        if len(text) <= limit:
+            return text
+        counts: Dict[str, int] = {}
+        for path in files:
+            directory = path.rsplit("/", 1)[0] if "/" in path else "."
+            counts[directory] = counts.get(directory, 0) + 1
+        return "\n".join(f"{directory}/ ({count} files)" for directory, count in sorted(counts.items()))[:limit]
+
+class LLMStepExecutor:
+    """
+    Generates and writes the files for one plan step at a time.
+
+    Args:
+        project_root: Executor project root; files are written under its SummitAI directory
+        describe: (phase, step) -> step title
+        objective: (phase, step) -> the plan's objective line, or None
+        context: Mission fields (EXECUTION_CONTEXT)
+        phase_descriptions: Phase number -> title
+        query: Callable with llm_api.query_llm's signature; defaults to it
+    """
+
+    def __init__(self, project_root: Path, describe: Callable[[int, int], str],
+                 objective: Callable[[int, int], Optional[str]], context: Dict,
+                 phase_descriptions: Dict[int, str], provider: str = "openai", model: Optional[str] = None,
+                 concurrency: Optional[int] = None, query: Optional[Callable] = None):
+        self.summitai_dir = Path(project_root) / "SummitAI"
+        self.describe = describe
+        self.objective = objective
+        self.context = context
+        self.phase_descriptions = phase_descriptions
+        self.provider = provider
+        self.model = model
+        self.index = ProjectIndex(self.summitai_dir, Path(project_root) / "llm_file_index.json")
+        # query_llm without a client uses llm_api's shared client for the provider
+        self._query = query or query_llm
+        self._pool = ThreadPoolExecutor(
+            max_workers=concurrency or int(os.environ.get("SUMMITAI_LLM_CONCURRENCY", DEFAULT_CONCURRENCY)),
+            thread_name_prefix="llm-step")
+        self._futures: Dict[StepKey, Future] = {}
+        self._state_lock = threading.Lock()
+        self._prefix_phase: Optional[int] = None
+        self._prefix = ""
+        self._prefix_files: Dict[str, Dict] = {}
+        self._done: Dict[StepKey, str] = {}  # Completed step -> one-line summary
+        self.stats = {"generations": 0, "prefetched": 0, "prefix_builds": 0,
+                      "prefix_chars": 0, "suffix_chars": 0}
+
+    def _call(self, prompt: str, context: str) -> Optional[str]:
+        return self._query(prompt, model=self.model, provider=self.provider,
+                           context=context, max_tokens=DEFAULT_MAX_TOKENS)
+
+    def note_completed(self, phase: int, step: int, summary: Optional[str] = None):
+        """Record a finished step (including ones completed in earlier runs) for later prompts."""
+        with self._state_lock:
+            if summary:
+                self._done[(phase, step)] = summary
+            else:
+                self._done.setdefault((phase, step), self.describe(phase, step))
+
+    def _context_prefix(self, phase: int) -> Tuple[str, Dict[str, Dict]]:
+        """The prompt prefix for `phase`, rebuilt only when the phase changes."""
+        with self._state_lock:
+            if self._prefix_phase == phase:
+                return self._prefix, self._prefix_files
+            files = self.index.refresh()
+            mission = "\n".join(f"- {key}: {value}" for key, value in self.context.items()
+                                if key not in ("total_phases", "steps_per_phase", "total_steps", "last_updated"))
+            completed = "\n".join(f"- Phase {p}: {self.phase_descriptions.get(p, '')}"
+                                  for p in sorted({p for p, _ in self._done if p < phase}))
+            self._prefix = (f"{INSTRUCTIONS}\n\n## Project\n{mission}\n\n"
+                            f"## Completed phases\n{completed or '- none'}\n\n"
+                            f"## Files at the start of phase {phase}\n{ProjectIndex.render(files) or '(empty)'}\n")
+            self._prefix_phase, self._prefix_files = phase, files
+            self.stats["prefix_builds"] += 1
+            return self._prefix, files
+
+    def _step_prompt(self, phase: int, step: int, start_files: Dict[str, Dict]) -> str:
+        current = self.index.refresh()
+        changed = sorted(path for path, entry in current.items()
+                         if start_files.get(path, {}).get("mtime_ns") != entry["mtime_ns"])
+        removed = sorted(set(start_files) - set(current))
+        with self._state_lock:
+            done = [f"- {p}.{s}: {summary}" for (p, s), summary in sorted(self._done.items()) if p == phase]
+        lines = [f"## Phase {phase}: {self.phase_descriptions.get(phase, '')}",
+                 f"Steps done in this phase:\n" + ("\n".join(done) or "- none")]
+        if changed or removed:
+            index = {path: current[path] for path in changed}
+            lines.append("Files changed since the list above:\n" + ProjectIndex.render(index)
+                         + "".join(f"\n{path} (deleted)" for path in removed))
+        lines.append(f"## Now do step {phase}.{step}: {self.describe(phase, step)}")
+        objective = self.objective(phase, step)
+        if objective:
+            lines.append(f"Objective: {objective}")
+        return "\n\n".join(lines)
+
+    def _generate(self, phase: int, step: int) -> Optional[str]:
+        prefix, start_files = self._context_prefix(phase)
+        prompt = self._step_prompt(phase, step, start_files)
+        with self._state_lock:
+            self.stats["generations"] += 1
+            self.stats["prefix_chars"] += len(prefix)
+            self.stats["suffix_chars"] += len(prompt)
+        logger.info(f"Generating Phase {phase}.Step {step} ({len(prompt)} prompt chars after a "
+                    f"{len(prefix)}-char cached prefix)")
+        return self._call(prompt, prefix)
+
+    def prefetch(self, keys: Iterable[StepKey]):
+        """Start generating `keys` in the background; execute() picks the results up."""
+        with self._state_lock:
+            for key in keys:
+                if key not in self._futures and key not in self._done:
+                    self._futures[key] = self._pool.submit(self._generate, *key)
+                    self.stats["prefetched"] += 1
+
+    def _resolve(self, relative: str) -> Optional[Path]:
+        relative = relative[len("SummitAI/"):] if relative.startswith("SummitAI/") else relative
+        target = (self.summitai_dir / relative).resolve()
+        root = self.summitai_dir.resolve()
+        if root not in target.parents or ".git" in target.relative_to(root).parts:
+            return None
+        return target
+
+    def execute(self, phase: int, step: int) -> Tuple[bool, str, List[str]]:
+        """
+        Generate (or collect the prefetched) response for a step and write its files.
+        A prefetched response is used once; a retry generates afresh.
+        """
+        with self._state_lock:
+            future = self._futures.pop((phase, step), None)
+        try:
+            response = future.result() if future is not None else self._generate(phase, step)
+        except Exception as e:
+            return False, f"LLM generation failed: {e}", []
+        if not response:
+            return False, "LLM returned no response", []
+
+        files_changed = []
+        for relative, content in FILE_BLOCK.findall(response):
+            target = self._resolve(relative)
+            if target is None:
+                logger.warning(f"Phase {phase}.Step {step}: ignoring file outside SummitAI: {relative}")
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = target.with_name(target.name + ".tmp")
+            temp_path.write_text(content + "\n", encoding="utf-8")
+            temp_path.replace(target)
+            files_changed.append(f"SummitAI/{target.relative_to(self.summitai_dir.resolve()).as_posix()}")
+        if not files_changed:
+            return False, "LLM response contained no files", []
+
+        match = re.search(r"^SUMMARY:\s*(.+)$", response, re.MULTILINE)
+        summary = match.group(1).strip() if match else self.describe(phase, step)
+        self.note_completed(phase, step, summary)
+        return True, summary, files_changed
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Virtual-time simulation of the autonomous executor's schedule.
+
+Replays per-step execute/validate/commit/recovery durations and failure rates
+through the same step graph, worker count and resource rules as
+step_scheduler.DagScheduler, without running anything. Builds are serialized on a
+"build" lock and commits and recovery on a "repo" lock, as in the executor.
+Durations come from a config file, from recorded step_timings.jsonl records, or
+from DEFAULT_STAGE_SECONDS, in that order of precedence.
+
+The result is a projected makespan, worker and lock utilisation, and the critical
+path in seconds of wall time, so an overnight run can be sized (or a scheduler
+change judged) in well under a second.
+"""
+
+import heapq
+import json
+import random
+from collections import defaultdict, deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Generator, Iterable, List, Optional, Set, Tuple
+
+from step_scheduler import StepKey, StepNode, critical_path
+
+# Per-attempt seconds when nothing is recorded or configured; execute matches the
+# placeholder step's one-second sleep
+DEFAULT_STAGE_SECONDS = {"execute": 1.0, "validate": 0.0, "commit": 0.05, "recovery": 1.0}
+LOCKS = ("build", "repo")
+
+@dataclass
+class StepProfile:
+    """Seconds per attempt for each stage, and the chance an attempt fails validation."""
+    execute: float = DEFAULT_STAGE_SECONDS["execute"]
+    validate: float = DEFAULT_STAGE_SECONDS["validate"]
+    commit: float = DEFAULT_STAGE_SECONDS["commit"]
+    recovery: float = DEFAULT_STAGE_SECONDS["recovery"]
+    failure_rate: float = 0.0
+    source: str = "default"
+
+def _profile_fields(values: Dict) -> Dict:
+    return {name: float(values[name]) for name in ("execute", "validate", "commit", "recovery", "failure_rate")
+            if name in values}
+
+def recorded_profiles(records: Iterable[Dict]) -> Dict[StepKey, StepProfile]:
+    """Average per-attempt stage times and failure rates from execution_profile step records."""
+    totals = defaultdict(lambda: defaultdict(float))
+    for r in records:
+        if r.get("type") != "step" or not r.get("attempts"):
+            continue
+        t = totals[(r["phase"], r["step"])]
+        attempts = r["attempts"]
+        failures = attempts - 1 + (0 if r["success"] else 1)
+        t["attempts"] += attempts
+        t["failures"] += failures
+        t["recoveries"] += attempts - 1
+        t["commits"] += 1 if r["success"] else 0
+        for stage in ("execute", "validate", "commit", "recovery"):
+            t[stage] += r.get(stage, 0.0)
+
+    profiles = {}
+    for key, t in totals.items():
+        profiles[key] = StepProfile(
+            execute=t["execute"] / t["attempts"],
+            validate=t["validate"] / t["attempts"],
+            commit=t["commit"] / t["commits"] if t["commits"] else DEFAULT_STAGE_SECONDS["commit"],
+            recovery=t["recovery"] / t["recoveries"] if t["recoveries"] else DEFAULT_STAGE_SECONDS["recovery"],
+            failure_rate=t["failures"] / t["attempts"],
+            source="recorded",
+        )
+    return profiles
+
+def build_profiles(keys: Iterable[StepKey], records: Iterable[Dict] = (),
+                   config: Optional[Dict] = None) -> Dict[StepKey, StepProfile]:
+    """
+    Profile for every step in `keys`.
+
+    Args:
+        records: Timing records from execution_profile.load_records
+        config: {"default": {stage: seconds, "failure_rate": p}, "steps": {"P.S": {...}}}.
+            Configured steps override recordings; the configured default applies to steps
+            with no recording and falls back to the mean of recorded steps, then to
+            DEFAULT_STAGE_SECONDS.
+    """
+    config = config or {}
+    recorded = recorded_profiles(records)
+    if recorded:
+        count = len(recorded)
+        base = StepProfile(**{name: sum(getattr(p, name) for p in recorded.values()) / count
+                              for name in ("execute", "validate", "commit", "recovery", "failure_rate")},
+                           source="recorded mean")
+    else:
+        base = StepProfile()
+    if "default" in config:
+        base = replace(base, **_profile_fields(config["default"]), source="configured default")
+
+    profiles = {}
+    for key in keys:
+        profile = recorded.get(key, base)
+        overrides = config.get("steps", {}).get(f"{key[0]}.{key[1]}")
+        if overrides:
+            profile = replace(profile, **_profile_fields(overrides), source="configured")
+        profiles[key] = profile
+    return profiles
+
+class ScheduleSimulator:
+    """
+    Discrete-event simulation of one run of the step graph on `workers` workers.
+
+    Steps start in the same order DagScheduler starts them. Each attempt executes,
+    validates under the build lock and then either commits under the repo lock or
+    fails and recovers under the repo lock before the next attempt.
+    """
+
+    def __init__(self, graph: Dict[StepKey, StepNode], profiles: Dict[StepKey, StepProfile],
+                 workers: int = 1, max_attempts: int = 4, seed: int = 0):
+        self.graph = graph
+        self.profiles = profiles
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.rng = random.Random(seed)
+
+    def _step(self, key: StepKey, stats: Dict) -> Generator[Tuple[str, object], None, bool]:
+        profile = self.profiles[key]
+        for attempt in range(1, self.max_attempts + 1):
+            stats["attempts"] += 1
+            yield "delay", profile.execute
+            yield "acquire", "build"
+            yield "delay", profile.validate
+            yield "release", "build"
+            if self.rng.random() >= profile.failure_rate:
+                yield "acquire", "repo"
+                yield "delay", profile.commit
+                yield "release", "repo"
+                return True
+            stats["failed_attempts"] += 1
+            if attempt == self.max_attempts:
+                return False
+            yield "acquire", "repo"
+            yield "delay", profile.recovery
+            yield "release", "repo"
+        return False
+
+    def run(self, already_done: Set[StepKey] = frozenset()) -> Dict:
+        done: Set[StepKey] = set(already_done)
+        pending = [key for key in sorted(self.graph) if key not in done]
+        failed: List[StepKey] = []
+        held: Set[str] = set()
+        running: Dict[StepKey, Generator] = {}
+        started: Dict[StepKey, float] = {}
+        spans: Dict[StepKey, float] = {}
+        active: Dict[StepKey, float] = defaultdict(float)
+        stats = {"attempts": 0, "failed_attempts": 0}
+        lock_holder: Dict[str, Optional[StepKey]] = {name: None for name in LOCKS}
+        lock_queue: Dict[str, deque] = {name: deque() for name in LOCKS}
+        lock_busy = {name: 0.0 for name in LOCKS}
+        lock_since = {name: 0.0 for name in LOCKS}
+        lock_wait = {name: 0.0 for name in LOCKS}
+        waiting_since: Dict[StepKey, float] = {}
+        events: List[Tuple[float, int, StepKey]] = []
+        sequence = 0
+        now = 0.0
+
+        def wake(key: StepKey, at: float):
+            nonlocal sequence
+            sequence += 1
+            heapq.heappush(events, (at, sequence, key))
+
+        def start_ready():
+            if failed:
+                return
+            for key in list(pending):
+                if len(running) >= self.workers:
+                    break
+                node = self.graph[key]
+                if not all(dep in done or dep not in self.graph for dep in node.depends_on):
+                    continue
+                if node.resources & held:
+                    continue
+                pending.remove(key)
+                held.update(node.resources)
+                running[key] = self._step(key, stats)
+                started[key] = now
+                wake(key, now)
+
+        start_ready()
+        while events:
+            now, _, key = heapq.heappop(events)
+            process = running[key]
+            try:
+                # Advance the step until it has to wait for time to pass or for a lock
+                while True:
+                    command, arg = next(process)
+                    if command == "delay":
+                        active[key] += arg
+                        wake(key, now + arg)
+                        break
+                    if command == "acquire":
+                        if lock_holder[arg] is None:
+                            lock_holder[arg] = key
+                            lock_since[arg] = now
+                            continue
+                        lock_queue[arg].append(key)
+                        waiting_since[key] = now
+                        break
+                    if command == "release":
+                        lock_busy[arg] += now - lock_since[arg]
+                        lock_holder[arg] = None
+                        if lock_queue[arg]:
+                            next_key = lock_queue[arg].popleft()
+                            lock_wait[arg] += now - waiting_since.pop(next_key)
+                            lock_holder[arg] = next_key
+                            lock_since[arg] = now
+                            wake(next_key, now)
+            except StopIteration as result:
+                del running[key]
+                held.difference_update(self.graph[key].resources)
+                spans[key] = now - started[key]
+                if result.value:
+                    done.add(key)
+                else:
+                    failed.append(key)
+                start_ready()
+
+        makespan = now
+        capacity = self.workers * makespan
+        length, path = critical_path(self.graph, spans) if spans else (0.0, [])
+        return {
+            "workers": self.workers,
+            "steps_simulated": len(spans),
+            "makespan_seconds": round(makespan, 2),
+            "serial_seconds": round(sum(active.values(), 0.0), 2),
+            "worker_utilisation": round(sum(spans.values()) / capacity, 3) if capacity else 0.0,
+            "worker_active_utilisation": round(sum(active.values()) / capacity, 3) if capacity else 0.0,
+            "lock_utilisation": {name: round(lock_busy[name] / makespan, 3) if makespan else 0.0 for name in LOCKS},
+            "lock_wait_seconds": {name: round(seconds, 2) for name, seconds in lock_wait.items()},
+            "attempts": stats["attempts"],
+            "failed_attempts": stats["failed_attempts"],
+            "failed_steps": [f"{phase}.{step}" for phase, step in failed],
+            "unstarted_steps": len(pending),
+            "critical_path_seconds": round(length, 2),
+            "critical_path": [f"{phase}.{step}" for phase, step in path],
+        }
+
+def simulate_schedule(graph: Dict[StepKey, StepNode], profiles: Dict[StepKey, StepProfile],
+                      workers: int = 1, max_attempts: int = 4, runs: int = 1, seed: int = 0,
+                      already_done: Set[StepKey] = frozenset()) -> Dict:
+    """
+    Simulate `runs` runs with seeds seed, seed+1, ... and report the first one, plus
+    makespan percentiles across runs when failures make runs differ.
+    """
+    reports = [ScheduleSimulator(graph, profiles, workers, max_attempts, seed + i).run(already_done)
+               for i in range(max(1, runs))]
+    report = reports[0]
+    sources = defaultdict(int)
+    for key in graph:
+        if key not in already_done:
+            sources[profiles[key].source] += 1
+    report["profile_sources"] = dict(sources)
+    report["seed"] = seed
+    if len(reports) > 1:
+        makespans = sorted(r["makespan_seconds"] for r in reports)
+        report["runs"] = len(reports)
+        report["makespan_percentiles"] = {
+            f"p{p}": makespans[min(len(makespans) - 1, int(len(makespans) * p / 100))] for p in (50, 90, 99)
+        }
+        report["runs_with_failed_steps"] = sum(1 for r in reports if r["failed_steps"])
+    return report
+
+def load_config(path: Path) -> Dict:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from screenshot_utils import require_pillow, take_screenshot_sync
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "summitai" / "screenshot_cache.json"
+HASH_SIZE = 8          # dHash of 8x8 comparisons -> 64-bit hash
+GRID_SIZE = 16         # Thumbnail grid kept per entry for region diffs
+DEFAULT_THRESHOLD = 4  # Hamming distance above which a page counts as changed
+CELL_THRESHOLD = 12    # Mean grey-level difference above which a grid cell counts as changed
+
+def _load_image(data: bytes):
+    Image = require_pillow()
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image.convert('L')
+
+def dhash(image, hash_size: int = HASH_SIZE) -> int:
+    """Difference hash: one bit per horizontally adjacent pair in a tiny greyscale copy."""
+    Image = require_pillow()
+    pixels = image.resize((hash_size + 1, hash_size), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+def thumbnail_grid(image, grid_size: int = GRID_SIZE) -> List[int]:
+    """Mean grey level of each cell in a grid_size x grid_size grid, row by row."""
+    Image = require_pillow()
+    return list(image.resize((grid_size, grid_size), Image.BOX).tobytes())
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+def changed_regions(old_grid: List[int], new_grid: List[int], size: Tuple[int, int],
+                    grid_size: int = GRID_SIZE, cell_threshold: int = CELL_THRESHOLD) -> List[Dict]:
+    """
+    Compare two thumbnail grids and return the changed cells as pixel rectangles of `size`.
+
+    Each region carries the mean grey-level difference of its cell as "delta".
+    """
+    width, height = size
+    cell_width, cell_height = width / grid_size, height / grid_size
+    regions = []
+    for index, (old, new) in enumerate(zip(old_grid, new_grid)):
+        delta = abs(old - new)
+        if delta > cell_threshold:
+            row, col = divmod(index, grid_size)
+            regions.append({
+                'x': int(col * cell_width),
+                'y': int(row * cell_height),
+                'width': int(cell_width) or 1,
+                'height': int(cell_height) or 1,
+                'delta': delta,
+            })
+    return regions
+
+def bounding_box(regions: List[Dict]) -> Optional[Dict]:
+    """Smallest rectangle covering every region, or None."""
+    if not regions:
+        return None
+    left = min(r['x'] for r in regions)
+    top = min(r['y'] for r in regions)
+    right = max(r['x'] + r['width'] for r in regions)
+    bottom = max(r['y'] + r['height'] for r in regions)
+    return {'x': left, 'y': top, 'width': right - left, 'height': bottom - top}
+
+def diff_images(old_data: bytes, new_data: bytes, threshold: int = DEFAULT_THRESHOLD) -> Dict:
+    """Visual diff of two encoded images; see ScreenshotCache.compare for the report layout."""
+    old_image, new_image = _load_image(old_data), _load_image(new_data)
+    distance = hamming_distance(dhash(old_image), dhash(new_image))
+    regions = changed_regions(thumbnail_grid(old_image), thumbnail_grid(new_image), new_image.size)
+    return {
+        'changed': distance > threshold or bool(regions) or old_image.size != new_image.size,
+        'distance': distance,
+        'regions': regions,
+        'bounding_box': bounding_box(regions),
+    }
+
+class ScreenshotCache:
+    """
+    Perceptual-hash store for screenshots, keyed by URL and viewport.
+
+    Each entry keeps a 64-bit dHash and a small thumbnail grid, so a new capture can be
+    compared with the last one without keeping the old image. Callers use the report's
+    "changed" flag to skip vision queries for pages that look the same as last time.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, threshold: int = DEFAULT_THRESHOLD):
+        self.path = Path(path)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._entries = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    @staticmethod
+    def make_key(url: str, width: int, height: int) -> str:
+        return f"{url}|{width}x{height}"
+
+    def get(self, url: str, width: int, height: int) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(self.make_key(url, width, height))
+
+    def compare(self, url: str, width: int, height: int, image_data: bytes,
+                image_path: Optional[str] = None, update: bool = True) -> Dict:
+        """
+        Compare a new capture with the cached one for the same URL and viewport.
+
+        Returns:
+            Dict: {"changed", "distance", "hash", "previous_hash", "previous_path",
+            "regions", "bounding_box"}. "changed" is True for a first capture, a size
+            change, a hash distance above the threshold, or any changed grid cell (the
+            hash alone ignores uniform brightness shifts). "regions" lists the changed
+            grid cells in pixels of the new image.
+        """
+        image = _load_image(image_data)
+        new_hash = dhash(image)
+        new_grid = thumbnail_grid(image)
+        key = self.make_key(url, width, height)
+
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is None:
+                report = {'changed': True, 'distance': None, 'regions': [], 'bounding_box': None,
+                          'previous_hash': None, 'previous_path': None}
+            else:
+                distance = hamming_distance(int(previous['hash'], 16), new_hash)
+                regions = changed_regions(previous['grid'], new_grid, image.size)
+                report = {
+                    'changed': (distance > self.threshold or bool(regions)
+                                or tuple(previous['size']) != image.size),
+                    'distance': distance,
+                    'regions': regions,
+                    'bounding_box': bounding_box(regions),
+                    'previous_hash': previous['hash'],
+                    'previous_path': previous.get('path'),
+                }
+            report['hash'] = f"{new_hash:016x}"
+
+            if update and report['changed']:
+                self._entries[key] = {
+                    'hash': report['hash'],
+                    'grid': new_grid,
+                    'size': list(image.size),
+                    'path': image_path,
+                    'updated': time.time(),
+                }
+                self._save()
+        return report
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps(self._entries))
+        temp_path.replace(self.path)
+
+def screenshot_if_changed(url: str, cache: ScreenshotCache, width: int = 1280, height: int = 720,
+                          output_path: str = None, **options) -> Tuple[str, Dict]:
+    """
+    Take a screenshot and compare it with the cached capture of the same page.
+
+    Returns:
+        Tuple[str, Dict]: (screenshot path, report from ScreenshotCache.compare). When
+        report["changed"] is False the caller can reuse its previous vision answer.
+    """
+    path = take_screenshot_sync(url, output_path, width, height, **options)
+    report = cache.compare(url, width, height, Path(path).read_bytes(), path)
+    return path, report
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Screenshot a page and report whether it changed since the last capture')
+    parser.add_argument('url', nargs='?', help='URL to take screenshot of')
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'), help='Compare two image files instead')
+    parser.add_argument('--output', '-o', help='Output path for screenshot')
+    parser.add_argument('--width', '-w', type=int, default=1280, help='Viewport width')
+    parser.add_argument('--height', '-H', type=int, default=720, help='Viewport height')
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE_PATH),
+                        help=f'Hash cache location (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                        help=f'Hash distance above which the page counts as changed (default: {DEFAULT_THRESHOLD})')
+    args = parser.parse_args()
+
+    if args.diff:
+        old_path, new_path = args.diff
+        report = diff_images(Path(old_path).read_bytes(), Path(new_path).read_bytes(), args.threshold)
+    elif args.url:
+        cache = ScreenshotCache(args.cache, args.threshold)
+        path, report = screenshot_if_changed(args.url, cache, args.width, args.height, args.output)
+        report['path'] = path
+    else:
+        parser.error('provide a URL or --diff OLD NEW')
+
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report['changed'] else 3)
+
+if __name__ == '__main__':
+    main()
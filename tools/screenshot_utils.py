@@ -1,56 +1,447 @@
 #!/usr/bin/env python3
 
 import asyncio
+import io
+import math
+import re
+from contextlib import asynccontextmanager
 from playwright.async_api import async_playwright
 import os
 import tempfile
+import time
 from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
 
-async def take_screenshot(url: str, output_path: str = None, width: int = 1280, height: int = 720) -> str:
+DEFAULT_VIEWPORT = (1280, 720)
+
+# Image format -> file extension. Playwright encodes PNG and JPEG itself; WebP and
+# any pixel/byte budget go through Pillow, which is only imported when needed.
+IMAGE_FORMATS = {'png': 'png', 'jpeg': 'jpg', 'webp': 'webp'}
+DEFAULT_QUALITY = 80
+MIN_QUALITY = 30
+
+# Screenshots taken without an output path are spilled here, preferring tmpfs so the
+# bytes never reach a physical disk, and are removed once older than SPILL_MAX_AGE.
+SPILL_PREFIX = 'summitai-shot-'
+SPILL_MAX_AGE = 3600  # seconds
+_last_cleanup = 0.0
+
+def spill_dir() -> str:
+    """Directory for temporary screenshots: $SCREENSHOT_SPILL_DIR, else /dev/shm, else the temp dir."""
+    configured = os.environ.get('SCREENSHOT_SPILL_DIR')
+    if configured:
+        return configured
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+def cleanup_stale_screenshots(max_age: float = SPILL_MAX_AGE, directory: str = None) -> int:
+    """Delete spilled screenshots older than max_age seconds and return how many were removed."""
+    cutoff = time.time() - max_age
+    removed = 0
+    with os.scandir(directory or spill_dir()) as entries:
+        for entry in entries:
+            if not entry.name.startswith(SPILL_PREFIX) or not entry.is_file():
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass  # Removed concurrently by another process
+    return removed
+
+def _spill_path(extension: str) -> str:
+    """Create a temporary screenshot file, sweeping stale ones at most once a minute."""
+    global _last_cleanup
+    directory = spill_dir()
+    if time.time() - _last_cleanup > 60:
+        _last_cleanup = time.time()
+        cleanup_stale_screenshots(directory=directory)
+    fd, path = tempfile.mkstemp(prefix=SPILL_PREFIX, suffix=f'.{extension}', dir=directory)
+    os.close(fd)
+    return path
+
+@asynccontextmanager
+async def browser_session(browser=None) -> AsyncIterator:
+    """
+    Yield `browser` unchanged, or launch a headless Chromium for the duration of the block.
+
+    Lets the capture functions share a browser kept warm by a long-lived caller
+    (tools/tool_server.py) while one-shot callers still get their own.
+    """
+    if browser is not None:
+        yield browser
+        return
+    async with async_playwright() as p:
+        launched = await p.chromium.launch(headless=True)
+        try:
+            yield launched
+        finally:
+            await launched.close()
+
+def normalize_format(image_format: Optional[str], output_path: Optional[str] = None) -> str:
+    """
+    Resolve the image format from an explicit value or the output file extension.
+
+    An extension that is not an image format (shot.out, capture.tmp) means PNG; only an
+    explicitly requested unsupported format raises ValueError.
+    """
+    if not image_format:
+        suffix = Path(output_path).suffix.lstrip('.').lower() if output_path else ''
+        suffix = 'jpeg' if suffix == 'jpg' else suffix
+        return suffix if suffix in IMAGE_FORMATS else 'png'
+    image_format = image_format.lower()
+    if image_format == 'jpg':
+        image_format = 'jpeg'
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    return image_format
+
+def require_pillow():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError("Pillow is required for WebP output and size budgets: pip install pillow")
+    return Image
+
+def _encode_image(image, image_format: str, quality: Optional[int]) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == 'png':
+        image.save(buffer, format='PNG', optimize=True)
+    else:
+        if image_format == 'jpeg' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(buffer, format=image_format.upper(), quality=quality or DEFAULT_QUALITY)
+    return buffer.getvalue()
+
+def fit_to_budget(data: bytes, image_format: str = 'png', quality: Optional[int] = None,
+                  max_pixels: Optional[int] = None, max_bytes: Optional[int] = None) -> bytes:
+    """
+    Re-encode a screenshot into `image_format`, downscaling it to fit the budgets.
+
+    The image is first scaled down to at most `max_pixels` pixels. While the encoding
+    is still larger than `max_bytes`, lossy formats lower their quality down to
+    MIN_QUALITY before the image is shrunk further.
+    """
+    Image = require_pillow()
+    image = Image.open(io.BytesIO(data))
+    image.load()
+
+    if max_pixels and image.width * image.height > max_pixels:
+        scale = math.sqrt(max_pixels / (image.width * image.height))
+        image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                             Image.LANCZOS)
+
+    quality = quality or DEFAULT_QUALITY
+    encoded = _encode_image(image, image_format, quality)
+    while max_bytes and len(encoded) > max_bytes:
+        if image_format != 'png' and quality > MIN_QUALITY:
+            quality = max(MIN_QUALITY, quality - 15)
+        elif image.width > 16 and image.height > 16:
+            image = image.resize((int(image.width * 0.75), int(image.height * 0.75)), Image.LANCZOS)
+        else:
+            break
+        encoded = _encode_image(image, image_format, quality)
+    return encoded
+
+async def capture_page(page, image_format: str = 'png', quality: Optional[int] = None,
+                       clip: Optional[str] = None, max_pixels: Optional[int] = None,
+                       max_bytes: Optional[int] = None, region: Optional[Dict] = None) -> bytes:
+    """
+    Capture an already loaded page and return the encoded image.
+
+    Args:
+        page: Playwright page
+        image_format (str, optional): 'png', 'jpeg' or 'webp'. Defaults to 'png'.
+        quality (int, optional): JPEG/WebP quality (1-100)
+        clip (str, optional): None for the full page, 'viewport' for the visible area only,
+            or a CSS selector to capture just the first matching element
+        max_pixels (int, optional): Downscale until width * height fits
+        max_bytes (int, optional): Lower quality / downscale until the encoded size fits
+        region (Dict, optional): Explicit {"x", "y", "width", "height"} rectangle of the full page
+
+    Returns:
+        bytes: The encoded screenshot
+    """
+    image_format = normalize_format(image_format)
+    post_process = image_format == 'webp' or bool(max_pixels) or bool(max_bytes)
+    options = {'type': 'jpeg' if image_format == 'jpeg' and not post_process else 'png'}
+    if options['type'] == 'jpeg':
+        options['quality'] = quality or DEFAULT_QUALITY
+
+    target = page
+    if region is not None:
+        options.update(full_page=True, clip=region)
+    elif clip is None:
+        options['full_page'] = True
+    elif clip != 'viewport':
+        target = page.locator(clip).first
+
+    data = await target.screenshot(**options)
+    if post_process:
+        data = await asyncio.to_thread(fit_to_budget, data, image_format, quality, max_pixels, max_bytes)
+    return data
+
+async def take_screenshot(url: str, output_path: str = None, width: int = 1280, height: int = 720,
+                          image_format: Optional[str] = None, quality: Optional[int] = None,
+                          clip: Optional[str] = None, max_pixels: Optional[int] = None,
+                          max_bytes: Optional[int] = None, browser=None) -> str:
     """
     Take a screenshot of a webpage using Playwright.
-    
+
     Args:
         url (str): The URL to take a screenshot of
-        output_path (str, optional): Path to save the screenshot. If None, saves to a temporary file.
+        output_path (str, optional): Path to save the screenshot. If None, saves to a temporary
+            file in spill_dir() that is cleaned up after SPILL_MAX_AGE. Use take_screenshot_bytes
+            to skip the file entirely.
         width (int, optional): Viewport width. Defaults to 1280.
         height (int, optional): Viewport height. Defaults to 720.
-    
+        image_format (str, optional): 'png', 'jpeg' or 'webp'. Defaults to the output_path extension, else 'png'.
+        quality (int, optional): JPEG/WebP quality (1-100)
+        clip (str, optional): None for the full page, 'viewport', or a CSS selector
+        max_pixels (int, optional): Maximum width * height; larger captures are downscaled
+        max_bytes (int, optional): Maximum encoded size in bytes
+        browser (optional): Playwright browser to reuse; one is launched and closed if omitted
+
     Returns:
         str: Path to the saved screenshot
     """
+    image_format = normalize_format(image_format, output_path)
+    data = await take_screenshot_bytes(url, width, height, image_format, quality, clip, max_pixels, max_bytes,
+                                       browser)
     if output_path is None:
-        # Create a temporary file with .png extension
-        temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-        output_path = temp_file.name
-        temp_file.close()
+        output_path = _spill_path(IMAGE_FORMATS[image_format])
+    Path(output_path).write_bytes(data)
+    return output_path
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+def take_screenshot_sync(url: str, output_path: str = None, width: int = 1280, height: int = 720,
+                         **options) -> str:
+    """
+    Synchronous wrapper for take_screenshot.
+    """
+    return asyncio.run(take_screenshot(url, output_path, width, height, **options))
+
+async def take_screenshot_bytes(url: str, width: int = 1280, height: int = 720,
+                                image_format: str = 'png', quality: Optional[int] = None,
+                                clip: Optional[str] = None, max_pixels: Optional[int] = None,
+                                max_bytes: Optional[int] = None, browser=None) -> bytes:
+    """
+    Take a screenshot and return the encoded image without writing it to disk.
+
+    Pass the result to llm_api.query_llm(..., image_bytes=data) to send it straight
+    to a vision model. Arguments are as for take_screenshot.
+
+    Returns:
+        bytes: The encoded screenshot
+    """
+    async with browser_session(browser) as browser:
         page = await browser.new_page(viewport={'width': width, 'height': height})
-        
         try:
             await page.goto(url, wait_until='networkidle')
-            await page.screenshot(path=output_path, full_page=True)
+            return await capture_page(page, image_format, quality, clip, max_pixels, max_bytes)
         finally:
-            await browser.close()
-    
-    return output_path
+            await page.close()
 
-def take_screenshot_sync(url: str, output_path: str = None, width: int = 1280, height: int = 720) -> str:
+def take_screenshot_bytes_sync(url: str, width: int = 1280, height: int = 720, **options) -> bytes:
     """
-    Synchronous wrapper for take_screenshot.
+    Synchronous wrapper for take_screenshot_bytes.
     """
-    return asyncio.run(take_screenshot(url, output_path, width, height))
+    return asyncio.run(take_screenshot_bytes(url, width, height, **options))
 
-if __name__ == "__main__":
+async def take_screenshot_tiles(url: str, output_dir: str = None, tile_height: int = 2000,
+                                width: int = 1280, height: int = 720, image_format: str = 'png',
+                                quality: Optional[int] = None, max_pixels: Optional[int] = None,
+                                max_bytes: Optional[int] = None, browser=None) -> List[str]:
+    """
+    Capture a long page as a series of fixed-height tiles instead of one huge image.
+
+    Budgets apply per tile. Tiles are named <page>_<width>x<height>_tile<N>.<ext>.
+
+    Returns:
+        List[str]: Tile paths from the top of the page down
+    """
+    image_format = normalize_format(image_format)
+    if output_dir is None:
+        output_dir = tempfile.mkdtemp(prefix='screenshots-')
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = Path(screenshot_filename(url, width, height)).stem
+
+    paths = []
+    async with browser_session(browser) as browser:
+        page = await browser.new_page(viewport={'width': width, 'height': height})
+        try:
+            await page.goto(url, wait_until='networkidle')
+            page_height = await page.evaluate('document.documentElement.scrollHeight')
+            for n, top in enumerate(range(0, max(page_height, 1), tile_height)):
+                region = {'x': 0, 'y': top, 'width': width, 'height': min(tile_height, page_height - top)}
+                data = await capture_page(page, image_format, quality, None, max_pixels, max_bytes, region)
+                path = output_dir / f"{stem}_tile{n}.{IMAGE_FORMATS[image_format]}"
+                path.write_bytes(data)
+                paths.append(str(path))
+        finally:
+            await page.close()
+    return paths
+
+def take_screenshot_tiles_sync(url: str, output_dir: str = None, tile_height: int = 2000, **options) -> List[str]:
+    """
+    Synchronous wrapper for take_screenshot_tiles.
+    """
+    return asyncio.run(take_screenshot_tiles(url, output_dir, tile_height, **options))
+
+def screenshot_filename(url: str, width: int, height: int, extension: str = 'png') -> str:
+    """Build a filesystem-safe, unique-per-viewport file name for a URL."""
+    parsed = urlparse(url)
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', f"{parsed.netloc}{parsed.path}").strip('_') or 'page'
+    return f"{slug[:100]}_{width}x{height}.{extension}"
+
+async def take_screenshots(urls: Iterable[str], output_dir: str = None,
+                           viewports: Sequence[Tuple[int, int]] = (DEFAULT_VIEWPORT,),
+                           max_concurrent: int = 4, browser=None, **options) -> List[Dict]:
+    """
+    Take screenshots of many webpages, sharing one browser across all of them.
+
+    Each URL is loaded once in its own page and captured at every viewport size by
+    resizing. At most `max_concurrent` pages are open at a time, and files are written
+    in worker threads so disk I/O overlaps with the next capture.
+
+    Args:
+        urls (Iterable[str]): The URLs to take screenshots of
+        output_dir (str, optional): Directory for the screenshots. If None, a temporary directory is created.
+        viewports (Sequence[Tuple[int, int]], optional): (width, height) pairs to capture each URL at.
+        max_concurrent (int, optional): Maximum number of pages open at once. Defaults to 4.
+        browser (optional): Playwright browser to reuse; one is launched and closed if omitted
+        **options: image_format, quality, clip, max_pixels and max_bytes, as for capture_page
+
+    Returns:
+        List[Dict]: One {"url", "width", "height", "path", "error"} record per URL and viewport,
+        in input order. "path" is None when the capture failed.
+    """
+    urls = list(urls)
+    viewports = list(viewports) or [DEFAULT_VIEWPORT]
+    options['image_format'] = normalize_format(options.get('image_format'))
+    extension = IMAGE_FORMATS[options['image_format']]
+    if output_dir is None:
+        output_dir = tempfile.mkdtemp(prefix='screenshots-')
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def capture_url(browser, url: str) -> List[Dict]:
+        records = [{'url': url, 'width': w, 'height': h, 'path': None, 'error': None} for w, h in viewports]
+        writes = []
+        async with semaphore:
+            first_width, first_height = viewports[0]
+            page = await browser.new_page(viewport={'width': first_width, 'height': first_height})
+            try:
+                await page.goto(url, wait_until='networkidle')
+                for record in records:
+                    if (record['width'], record['height']) != (first_width, first_height):
+                        await page.set_viewport_size({'width': record['width'], 'height': record['height']})
+                        await page.wait_for_load_state('networkidle')
+                    data = await capture_page(page, **options)
+                    path = output_dir / screenshot_filename(url, record['width'], record['height'], extension)
+                    writes.append(asyncio.create_task(asyncio.to_thread(path.write_bytes, data)))
+                    record['path'] = str(path)
+            except Exception as e:
+                for record in records:
+                    if record['path'] is None:
+                        record['error'] = str(e)
+            finally:
+                await page.close()
+        await asyncio.gather(*writes)
+        return records
+
+    async with browser_session(browser) as browser:
+        per_url = await asyncio.gather(*(capture_url(browser, url) for url in urls))
+
+    return [record for records in per_url for record in records]
+
+def take_screenshots_sync(urls: Iterable[str], output_dir: str = None,
+                          viewports: Sequence[Tuple[int, int]] = (DEFAULT_VIEWPORT,),
+                          max_concurrent: int = 4, **options) -> List[Dict]:
+    """
+    Synchronous wrapper for take_screenshots.
+    """
+    return asyncio.run(take_screenshots(urls, output_dir, viewports, max_concurrent, **options))
+
+def parse_viewport(value: str) -> Tuple[int, int]:
+    """Parse a WIDTHxHEIGHT string such as 1280x720."""
+    try:
+        width, height = value.lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise ValueError(f"Invalid viewport '{value}', expected WIDTHxHEIGHT")
+
+def build_parser():
     import argparse
     parser = argparse.ArgumentParser(description='Take a screenshot of a webpage')
-    parser.add_argument('url', help='URL to take screenshot of')
-    parser.add_argument('--output', '-o', help='Output path for screenshot')
+    parser.add_argument('urls', nargs='+', metavar='url', help='URL(s) to take screenshot of')
+    parser.add_argument('--output', '-o', help='Output path for screenshot (single URL only)')
     parser.add_argument('--width', '-w', type=int, default=1280, help='Viewport width')
     parser.add_argument('--height', '-H', type=int, default=720, help='Viewport height')
-    
-    args = parser.parse_args()
-    output_path = take_screenshot_sync(args.url, args.output, args.width, args.height)
-    print(f"Screenshot saved to: {output_path}") 
\ No newline at end of file
+    parser.add_argument('--output-dir', '-d', help='Directory for batch screenshots')
+    parser.add_argument('--viewport', action='append', type=parse_viewport, metavar='WIDTHxHEIGHT',
+                        help='Viewport size to capture; repeat for several sizes per URL (batch mode)')
+    parser.add_argument('--max-concurrent', type=int, default=4,
+                        help='Maximum number of pages open at once in batch mode (default: 4)')
+    parser.add_argument('--format', '-f', dest='image_format', choices=['png', 'jpeg', 'jpg', 'webp'],
+                        help='Image format (default: from --output extension, else png)')
+    parser.add_argument('--quality', '-q', type=int, help=f'JPEG/WebP quality 1-100 (default: {DEFAULT_QUALITY})')
+    clip_group = parser.add_mutually_exclusive_group()
+    clip_group.add_argument('--viewport-only', action='store_const', const='viewport', dest='clip',
+                            help='Capture only the visible viewport instead of the full page')
+    clip_group.add_argument('--selector', dest='clip', help='Capture only the first element matching this CSS selector')
+    parser.add_argument('--max-pixels', type=int, help='Downscale until width x height is at most this many pixels')
+    parser.add_argument('--max-bytes', type=int, help='Reduce quality/size until the file is at most this many bytes')
+    parser.add_argument('--tile-height', type=int,
+                        help='Split the full page into tiles of this many CSS pixels (single URL only)')
+    return parser
+
+async def run(args, parser, browser=None):
+    """The command line tool's behaviour for parsed `args`, optionally on an already running browser."""
+    import sys
+    options = {
+        'image_format': args.image_format,
+        'quality': args.quality,
+        'max_pixels': args.max_pixels,
+        'max_bytes': args.max_bytes,
+    }
+    if args.tile_height:
+        if len(args.urls) != 1 or args.clip:
+            parser.error('--tile-height takes a single URL and no clipping option')
+        paths = await take_screenshot_tiles(args.urls[0], args.output_dir, args.tile_height,
+                                            width=args.width, height=args.height, browser=browser,
+                                            **{**options, 'image_format': normalize_format(args.image_format)})
+        for path in paths:
+            print(f"Screenshot saved to: {path}")
+    elif len(args.urls) == 1 and not args.viewport and not args.output_dir:
+        output_path = await take_screenshot(args.urls[0], args.output, args.width, args.height,
+                                            clip=args.clip, browser=browser, **options)
+        print(f"Screenshot saved to: {output_path}")
+    else:
+        if args.output:
+            parser.error('--output only applies to a single URL; use --output-dir in batch mode')
+        viewports = args.viewport or [(args.width, args.height)]
+        records = await take_screenshots(args.urls, args.output_dir, viewports, args.max_concurrent,
+                                         browser=browser, clip=args.clip, **options)
+        failed = False
+        for record in records:
+            if record['error'] is None:
+                print(f"Screenshot saved to: {record['path']}")
+            else:
+                failed = True
+                print(f"Screenshot failed for {record['url']} at {record['width']}x{record['height']}: "
+                      f"{record['error']}", file=sys.stderr)
+        if failed:
+            sys.exit(1)
+
+def main(argv=None):
+    parser = build_parser()
+    asyncio.run(run(parser.parse_args(argv), parser))
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,310 @@
 #!/usr/bin/env python3
 
 import argparse
+import json
+import logging
+import random
+import sqlite3
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 from duckduckgo_search import DDGS
+from duckduckgo_search.exceptions import RatelimitException
+from search_index import DEFAULT_INDEX_PATH, SearchIndex
+from tool_logging import configure_logging
 
-def search_with_retry(query, max_results=10, max_retries=3):
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGION = "wt-wt"
+OUTPUT_FORMATS = ("text", "json", "jsonl")
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "summitai" / "search_cache.sqlite3"
+DEFAULT_CACHE_TTL = 3600  # seconds
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return " ".join(query.lower().split())
+
+class SearchCache:
+    """
+    Local TTL store for search results, keyed by normalized query, region and max_results.
+
+    Backed by SQLite so concurrent workers and separate processes can share it.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl: float = DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, created REAL NOT NULL, results TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(query: str, region: str, max_results: int) -> str:
+        return json.dumps([normalize_query(query), region, max_results])
+
+    def get(self, query: str, region: str, max_results: int) -> Optional[List[Dict]]:
+        """Return cached results, or None when missing or expired."""
+        key = self.make_key(query, region, max_results)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created, results FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return json.loads(row[1])
+
+    def set(self, query: str, region: str, max_results: int, results: List[Dict]):
+        key = self.make_key(query, region, max_results)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, created, results) VALUES (?, ?, ?)",
+                (key, time.time(), json.dumps(results)),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SearchError(Exception):
+    """Raised by search() when a query fails after all retries."""
+
+class CircuitOpenError(Exception):
+    """Raised when the search backend has refused too many requests in a row."""
+
+class RateGovernor:
+    """
+    Process-wide pacing for search requests.
+
+    Combines a token bucket (steady rate with a small burst allowance), exponential
+    backoff with full jitter between retries, and a circuit breaker that stops
+    sending requests for a cooldown period once the backend keeps refusing them.
+    A throttled response also drains the bucket, so every thread slows down, not
+    just the one that got refused.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 3, base_delay: float = 1.0,
+                 max_delay: float = 30.0, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.rate = rate
+        self.burst = burst
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self.metrics = {
+            "requests": 0,
+            "failures": 0,
+            "throttled": 0,
+            "rejected": 0,
+            "circuit_opened": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def acquire(self):
+        """Block until a request may be sent. Raises CircuitOpenError while the circuit is open."""
+        with self._lock:
+            now = time.monotonic()
+            if self._opened_at is not None and now - self._opened_at < self.cooldown:
+                self.metrics["rejected"] += 1
+                retry_in = self.cooldown - (now - self._opened_at)
+                raise CircuitOpenError(f"Search backend circuit open, retry in {retry_in:.0f}s")
+
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            # Reserve a token; a negative balance is the queue of callers ahead of us
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            self.metrics["requests"] += 1
+            self.metrics["wait_seconds"] += wait
+        if wait:
+            time.sleep(wait)
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+
+    def record_failure(self, throttled: bool = False):
+        with self._lock:
+            self.metrics["failures"] += 1
+            self._consecutive_failures += 1
+            if throttled:
+                self.metrics["throttled"] += 1
+                self._tokens = min(self._tokens, 0.0)
+            # After the cooldown a single failed probe reopens the circuit immediately
+            if self._consecutive_failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    self.metrics["circuit_opened"] += 1
+                self._opened_at = time.monotonic()
+
+    def backoff(self, attempt: int) -> float:
+        """Sleep for an exponentially growing, fully jittered delay and return it."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        with self._lock:
+            self.metrics["wait_seconds"] += delay
+        time.sleep(delay)
+        return delay
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            metrics = dict(self.metrics)
+            metrics["circuit_open"] = self._opened_at is not None
+        metrics["wait_seconds"] = round(metrics["wait_seconds"], 3)
+        return metrics
+
+_governor = RateGovernor()
+
+def get_governor() -> RateGovernor:
+    """Return the process-wide search rate governor."""
+    return _governor
+
+def configure_governor(**kwargs) -> RateGovernor:
+    """Replace the process-wide governor, e.g. configure_governor(rate=0.5, burst=1)."""
+    global _governor
+    _governor = RateGovernor(**kwargs)
+    return _governor
+
+def _is_throttled(error: Exception) -> bool:
+    if isinstance(error, RatelimitException):
+        return True
+    message = str(error).lower()
+    return "ratelimit" in message or "429" in message
+
+def search_with_retry(query, max_results=10, max_retries=3, region=DEFAULT_REGION,
+                      ddgs=None, cache=None, index=None, offline=False):
     """
     Search using DuckDuckGo and return results with URLs and text snippets.
-    
+
     Args:
         query (str): Search query
         max_results (int): Maximum number of results to return
         max_retries (int): Maximum number of retry attempts
+        region (str): DuckDuckGo region code
+        ddgs (DDGS, optional): Shared session to reuse instead of opening a new one
+        cache (SearchCache, optional): Cache consulted before and updated after the search
+        index (SearchIndex, optional): Local index of scraped pages, queried first; the web
+            is only searched when it has no match
+        offline (bool): Answer from the local index only, never touching the network
     """
+    if index is not None:
+        local = index.search(query, max_results)
+        if local or offline:
+            logger.debug("Local index returned %d results for query: %s", len(local), query)
+            return local
+    elif offline:
+        raise ValueError("offline search requires a local index")
+
+    if cache is not None:
+        cached = cache.get(query, region, max_results)
+        if cached is not None:
+            logger.debug("Cache hit for query: %s", query)
+            return cached
+
+    governor = get_governor()
     for attempt in range(max_retries):
         try:
-            print(f"DEBUG: Searching for query: {query} (attempt {attempt + 1}/{max_retries})", 
-                  file=sys.stderr)
-            
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=max_results))
-                
+            governor.acquire()
+            if ddgs is not None:
+                results = list(ddgs.text(query, region=region, max_results=max_results))
+            else:
+                with DDGS() as session:
+                    results = list(session.text(query, region=region, max_results=max_results))
+
+            governor.record_success()
+            logger.debug("Search for %r returned %d results (attempt %d/%d)",
+                         query, len(results), attempt + 1, max_retries)
             if not results:
-                print("DEBUG: No results found", file=sys.stderr)
                 return []
-            
-            print(f"DEBUG: Found {len(results)} results", file=sys.stderr)
+
+            if cache is not None:
+                cache.set(query, region, max_results, results)
             return results
-                
+
+        except CircuitOpenError as e:
+            logger.error("%s", e)
+            raise
         except Exception as e:
-            print(f"ERROR: Attempt {attempt + 1}/{max_retries} failed: {str(e)}", file=sys.stderr)
+            logger.warning("Attempt %d/%d failed: %s", attempt + 1, max_retries, e)
+            governor.record_failure(throttled=_is_throttled(e))
             if attempt < max_retries - 1:  # If not the last attempt
-                print(f"DEBUG: Waiting 1 second before retry...", file=sys.stderr)
-                time.sleep(1)  # Wait 1 second before retry
+                delay = governor.backoff(attempt)
+                logger.debug("Waited %.2fs before retry", delay)
             else:
-                print(f"ERROR: All {max_retries} attempts failed", file=sys.stderr)
+                logger.error("All %d attempts failed", max_retries)
                 raise
 
+def search_many(queries: Iterable[str], max_results=10, max_retries=3, region=DEFAULT_REGION,
+                max_workers=4, cache=None, index=None, offline=False) -> List[Dict]:
+    """
+    Run many searches concurrently over one shared DDGS session.
+
+    Queries that normalize to the same text are only searched once.
+
+    Args:
+        queries (Iterable[str]): Search queries
+        max_results (int): Maximum number of results per query
+        max_retries (int): Maximum number of retry attempts per query
+        region (str): DuckDuckGo region code
+        max_workers (int): Maximum number of concurrent searches
+        cache (SearchCache, optional): Shared result cache
+        index (SearchIndex, optional): Local index of scraped pages, queried first
+        offline (bool): Answer from the local index only
+
+    Returns:
+        List[Dict]: One {"query", "results", "error"} record per input query, in input order
+    """
+    queries = list(queries)
+    unique = {}
+    for query in queries:
+        unique.setdefault(normalize_query(query), query)
+
+    def run(query):
+        try:
+            return search_with_retry(query, max_results, max_retries, region, ddgs, cache,
+                                     index, offline), None
+        except Exception as e:
+            return None, str(e)
+
+    with DDGS() as ddgs:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            outcomes = dict(zip(unique, pool.map(run, unique.values())))
+
+    records = []
+    for query in queries:
+        results, error = outcomes[normalize_query(query)]
+        records.append({"query": query, "results": results, "error": error})
+    return records
+
+def read_queries(path: str) -> List[str]:
+    """Read one query per line from a file, or from stdin when path is '-'."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
 def format_results(results):
     """Format and print search results."""
     for i, r in enumerate(results, 1):
@@ -46,34 +313,136 @@ def format_results(results):
         print(f"Title: {r.get('title', 'N/A')}")
         print(f"Snippet: {r.get('body', 'N/A')}")
 
-def search(query, max_results=10, max_retries=3):
+def write_records(records: List[Dict], output_format: str = "text", out=None):
     """
-    Main search function that handles search with retry mechanism.
-    
+    Write {"query", "results", "error"} records in one of OUTPUT_FORMATS.
+
+    text keeps the human layout of format_results; json writes one document holding
+    all records; jsonl writes one line per result with its query and 1-based rank.
+    Failed queries are reported on stderr in text mode and inline otherwise.
+    """
+    out = out or sys.stdout
+    if output_format == "json":
+        json.dump(records, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    elif output_format == "jsonl":
+        for record in records:
+            if record["error"] is not None:
+                out.write(json.dumps({"query": record["query"], "error": record["error"]},
+                                     ensure_ascii=False) + "\n")
+                continue
+            for rank, result in enumerate(record["results"] or [], 1):
+                out.write(json.dumps({"query": record["query"], "rank": rank, **result},
+                                     ensure_ascii=False) + "\n")
+    else:
+        batch = len(records) > 1
+        for record in records:
+            if batch:
+                print(f"\n##### Query: {record['query']} #####", file=out)
+            if record["error"] is not None:
+                print(f"ERROR: Search failed: {record['error']}", file=sys.stderr)
+            elif record["results"]:
+                with redirect_stdout(out):
+                    format_results(record["results"])
+
+def search(query, max_results=10, max_retries=3, region=DEFAULT_REGION, cache=None,
+           index=None, offline=False) -> List[Dict]:
+    """
+    Search with the retry mechanism and return the results as data.
+
+    Safe to call in-process: nothing is printed and the interpreter is never exited.
+
     Args:
         query (str): Search query
         max_results (int): Maximum number of results to return
         max_retries (int): Maximum number of retry attempts
+        region (str): DuckDuckGo region code
+        cache (SearchCache, optional): Result cache
+        index (SearchIndex, optional): Local index of scraped pages, queried first
+        offline (bool): Answer from the local index only
+
+    Returns:
+        List[Dict]: Results with "href", "title" and "body" keys
+
+    Raises:
+        SearchError: If every attempt failed
     """
     try:
-        results = search_with_retry(query, max_results, max_retries)
-        if results:
-            format_results(results)
-            
+        return search_with_retry(query, max_results, max_retries, region, cache=cache,
+                                 index=index, offline=offline)
     except Exception as e:
-        print(f"ERROR: Search failed: {str(e)}", file=sys.stderr)
-        sys.exit(1)
+        raise SearchError(f"Search failed for {query!r}: {e}") from e
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Search using DuckDuckGo API")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--queries-file",
+                      help="File with one query per line ('-' reads stdin); enables batch mode")
     parser.add_argument("--max-results", type=int, default=10,
                       help="Maximum number of results (default: 10)")
     parser.add_argument("--max-retries", type=int, default=3,
                       help="Maximum number of retry attempts (default: 3)")
-    
-    args = parser.parse_args()
-    search(args.query, args.max_results, args.max_retries)
+    parser.add_argument("--region", default=DEFAULT_REGION,
+                      help=f"DuckDuckGo region code (default: {DEFAULT_REGION})")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                      help="Output format (default: text)")
+    parser.add_argument("--max-workers", type=int, default=4,
+                      help="Maximum number of concurrent searches in batch mode (default: 4)")
+    parser.add_argument("--cache-path", default=str(DEFAULT_CACHE_PATH),
+                      help=f"Result cache location (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL,
+                      help=f"Seconds a cached result stays valid (default: {DEFAULT_CACHE_TTL})")
+    parser.add_argument("--no-cache", action="store_true",
+                      help="Disable the result cache")
+    parser.add_argument("--index", nargs="?", const=str(DEFAULT_INDEX_PATH),
+                      help="Query the local index of scraped pages first, falling back to the web "
+                           f"(default location: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--offline", action="store_true",
+                      help="Only query the local index; implies --index")
+    parser.add_argument("--rate", type=float, default=1.0,
+                      help="Sustained search requests per second across all workers (default: 1.0)")
+    parser.add_argument("--burst", type=int, default=3,
+                      help="Requests allowed back to back before pacing kicks in (default: 3)")
+    parser.add_argument("--stats", action="store_true",
+                      help="Print rate governor metrics to stderr when done")
+    parser.add_argument("--debug", action="store_true",
+                      help="Enable debug logging")
+
+    args = parser.parse_args(argv)
+    if args.query is None and args.queries_file is None:
+        parser.error("either a query or --queries-file is required")
+
+    configure_logging(logging.DEBUG if args.debug else None, default_level=logging.WARNING,
+                      text_format="%(levelname)s: %(message)s")
+
+    cache = None if args.no_cache else SearchCache(args.cache_path, args.cache_ttl)
+    configure_governor(rate=args.rate, burst=args.burst)
+    if args.offline and args.index is None:
+        args.index = str(DEFAULT_INDEX_PATH)
+    index = SearchIndex(args.index) if args.index is not None else None
+
+    try:
+        if args.queries_file is not None:
+            queries = read_queries(args.queries_file)
+            if args.query is not None:
+                queries.insert(0, args.query)
+            records = search_many(queries, args.max_results, args.max_retries, args.region,
+                                  args.max_workers, cache, index, args.offline)
+        else:
+            try:
+                results, error = search(args.query, args.max_results, args.max_retries,
+                                        args.region, cache, index, args.offline), None
+            except SearchError as e:
+                results, error = None, str(e.__cause__)
+            records = [{"query": args.query, "results": results, "error": error}]
+
+        write_records(records, args.format)
+    finally:
+        if args.stats:
+            print(f"STATS: {json.dumps(get_governor().snapshot())}", file=sys.stderr)
+
+    if any(record["error"] is not None for record in records):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_INDEX_PATH = Path.home() / ".cache" / "summitai" / "search_index.sqlite3"
+
+_TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def extract_title(html_content: Optional[str]) -> str:
+    """Return the page <title>, or an empty string."""
+    if not html_content:
+        return ""
+    match = _TITLE_PATTERN.search(html_content)
+    return " ".join(match.group(1).split()) if match else ""
+
+def to_match_expression(query: str) -> str:
+    """Turn free text into an FTS5 MATCH expression: any quoted term, ranked by BM25."""
+    return " OR ".join(f'"{token}"' for token in _TOKEN_PATTERN.findall(query))
+
+class SearchIndex:
+    """
+    Local full-text index over scraped pages, backed by SQLite FTS5 and ranked by BM25.
+
+    Pages are upserted by URL, so re-scraping a page replaces its previous text.
+    Results use the same "href"/"title"/"body" keys as DuckDuckGo results.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5("
+                    "url UNINDEXED, title, body, indexed UNINDEXED, tokenize='porter unicode61')"
+                )
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f"SQLite FTS5 is not available in this Python build: {e}") from e
+
+    def add_page(self, url: str, text: str, title: str = ""):
+        """Index (or re-index) the text of a page."""
+        if not text:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._conn.execute(
+                "INSERT INTO pages (url, title, body, indexed) VALUES (?, ?, ?, ?)",
+                (url, title, text, time.time()),
+            )
+
+    def search(self, query: str, max_results: int = 10) -> List[Dict]:
+        """Return the best matching pages, most relevant first."""
+        expression = to_match_expression(query)
+        if not expression:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, title, snippet(pages, 2, '', '', '...', 32) FROM pages "
+                "WHERE pages MATCH ? ORDER BY bm25(pages) LIMIT ?",
+                (expression, max_results),
+            ).fetchall()
+        return [{"href": url, "title": title, "body": body} for url, title, body in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local index of scraped pages")
+    parser.add_argument("query", help="Search query")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH),
+                        help=f"Index location (default: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--max-results", type=int, default=10,
+                        help="Maximum number of results (default: 10)")
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    start_time = time.perf_counter()
+    results = index.search(args.query, args.max_results)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+    print(f"{len(results)} of {len(index)} indexed pages matched in {elapsed_ms:.1f}ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List
+from urllib.parse import urlparse, urlunparse
+
+from duckduckgo_search import DDGS
+from playwright.async_api import async_playwright
+
+from search_engine import (DEFAULT_CACHE_PATH, DEFAULT_CACHE_TTL, DEFAULT_REGION, SearchCache,
+                           normalize_query, read_queries, search_with_retry)
+from search_index import DEFAULT_INDEX_PATH, SearchIndex, extract_title
+from tool_logging import configure_logging
+from web_scraper import fetch_page, parse_html, validate_url
+
+logger = logging.getLogger(__name__)
+
+_WORKER_DONE = object()
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to spot the same page returned by different queries."""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/') or '/'
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, '', parsed.query, ''))
+
+async def search_and_scrape(queries: List[str], max_results: int = 10, max_retries: int = 3,
+                            region: str = DEFAULT_REGION, max_concurrent: int = 5,
+                            search_workers: int = 4, cache=None, index=None) -> AsyncIterator[Dict]:
+    """
+    Search for every query and scrape each hit as soon as its search returns.
+
+    Searches run on a thread pool over one shared DDGS session; their hrefs are fed
+    into a bounded queue that `max_concurrent` scraper workers drain, each with its
+    own context in a single shared browser. Pages already queued by an earlier
+    query are skipped. If a SearchIndex is given, every scraped page is added to it.
+
+    Yields:
+        Dict: {"query", "url", "title", "snippet", "text", "error"} per scraped page,
+        in completion order. Failed searches yield a record with only "query" and "error".
+    """
+    loop = asyncio.get_running_loop()
+    unique_queries = {}
+    for query in queries:
+        unique_queries.setdefault(normalize_query(query), query)
+    unique_queries = list(unique_queries.values())
+    url_queue = asyncio.Queue(maxsize=max_concurrent * 4)
+    records = asyncio.Queue()
+    seen = set()
+
+    def search_one(query):
+        try:
+            return query, search_with_retry(query, max_results, max_retries, region, ddgs, cache), None
+        except Exception as e:
+            return query, None, str(e)
+
+    async def produce():
+        try:
+            futures = [loop.run_in_executor(search_pool, search_one, q) for q in unique_queries]
+            for future in asyncio.as_completed(futures):
+                query, results, error = await future
+                if error is not None:
+                    await records.put({"query": query, "error": error})
+                    continue
+                for hit in results or []:
+                    href = hit.get('href')
+                    if not href or not validate_url(href):
+                        continue
+                    key = normalize_url(href)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    await url_queue.put((query, hit))
+        finally:
+            for _ in contexts:
+                await url_queue.put(None)
+
+    async def consume(context):
+        try:
+            while True:
+                item = await url_queue.get()
+                if item is None:
+                    break
+                query, hit = item
+                html = await fetch_page(hit['href'], context)
+                text = await loop.run_in_executor(parse_pool, parse_html, html)
+                if index is not None:
+                    index.add_page(hit['href'], text, extract_title(html) or hit.get('title', ''))
+                await records.put({
+                    "query": query,
+                    "url": hit['href'],
+                    "title": hit.get('title'),
+                    "snippet": hit.get('body'),
+                    "text": text,
+                    "error": None if html is not None else "fetch failed",
+                })
+        finally:
+            await records.put(_WORKER_DONE)
+
+    with DDGS() as ddgs, \
+            ThreadPoolExecutor(max_workers=max(1, search_workers)) as search_pool, \
+            ProcessPoolExecutor() as parse_pool:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            contexts = [await browser.new_context() for _ in range(max(1, max_concurrent))]
+            tasks = [asyncio.create_task(produce())]
+            tasks += [asyncio.create_task(consume(context)) for context in contexts]
+            try:
+                remaining = len(contexts)
+                while remaining:
+                    record = await records.get()
+                    if record is _WORKER_DONE:
+                        remaining -= 1
+                    else:
+                        yield record
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                for context in contexts:
+                    await context.close()
+                await browser.close()
+
+async def run_pipeline(queries: List[str], out=sys.stdout, **kwargs) -> int:
+    """Write one JSON line per record to `out` and return the number of pages scraped."""
+    pages = 0
+    async for record in search_and_scrape(queries, **kwargs):
+        if "url" in record:
+            pages += 1
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Search the web and scrape every hit in one pipeline, emitting JSON lines.')
+    parser.add_argument('queries', nargs='*', help='Search queries')
+    parser.add_argument('--queries-file',
+                        help="File with one query per line ('-' reads stdin)")
+    parser.add_argument('--max-results', type=int, default=10,
+                        help='Maximum number of search results per query (default: 10)')
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help='Maximum number of search retry attempts (default: 3)')
+    parser.add_argument('--region', default=DEFAULT_REGION,
+                        help=f'DuckDuckGo region code (default: {DEFAULT_REGION})')
+    parser.add_argument('--max-concurrent', type=int, default=5,
+                        help='Maximum number of pages fetched at once (default: 5)')
+    parser.add_argument('--search-workers', type=int, default=4,
+                        help='Maximum number of concurrent searches (default: 4)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL,
+                        help=f'Seconds a cached search result stays valid (default: {DEFAULT_CACHE_TTL})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the search result cache')
+    parser.add_argument('--index', nargs='?', const=str(DEFAULT_INDEX_PATH),
+                        help='Add scraped pages to the local search index '
+                             f'(default location: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--debug', action='store_true',
+                        help='Enable debug logging')
+
+    args = parser.parse_args()
+
+    configure_logging(logging.DEBUG if args.debug else None)
+
+    queries = list(args.queries)
+    if args.queries_file:
+        queries += read_queries(args.queries_file)
+    if not queries:
+        parser.error("provide at least one query or --queries-file")
+
+    cache = None if args.no_cache else SearchCache(DEFAULT_CACHE_PATH, args.cache_ttl)
+
+    start_time = time.time()
+    try:
+        pages = asyncio.run(run_pipeline(
+            queries,
+            max_results=args.max_results,
+            max_retries=args.max_retries,
+            region=args.region,
+            max_concurrent=args.max_concurrent,
+            search_workers=args.search_workers,
+            cache=cache,
+            index=SearchIndex(args.index) if args.index else None,
+        ))
+        logger.info(f"Scraped {pages} unique pages for {len(queries)} queries "
+                    f"in {time.time() - start_time:.2f}s")
+    except Exception as e:
+        logger.error(f"Error during execution: {str(e)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
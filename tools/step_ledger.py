@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Append-only record of completed executor steps.
+
+Each line stores what went into a step (a hash of its description and the step
+generator version) and what came out of it (the commit and git tree it produced).
+On a rerun, a step whose inputs are unchanged and whose commit is still in the
+project history is already satisfied and can be skipped without re-executing,
+re-validating or re-building it.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+StepKey = Tuple[int, int]
+
+def description_hash(description: str) -> str:
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+
+class StepLedger:
+    """Step inputs and resulting commit/tree per step, stored as JSON lines; the last line for a step wins."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[StepKey, Dict] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn final line from a crash mid-write
+                    self._entries[(entry["phase"], entry["step"])] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, phase: int, step: int) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get((phase, step))
+
+    def record(self, phase: int, step: int, description: str, generator_version: int,
+               commit: str, tree: str):
+        """Append the outcome of a completed step."""
+        entry = {
+            "phase": phase,
+            "step": step,
+            "description_hash": description_hash(description),
+            "generator_version": generator_version,
+            "commit": commit,
+            "tree": tree,
+            "timestamp": time.time(),
+        }
+        with self._lock:
+            self._entries[(phase, step)] = entry
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def absorb(self, other: "StepLedger", phase: Optional[int] = None):
+        """Append the entries of another ledger (e.g. a merged worktree shard's), optionally only one phase's."""
+        with self._lock, open(self.path, "a") as f:
+            for key, entry in sorted(other._entries.items()):
+                if phase is not None and key[0] != phase:
+                    continue
+                self._entries[key] = entry
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def is_satisfied(self, phase: int, step: int, description: str, generator_version: int,
+                     history: Set[Tuple[str, str]]) -> bool:
+        """
+        True if the step ran with the same inputs and its (commit, tree) pair is in `history`.
+
+        Args:
+            history: (commit, tree) pairs reachable from the project's HEAD, e.g. from
+                `git log --format='%H %T'`
+        """
+        entry = self.get(phase, step)
+        return (entry is not None
+                and entry["description_hash"] == description_hash(description)
+                and entry["generator_version"] == generator_version
+                and (entry["commit"], entry["tree"]) in history)
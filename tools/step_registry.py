@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Step descriptions and handlers for the autonomous executor.
+
+Descriptions come from the "### Step P.S: Title" sections of the execution plan
+markdown. The plan is parsed once and compiled into a JSON index that is reused
+until the plan's size or mtime changes. Steps the plan doesn't cover fall back to
+the executor's embedded descriptions. Handlers register with @step_handler, and
+lookups and dispatch are single dict accesses.
+"""
+
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+StepKey = Tuple[int, int]
+
+# Bump when parse_plan's output changes so stale indexes are rebuilt
+PLAN_INDEX_VERSION = 1
+
+STEP_HEADING = re.compile(r"^###\s+Step\s+(\d+)\.(\d+)\s*:\s*(.+?)\s*$")
+PHASE_HEADING = re.compile(r"^##\s+\W*\s*PHASE\s+(\d+)\s*:\s*(.+?)\s*(?:\(Steps[^)]*\))?\s*$", re.IGNORECASE)
+OBJECTIVE_LINE = re.compile(r"^\*\*Objective:\*\*\s*(.+?)\s*$")
+
+# (phase, step) -> handler taking the executor and returning (success, message, files_changed)
+STEP_HANDLERS: Dict[StepKey, Callable] = {}
+
+def step_handler(phase: int, step: int):
+    """Register the decorated executor method as the implementation of a step."""
+    def register(func):
+        if (phase, step) in STEP_HANDLERS:
+            raise ValueError(f"Phase {phase}.Step {step} already has a handler: {STEP_HANDLERS[(phase, step)].__name__}")
+        STEP_HANDLERS[(phase, step)] = func
+        return func
+    return register
+
+def parse_plan(text: str) -> Dict:
+    """
+    Extract phase and step headings from the execution plan markdown.
+
+    Returns:
+        Dict: {"phases": {"1": title}, "steps": {"1.1": {"title", "objective", "line"}}}
+    """
+    phases, steps = {}, {}
+    current = None
+    in_code = False
+    for number, line in enumerate(text.splitlines(), start=1):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        match = STEP_HEADING.match(line)
+        if match:
+            phase, step, title = match.groups()
+            current = {"title": title, "objective": None, "line": number}
+            steps[f"{int(phase)}.{int(step)}"] = current
+            continue
+        match = PHASE_HEADING.match(line)
+        if match:
+            phases[str(int(match.group(1)))] = match.group(2)
+            current = None
+            continue
+        match = OBJECTIVE_LINE.match(line)
+        if match and current is not None and current["objective"] is None:
+            current["objective"] = match.group(1)
+    return {"phases": phases, "steps": steps}
+
+class StepRegistry:
+    """
+    Step descriptions from the execution plan, falling back to `defaults`.
+
+    Nothing is read until the first lookup. After that every lookup is a dict access.
+    """
+
+    def __init__(self, plan_path: Path, index_path: Path, defaults: Dict[StepKey, str]):
+        self.plan_path = Path(plan_path)
+        self.index_path = Path(index_path)
+        self.defaults = defaults
+        self._descriptions: Optional[Dict[StepKey, str]] = None
+        self._plan: Dict = {"phases": {}, "steps": {}}
+        self._lock = threading.Lock()
+
+    def _plan_signature(self) -> Optional[Dict]:
+        try:
+            stat = self.plan_path.stat()
+        except FileNotFoundError:
+            return None
+        return {"version": PLAN_INDEX_VERSION, "path": str(self.plan_path.resolve()),
+                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load_plan(self) -> Dict:
+        signature = self._plan_signature()
+        if signature is None:
+            logger.warning(f"Execution plan not found at {self.plan_path}; using embedded step descriptions")
+            return {"phases": {}, "steps": {}}
+        try:
+            cached = json.loads(self.index_path.read_text())
+            if cached.get("signature") == signature:
+                return cached["plan"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        plan = parse_plan(self.plan_path.read_text(encoding="utf-8"))
+        logger.info(f"Indexed {len(plan['steps'])} steps from {self.plan_path.name}")
+        try:
+            temp_path = self.index_path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps({"signature": signature, "plan": plan}, indent=2))
+            temp_path.replace(self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not write step index {self.index_path}: {e}")
+        return plan
+
+    def _ensure_loaded(self) -> Dict[StepKey, str]:
+        descriptions = self._descriptions
+        if descriptions is None:
+            with self._lock:
+                if self._descriptions is None:
+                    self._plan = self._load_plan()
+                    merged = dict(self.defaults)
+                    for key, entry in self._plan["steps"].items():
+                        phase, step = key.split(".")
+                        merged[(int(phase), int(step))] = entry["title"]
+                    self._descriptions = merged
+                descriptions = self._descriptions
+        return descriptions
+
+    def description(self, phase: int, step: int) -> str:
+        return self._ensure_loaded().get((phase, step)) or f"Phase {phase} Step {step} implementation"
+
+    def plan_entry(self, phase: int, step: int) -> Optional[Dict]:
+        """The plan's {"title", "objective", "line"} for a step, or None if the plan doesn't cover it."""
+        self._ensure_loaded()
+        return self._plan["steps"].get(f"{phase}.{step}")
+
+    def handler(self, phase: int, step: int) -> Optional[Callable]:
+        return STEP_HANDLERS.get((phase, step))
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Dependency graph and parallel scheduler for the 400 autonomous execution steps.
+
+Steps are declared with the steps they depend on and the resources they need. The
+scheduler runs every step whose dependencies are complete on a worker pool, never
+running two steps that hold the same exclusive resource at once.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+StepKey = Tuple[int, int]
+
+# Steps whose description matches one of these only need their phase's first step:
+# they add self-contained files (assets, strings, docs, tests) nothing else in the
+# phase builds on.
+INDEPENDENT_KEYWORDS = (
+    "asset", "icon", "launch screen", "localization", "internationalization",
+    "documentation", "docs", "test", "accessibility", "analytics", "monitoring",
+)
+
+# Resources a step needs exclusively, inferred from its description. Two steps that
+# both edit the package manifest or the project file must not run concurrently.
+RESOURCE_KEYWORDS = {
+    "package_manifest": ("package", "dependencies", "sdk", "framework", "librar"),
+    "project_file": ("build settings", "scheme", "code signing", "provisioning", "target"),
+}
+
+# Number of steps at the start of a phase that every other step in it waits for. Step 1.2
+# deletes and recreates the source tree, so phase 1 has two.
+PHASE_SETUP_STEPS = {1: 2}
+
+# Explicit dependencies that the rules above would get wrong
+STEP_DEPENDENCY_OVERRIDES: Dict[StepKey, List[StepKey]] = {
+    (1, 1): [],
+    (1, 2): [(1, 1)],
+}
+
+# Phases each phase builds on. Phases with no path between them touch different parts of
+# the app and can run side by side in separate worktrees (see worktree_shards.py). The
+# step graph above stays a single chain of phases; this is the coarser, declared view.
+PHASE_DEPENDENCIES: Dict[int, List[int]] = {
+    1: [],
+    2: [1],                 # Swift packages
+    3: [2],                 # Core data models & Firebase
+    4: [3],                 # Authentication
+    5: [3],                 # HealthKit
+    6: [3, 5],              # Mountain system builds on HealthKit data
+    7: [2],                 # UI foundation
+    8: [4, 7],              # Onboarding
+    9: [6, 7, 8],           # Main interface & navigation
+    10: [9],                # Paywall
+    11: [4, 9],             # Community
+    12: [9],                # Testing
+    13: [9],                # Performance
+    14: [4, 5],             # Security & privacy
+    15: [9],                # Analytics
+    16: [9],                # Localization
+    17: [9],                # Accessibility
+    18: [9],                # Advanced UI
+    19: [15],               # Business intelligence
+    20: list(range(1, 20)), # Launch preparation needs everything
+}
+
+@dataclass
+class StepNode:
+    """One step of the plan with the steps it waits for and the resources it holds."""
+    phase: int
+    step: int
+    description: str
+    depends_on: List[StepKey] = field(default_factory=list)
+    resources: FrozenSet[str] = frozenset()
+
+    @property
+    def key(self) -> StepKey:
+        return (self.phase, self.step)
+
+def _is_independent(description: str) -> bool:
+    text = description.lower()
+    return any(keyword in text for keyword in INDEPENDENT_KEYWORDS)
+
+def _resources_for(description: str) -> FrozenSet[str]:
+    text = description.lower()
+    return frozenset(
+        resource for resource, keywords in RESOURCE_KEYWORDS.items()
+        if any(keyword in text for keyword in keywords)
+    )
+
+def build_step_graph(describe: Callable[[int, int], str], phases: int = 20,
+                     steps_per_phase: int = 20) -> Dict[StepKey, StepNode]:
+    """
+    Declare every step with its dependencies and resource tags.
+
+    Rules, unless STEP_DEPENDENCY_OVERRIDES says otherwise:
+    - a phase's first step waits for the previous phase's last step;
+    - a phase's last step is its validation step and waits for every other step;
+    - independent steps (INDEPENDENT_KEYWORDS) only wait for the phase's setup steps
+      (the first step, or PHASE_SETUP_STEPS);
+    - all other steps form a chain through the previous non-independent step.
+    """
+    graph = {}
+    for phase in range(1, phases + 1):
+        chain_tail = None
+        setup_steps = PHASE_SETUP_STEPS.get(phase, 1)
+        for step in range(1, steps_per_phase + 1):
+            description = describe(phase, step)
+            if step == 1:
+                depends_on = [(phase - 1, steps_per_phase)] if phase > 1 else []
+                chain_tail = (phase, 1)
+            elif step == steps_per_phase:
+                depends_on = [(phase, s) for s in range(1, steps_per_phase)]
+            elif _is_independent(description) and step > setup_steps:
+                depends_on = [(phase, setup_steps)]
+            else:
+                depends_on = [chain_tail]
+                chain_tail = (phase, step)
+            key = (phase, step)
+            graph[key] = StepNode(
+                phase=phase,
+                step=step,
+                description=description,
+                depends_on=STEP_DEPENDENCY_OVERRIDES.get(key, depends_on),
+                resources=_resources_for(description),
+            )
+    return graph
+
+def phase_order(dependencies: Dict[int, List[int]] = None) -> List[int]:
+    """Phases in a dependency-respecting order (Kahn's algorithm, lowest phase first)."""
+    dependencies = dependencies or PHASE_DEPENDENCIES
+    remaining = {phase: set(deps) for phase, deps in dependencies.items()}
+    order = []
+    while remaining:
+        ready = sorted(phase for phase, deps in remaining.items() if not deps - set(order))
+        if not ready:
+            raise ValueError(f"Phase dependency cycle among {sorted(remaining)}")
+        order.append(ready[0])
+        del remaining[ready[0]]
+    return order
+
+def critical_path(graph: Dict[StepKey, StepNode], durations: Dict[StepKey, float]) -> Tuple[float, List[StepKey]]:
+    """
+    Longest duration-weighted chain through the graph.
+
+    Keys sort into a valid topological order because dependencies always point to
+    earlier steps. Steps without a recorded duration count as zero.
+    """
+    finish: Dict[StepKey, float] = {}
+    previous: Dict[StepKey, Optional[StepKey]] = {}
+    for key in sorted(graph):
+        best_dep = max(graph[key].depends_on, key=lambda dep: finish.get(dep, 0.0), default=None)
+        start = finish.get(best_dep, 0.0) if best_dep is not None else 0.0
+        finish[key] = start + durations.get(key, 0.0)
+        previous[key] = best_dep
+
+    if not finish:
+        return 0.0, []
+    end = max(finish, key=finish.get)
+    path = []
+    node = end
+    while node is not None and node in graph:
+        path.append(node)
+        node = previous[node]
+    return finish[end], list(reversed(path))
+
+def critical_path_report(graph: Dict[StepKey, StepNode], durations: Dict[StepKey, float],
+                         wall_clock: float) -> Dict:
+    """Compare serial runtime with the critical path and the observed wall clock."""
+    serial = sum(durations.values())
+    length, path = critical_path(graph, durations)
+    return {
+        "serial_seconds": round(serial, 2),
+        "critical_path_seconds": round(length, 2),
+        "wall_clock_seconds": round(wall_clock, 2),
+        "saved_seconds": round(serial - wall_clock, 2),
+        "max_speedup": round(serial / length, 2) if length else None,
+        "critical_path": [f"{phase}.{step}" for phase, step in path],
+    }
+
+class DagScheduler:
+    """
+    Runs steps on a thread pool as soon as their dependencies have completed.
+
+    `run_step(phase, step)` returns True on success. Once any step fails, or
+    `should_continue()` returns False, no new steps are started and the running
+    ones are allowed to finish.
+    """
+
+    def __init__(self, graph: Dict[StepKey, StepNode], run_step: Callable[[int, int], bool],
+                 max_workers: int = 4, should_continue: Callable[[], bool] = lambda: True,
+                 on_complete: Callable[[StepKey, float], None] = None):
+        self.graph = graph
+        self.run_step = run_step
+        self.max_workers = max(1, max_workers)
+        self.should_continue = should_continue
+        self.on_complete = on_complete
+        self.durations: Dict[StepKey, float] = {}
+        self.wall_clock = 0.0
+
+    def run(self, already_done: Set[StepKey] = frozenset()) -> Tuple[Set[StepKey], List[StepKey]]:
+        """Execute every step not in `already_done`. Returns (completed, failed)."""
+        done: Set[StepKey] = set(already_done)
+        failed: List[StepKey] = []
+        pending = [key for key in sorted(self.graph) if key not in done]
+        running: Dict = {}
+        held: Set[str] = set()
+        start_wall = time.time()
+
+        def timed(key):
+            start = time.time()
+            try:
+                return self.run_step(*key), time.time() - start
+            except Exception as e:
+                logger.error(f"Phase {key[0]}.Step {key[1]} raised: {e}")
+                return False, time.time() - start
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if not failed and self.should_continue():
+                    for key in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        node = self.graph[key]
+                        deps_met = all(dep in done or dep not in self.graph for dep in node.depends_on)
+                        if not deps_met or node.resources & held:
+                            continue
+                        pending.remove(key)
+                        held |= node.resources
+                        logger.info(f"Scheduling Phase {key[0]}.Step {key[1]} ({len(running) + 1} running)")
+                        running[pool.submit(timed, key)] = key
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = running.pop(future)
+                    held -= self.graph[key].resources
+                    success, duration = future.result()
+                    self.durations[key] = duration
+                    if success:
+                        done.add(key)
+                        if self.on_complete:
+                            self.on_complete(key, duration)
+                    else:
+                        failed.append(key)
+
+        self.wall_clock = time.time() - start_wall
+        return done, failed
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Thin client for tool_server.py.
+
+    tool_client.py llm --prompt "..." --provider anthropic
+    tool_client.py search "swiftui navigation" --format json
+    tool_client.py scrape https://example.com
+    tool_client.py screenshot https://example.com -o shot.png
+
+Everything after the tool name is passed through unchanged, and the tool's stdout,
+stderr and exit code are reproduced, so this is a drop-in replacement for running
+the tool scripts directly. The server for the current directory is started in the
+background on first use and exits after a period of inactivity. If it cannot be
+reached or started, the tool runs in this process instead.
+
+Only the standard library is imported here, so the client itself starts in a few
+milliseconds.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import runpy
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TOOLS_DIR = Path(__file__).resolve().parent
+SERVER_SCRIPT = TOOLS_DIR / "tool_server.py"
+# Short names accepted by the client and server; the module names work too
+TOOLS = {
+    "llm": "llm_api",
+    "search": "search_engine",
+    "scrape": "web_scraper",
+    "screenshot": "screenshot_utils",
+}
+START_TIMEOUT = 30.0  # Seconds to wait for a freshly started server (it imports every provider SDK)
+
+def socket_path(cwd: Optional[str] = None) -> Path:
+    """
+    Socket of the server for `cwd`.
+
+    Tools resolve relative paths and .env files against the working directory, so
+    each directory gets its own server. SUMMITAI_TOOL_SOCKET overrides the location.
+    """
+    override = os.getenv("SUMMITAI_TOOL_SOCKET")
+    if override:
+        return Path(override)
+    cwd = os.path.realpath(cwd or os.getcwd())
+    digest = hashlib.sha1(cwd.encode("utf-8")).hexdigest()[:12]
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"summitai-tools-{os.getuid()}-{digest}.sock"
+
+def module_name(tool: str) -> Optional[str]:
+    if tool in TOOLS:
+        return TOOLS[tool]
+    return tool if tool in TOOLS.values() else None
+
+def request(path: Path, payload: Dict, timeout: Optional[float] = None) -> Dict:
+    """Send one request to the server at `path` and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    if not chunks:
+        raise ConnectionError("Tool server closed the connection without a response")
+    return json.loads(b"".join(chunks))
+
+def start_server(path: Path) -> bool:
+    """Start a detached server listening on `path` and wait until it accepts requests."""
+    log = open(f"{path}.log", "ab")
+    try:
+        process = subprocess.Popen([sys.executable, str(SERVER_SCRIPT), "--socket", str(path)],
+                                   stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                                   start_new_session=True)
+    finally:
+        log.close()
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            request(path, {"command": "status"}, timeout=1.0)
+            return True
+        except (OSError, ValueError):
+            # Exit code 0 means another client's server won the race for the socket
+            if process.poll() not in (None, 0):
+                return False
+            time.sleep(0.05)
+    return False
+
+def run_in_process(module: str, argv: List[str]):
+    """Fallback: run the tool script here, exactly as if it had been invoked directly."""
+    sys.path.insert(0, str(TOOLS_DIR))
+    sys.argv = [str(TOOLS_DIR / f"{module}.py")] + argv
+    runpy.run_path(sys.argv[0], run_name="__main__")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run llm/search/scrape/screenshot through the resident tool server",
+        usage="%(prog)s [--socket PATH] [--no-start] [--stop | --status] TOOL [ARGS...]")
+    parser.add_argument("--socket", help="Server socket (default: per working directory)")
+    parser.add_argument("--no-start", action="store_true",
+                        help="Do not start a server; run the tool in-process if none is running")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--stop", action="store_true", help="Stop the server for this directory")
+    group.add_argument("--status", action="store_true", help="Print the server's status as JSON")
+    parser.add_argument("tool", nargs="?", help=f"One of: {', '.join(TOOLS)}")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the tool, as on its own command line")
+    args = parser.parse_args()
+    path = Path(args.socket) if args.socket else socket_path()
+
+    if args.stop or args.status:
+        try:
+            response = request(path, {"command": "shutdown" if args.stop else "status"}, timeout=10.0)
+        except OSError:
+            print("Tool server is not running", file=sys.stderr)
+            sys.exit(1)
+        if args.status:
+            print(json.dumps(response, indent=2))
+        return
+
+    if args.tool is None:
+        parser.error("a tool is required")
+    module = module_name(args.tool)
+    if module is None:
+        parser.error(f"unknown tool {args.tool!r} (choose from {', '.join(TOOLS)})")
+
+    payload = {"tool": module, "argv": args.args}
+    # Only read stdin when the tool will (e.g. search --queries-file -), so the client never blocks on a tty
+    if "-" in args.args:
+        payload["stdin"] = sys.stdin.read()
+
+    try:
+        response = request(path, payload)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No server yet (or a stale socket); a server that fails mid-request is not retried
+        if args.no_start or not start_server(path):
+            if "stdin" in payload:
+                sys.stdin = io.StringIO(payload["stdin"])
+            run_in_process(module, args.args)
+            return
+        response = request(path, payload)
+
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["exit_code"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Shared logging setup for the tools.
+
+Library modules only create `logging.getLogger(__name__)` loggers and log with
+%-style arguments, so a message is never formatted unless a handler will emit
+it. Entry points call configure_logging() once, which:
+
+- sets the level from the command line, else SUMMITAI_LOG_LEVEL, else the tool's
+  default;
+- writes text, or one JSON object per line with SUMMITAI_LOG_FORMAT=json;
+- puts a QueueHandler in front of the real handlers, so the calling thread only
+  enqueues a record and a QueueListener thread does the stream and file I/O;
+- samples high-volume records (see SamplingFilter), such as streamed command
+  output, at 1 in SUMMITAI_LOG_SAMPLE_EVERY after the first DEFAULT_SAMPLE_BURST;
+- turns down HTTP client chatter (one INFO line per request) unless at DEBUG.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional, Tuple, Union
+
+LEVEL_ENV = "SUMMITAI_LOG_LEVEL"
+FORMAT_ENV = "SUMMITAI_LOG_FORMAT"
+SAMPLE_EVERY_ENV = "SUMMITAI_LOG_SAMPLE_EVERY"
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DEFAULT_SAMPLE_EVERY = 20
+DEFAULT_SAMPLE_BURST = 50  # Records per sampling key always kept before sampling starts
+DEFAULT_SAMPLE_KEYS = 1024  # Sampling keys tracked at once; the least recently used is forgotten
+# Third-party loggers that log every request at INFO
+CHATTY_LOGGERS = ("httpx", "httpcore", "openai", "anthropic", "urllib3", "primp")
+# Standard LogRecord attributes; anything else on a record came from `extra` and goes into JSON output
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_configure_lock = threading.Lock()
+
+def parse_level(level: Union[str, int, None], default: int) -> int:
+    """A level name ("debug", "WARNING") or number, falling back to `default` when unset or unknown."""
+    if level is None or level == "":
+        return default
+    if isinstance(level, int):
+        return level
+    if level.isdigit():
+        return int(level)
+    value = logging.getLevelName(level.upper())
+    return value if isinstance(value, int) else default
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, any `extra` fields and the exception."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps the first `burst` records and then 1 in `every` for each sampling key.
+
+    Only records logged with `extra={"sample": key}` are sampled, and only below
+    WARNING. The key groups records that are alike, e.g. the output lines of one
+    command. Every kept record after sampling starts carries `sampled=every`.
+
+    Keys are usually per command, so only the `max_keys` most recently used are
+    counted; a forgotten key starts over with a fresh burst.
+    """
+
+    def __init__(self, every: int = DEFAULT_SAMPLE_EVERY, burst: int = DEFAULT_SAMPLE_BURST,
+                 max_keys: int = DEFAULT_SAMPLE_KEYS):
+        super().__init__()
+        self.every = max(1, every)
+        self.burst = burst
+        self.max_keys = max_keys
+        self._counts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None or self.every == 1 or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            count = self._counts.pop((record.name, key), 0) + 1
+            self._counts[(record.name, key)] = count
+            if len(self._counts) > self.max_keys:
+                self._counts.popitem(last=False)
+        if count <= self.burst:
+            return True
+        if (count - self.burst) % self.every:
+            return False
+        record.sampled = self.every
+        return True
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that keeps the exception text separate, so JSON output can still put it in its own field."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def configure_logging(level: Union[str, int, None] = None, default_level: int = logging.INFO,
+                      text_format: str = TEXT_FORMAT, stream=None, log_file: Optional[str] = None,
+                      json_format: Optional[bool] = None, use_queue: bool = True,
+                      sample_every: Optional[int] = None) -> bool:
+    """
+    Configure the root logger for a tool's command line entry point.
+
+    Does nothing and returns False if the root logger already has handlers, so a
+    host process (tool_server.py, a benchmark) that configured logging first keeps
+    its setup when it calls a tool's main().
+
+    Args:
+        level: Explicit level (e.g. from --debug); overrides SUMMITAI_LOG_LEVEL
+        default_level: Level when neither `level` nor SUMMITAI_LOG_LEVEL is set
+        text_format: Format for text output
+        stream: Stream for the console handler (default: stderr)
+        log_file: Also append to this file
+        json_format: JSON lines instead of text (default: SUMMITAI_LOG_FORMAT == "json")
+        use_queue: Hand records to a listener thread; pass False where handlers must
+            run in the logging thread (e.g. they write to a per-request stream)
+        sample_every: Keep 1 in this many sampled records (default: SUMMITAI_LOG_SAMPLE_EVERY)
+    """
+    global _listener
+    with _configure_lock:
+        root = logging.getLogger()
+        if root.handlers:
+            return False
+
+        resolved = parse_level(level, parse_level(os.getenv(LEVEL_ENV), default_level))
+        if json_format is None:
+            json_format = os.getenv(FORMAT_ENV, "text").lower() == "json"
+        formatter = JsonFormatter() if json_format else logging.Formatter(text_format)
+        if sample_every is None:
+            sample_every = int(os.getenv(SAMPLE_EVERY_ENV, DEFAULT_SAMPLE_EVERY))
+
+        handlers: List[logging.Handler] = [logging.StreamHandler(stream or sys.stderr)]
+        if log_file:
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        if use_queue:
+            log_queue = queue.SimpleQueue()  # Unbounded: logging never waits on a slow stream or disk
+            front = _NonBlockingQueueHandler(log_queue)
+            _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            _listener.start()
+            atexit.register(_stop_listener)
+            front_handlers = [front]
+        else:
+            front_handlers = handlers
+        for handler in front_handlers:
+            # Filters on the handler the record enters first, so dropped records are never enqueued
+            handler.addFilter(SamplingFilter(sample_every))
+            root.addHandler(handler)
+        root.setLevel(resolved)
+
+        if resolved > logging.DEBUG:
+            for name in CHATTY_LOGGERS:
+                logging.getLogger(name).setLevel(max(resolved, logging.WARNING))
+        return True
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Resident server for the llm, search, scrape and screenshot tools.
+
+Running each tool as its own script pays for interpreter start-up, importing every
+provider SDK and Playwright, a fresh HTTP connection per LLM call and a Chromium
+launch per scrape or screenshot. This process imports the tool modules once and
+keeps one LLM client per provider (llm_api.get_llm_client), a warm headless
+browser and a multiprocessing pool for HTML parsing across requests.
+
+Requests arrive on a Unix socket (tool_client.socket_path) as one JSON line:
+
+    {"tool": "search_engine", "argv": ["swiftui", "--format", "json"], "stdin": "..."}
+
+and are answered with {"stdout": ..., "stderr": ..., "exit_code": ...}, produced by
+the tool's own command line entry point, so output is the same as running the
+script. {"command": "status"} and {"command": "shutdown"} manage the server.
+Blocking tools (llm, search) run on worker threads; browser tools run on the event
+loop, where the browser lives. The server exits after DEFAULT_IDLE_TIMEOUT seconds
+without requests.
+
+Normally started on demand by tool_client.py.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import fcntl
+import importlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tool_client import TOOLS, socket_path
+from tool_logging import TEXT_FORMAT, configure_logging
+
+DEFAULT_IDLE_TIMEOUT = 1800  # Seconds without a request before the server exits
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+class _StreamProxy:
+    """
+    Stand-in for sys.stdout/stderr/stdin that resolves to the current request's stream.
+
+    Tools print to sys.stdout and their log handlers hold sys.stderr from import time,
+    so the proxies are installed before any tool is imported. Outside a request
+    (server start-up, threads without a request context) the real stream is used.
+    """
+
+    def __init__(self, stream):
+        self._default = stream
+        self._current = contextvars.ContextVar(f"stream_{id(self)}", default=None)
+
+    def _stream(self):
+        return self._current.get() or self._default
+
+    def bind(self, stream) -> contextvars.Token:
+        return self._current.set(stream)
+
+    def unbind(self, token: contextvars.Token):
+        self._current.reset(token)
+
+    def write(self, data):
+        return self._stream().write(data)
+
+    def flush(self):
+        return self._stream().flush()
+
+    def __iter__(self):
+        return iter(self._stream())
+
+    def __getattr__(self, name):
+        return getattr(self._stream(), name)
+
+class _Argv(list):
+    """sys.argv whose program name is the current request's tool script, for argparse usage lines."""
+
+    def __init__(self, argv: List[str]):
+        super().__init__(argv)
+        self._program = contextvars.ContextVar("program", default=argv[0])
+
+    def bind(self, program: str) -> contextvars.Token:
+        return self._program.set(program)
+
+    def unbind(self, token: contextvars.Token):
+        self._program.reset(token)
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self._program.get()
+        return super().__getitem__(index)
+
+ARGV = sys.argv = _Argv(sys.argv)
+STDOUT = sys.stdout = _StreamProxy(sys.stdout)
+STDERR = sys.stderr = _StreamProxy(sys.stderr)
+STDIN = sys.stdin = _StreamProxy(sys.stdin)
+
+logger = logging.getLogger(__name__)
+
+def _exit_code(exit: SystemExit) -> int:
+    """Exit status for a SystemExit the way the interpreter computes it, printing a message code."""
+    if exit.code is None:
+        return 0
+    if isinstance(exit.code, int):
+        return exit.code
+    print(exit.code, file=sys.stderr)
+    return 1
+
+class ToolServer:
+    def __init__(self, path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.path = Path(path)
+        self.idle_timeout = idle_timeout
+        self.modules: Dict[str, object] = {}
+        self.import_errors: Dict[str, str] = {}
+        self.pool = None
+        self.started = time.time()
+        self.last_request = time.monotonic()
+        self.active = 0
+        self.requests = 0
+        self._playwright = None
+        self._browser = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def load_tools(self):
+        """Import every tool module once; a tool whose dependencies are missing reports that per request."""
+        # Search logs warnings only and the scraper INFO, as on their command lines. Handlers run in the
+        # logging thread (no queue) so records land in the calling request's stderr buffer.
+        configure_logging(default_level=logging.WARNING, text_format="%(levelname)s: %(message)s",
+                          stream=sys.stderr, use_queue=False)
+        for module in TOOLS.values():
+            try:
+                self.modules[module] = importlib.import_module(module)
+            except Exception as e:
+                self.import_errors[module] = f"{type(e).__name__}: {e}"
+                logger.warning(f"{module} unavailable: {self.import_errors[module]}")
+        if "web_scraper" in self.modules:
+            scraper_logger = logging.getLogger("web_scraper")
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+            # DEBUG records only reach the stderr of requests run with --debug
+            handler.addFilter(self.modules["web_scraper"].RequestDebugFilter())
+            scraper_logger.addHandler(handler)
+            scraper_logger.setLevel(logging.DEBUG)
+            scraper_logger.propagate = False
+            # Forked before the event loop and its worker threads start
+            from multiprocessing import Pool
+            self.pool = Pool()
+
+    async def browser(self):
+        """The shared headless browser, launched on first use and relaunched if it died."""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                logger.info("Browser launched")
+            return self._browser
+
+    async def _run_tool(self, module_name: str, argv: List[str]) -> int:
+        module = self.modules[module_name]
+        try:
+            if module_name == "screenshot_utils":
+                parser = module.build_parser()
+                await module.run(parser.parse_args(argv), parser, browser=await self.browser())
+            elif module_name == "web_scraper":
+                await module.run(module.build_parser().parse_args(argv), await self.browser(), self.pool)
+            else:
+                # to_thread copies the request's context, so the thread prints into its buffers
+                await asyncio.to_thread(module.main, argv)
+        except SystemExit as e:
+            return _exit_code(e)
+        except Exception:
+            traceback.print_exc()
+            return 1
+        return 0
+
+    async def _call(self, request: Dict) -> Dict:
+        module_name = request.get("tool")
+        module_name = TOOLS.get(module_name, module_name)
+        if module_name not in TOOLS.values():
+            return {"stdout": "", "stderr": f"Unknown tool: {request.get('tool')}\n", "exit_code": 2}
+        if module_name in self.import_errors:
+            return {"stdout": "", "stderr": f"{module_name} unavailable: {self.import_errors[module_name]}\n",
+                    "exit_code": 1}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        tokens = [(STDOUT, STDOUT.bind(stdout)), (STDERR, STDERR.bind(stderr)),
+                  (STDIN, STDIN.bind(io.StringIO(request.get("stdin") or ""))),
+                  (ARGV, ARGV.bind(f"{module_name}.py"))]
+        try:
+            exit_code = await self._run_tool(module_name, list(request.get("argv", [])))
+        finally:
+            for proxy, token in tokens:
+                proxy.unbind(token)
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+    def status(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "cwd": os.getcwd(),
+            "socket": str(self.path),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "active": self.active,
+            "tools": {module: self.import_errors.get(module, "loaded") for module in TOOLS.values()},
+            "browser": self._browser is not None and self._browser.is_connected(),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.active += 1
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                response = {"stdout": "", "stderr": "Malformed request\n", "exit_code": 2}
+            else:
+                command = request.get("command")
+                if command == "status":
+                    response = self.status()
+                elif command == "shutdown":
+                    response = {"stopping": True}
+                    self._stopping.set()
+                else:
+                    self.requests += 1
+                    response = await self._call(request)
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+        finally:
+            self.active -= 1
+            self.last_request = time.monotonic()
+            writer.close()
+
+    async def _watch_idle(self):
+        while not self._stopping.is_set():
+            await asyncio.sleep(min(60.0, self.idle_timeout / 4))
+            if not self.active and time.monotonic() - self.last_request > self.idle_timeout:
+                logger.info(f"Idle for {self.idle_timeout}s, exiting")
+                self._stopping.set()
+
+    async def serve(self):
+        self._browser_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        if self.path.exists():
+            self.path.unlink()  # Stale: the lock in main() proves no other server owns it
+        server = await asyncio.start_unix_server(self._handle, path=str(self.path), limit=MAX_REQUEST_BYTES)
+        os.chmod(self.path, 0o600)
+        logger.info(f"Tool server {os.getpid()} listening on {self.path}")
+        watcher = asyncio.create_task(self._watch_idle())
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            watcher.cancel()
+            if self.path.exists():
+                self.path.unlink()
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+            if self.pool is not None:
+                self.pool.terminate()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the llm/search/scrape/screenshot tools over a Unix socket")
+    parser.add_argument("--socket", help="Socket path (default: per working directory, see tool_client.py)")
+    parser.add_argument("--idle-timeout", type=float,
+                        default=float(os.getenv("SUMMITAI_TOOL_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT)),
+                        help=f"Exit after this many seconds without requests (default: {DEFAULT_IDLE_TIMEOUT})")
+    args = parser.parse_args()
+    path = Path(args.socket) if args.socket else socket_path()
+
+    # One server per socket: a second one started by a racing client exits quietly
+    lock = open(f"{path}.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print(f"A tool server is already listening on {path}", file=sys.stderr)
+        return
+
+    server = ToolServer(path, args.idle_timeout)
+    server.load_tools()
+    logger.setLevel(logging.INFO)
+    asyncio.run(server.serve())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import AsyncIterator, Dict, List
+
+from playwright.async_api import async_playwright
+
+from llm_api import create_llm_client, query_llm
+from screenshot_utils import DEFAULT_VIEWPORT, IMAGE_FORMATS, capture_page, normalize_format
+
+_STAGE_DONE = object()
+
+async def run_vision_pipeline(jobs: List[Dict], provider: str = "openai", model: str = None,
+                              capture_workers: int = 2, llm_workers: int = 4, queue_size: int = 4,
+                              width: int = DEFAULT_VIEWPORT[0], height: int = DEFAULT_VIEWPORT[1],
+                              stats: Dict = None, **capture_options) -> AsyncIterator[Dict]:
+    """
+    Screenshot each URL and ask the vision model about it, overlapping the two stages.
+
+    Capture workers share one browser and hand images over through a queue of at most
+    `queue_size` items, so a slow model applies back-pressure instead of piling images
+    up in memory. LLM workers send each image as soon as it is ready.
+
+    Args:
+        jobs (List[Dict]): {"url", "prompt"} items
+        stats (Dict, optional): Filled with per-stage busy seconds, worker counts and wall time
+
+    Yields:
+        Dict: {"url", "prompt", "response", "error", "capture_s", "queue_wait_s", "inference_s"}
+        in completion order
+    """
+    image_format = normalize_format(capture_options.pop('image_format', None))
+    mime_type = f"image/{'jpeg' if image_format == 'jpeg' else image_format}"
+    client = create_llm_client(provider)
+
+    pending = asyncio.Queue()
+    for job in jobs:
+        pending.put_nowait(job)
+    captured = asyncio.Queue(maxsize=max(1, queue_size))
+    results = asyncio.Queue()
+    busy = {"capture": 0.0, "inference": 0.0}
+    capture_workers = max(1, min(capture_workers, len(jobs) or 1))
+    llm_workers = max(1, llm_workers)
+
+    async def capture(browser):
+        page = await browser.new_page(viewport={'width': width, 'height': height})
+        try:
+            while not pending.empty():
+                job = pending.get_nowait()
+                record = {"url": job["url"], "prompt": job["prompt"], "response": None, "error": None}
+                start = time.perf_counter()
+                try:
+                    await page.goto(job["url"], wait_until='networkidle')
+                    image = await capture_page(page, image_format, **capture_options)
+                except Exception as e:
+                    image = None
+                    record["error"] = f"capture failed: {e}"
+                record["capture_s"] = round(time.perf_counter() - start, 3)
+                busy["capture"] += record["capture_s"]
+                await captured.put((record, image, time.perf_counter()))
+        finally:
+            await page.close()
+
+    async def infer():
+        while True:
+            item = await captured.get()
+            if item is _STAGE_DONE:
+                break
+            record, image, queued_at = item
+            record["queue_wait_s"] = round(time.perf_counter() - queued_at, 3)
+            start = time.perf_counter()
+            if image is not None:
+                record["response"] = await asyncio.to_thread(
+                    query_llm, record["prompt"], client, model, provider,
+                    image_bytes=image, image_mime_type=mime_type)
+                if record["response"] is None:
+                    record["error"] = "LLM query failed"
+            record["inference_s"] = round(time.perf_counter() - start, 3)
+            busy["inference"] += record["inference_s"]
+            await results.put(record)
+        await results.put(_STAGE_DONE)
+
+    wall_start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            capture_tasks = [asyncio.create_task(capture(browser)) for _ in range(capture_workers)]
+            infer_tasks = [asyncio.create_task(infer()) for _ in range(llm_workers)]
+
+            async def close_capture_stage():
+                try:
+                    await asyncio.gather(*capture_tasks)
+                finally:
+                    for _ in infer_tasks:
+                        await captured.put(_STAGE_DONE)
+            closer = asyncio.create_task(close_capture_stage())
+
+            remaining = len(infer_tasks)
+            while remaining:
+                record = await results.get()
+                if record is _STAGE_DONE:
+                    remaining -= 1
+                else:
+                    yield record
+            await closer
+        finally:
+            await browser.close()
+
+    if stats is not None:
+        stats.update({
+            "wall_s": round(time.perf_counter() - wall_start, 3),
+            "capture_busy_s": round(busy["capture"], 3),
+            "inference_busy_s": round(busy["inference"], 3),
+            "capture_workers": capture_workers,
+            "llm_workers": llm_workers,
+        })
+
+def summarize(stats: Dict) -> str:
+    """One-line per-stage utilisation summary naming the bottleneck stage."""
+    wall = max(stats["wall_s"], 1e-9)
+    capture_util = stats["capture_busy_s"] / (stats["capture_workers"] * wall)
+    inference_util = stats["inference_busy_s"] / (stats["llm_workers"] * wall)
+    bottleneck = "capture" if capture_util >= inference_util else "inference"
+    return (f"wall {stats['wall_s']:.2f}s | capture busy {stats['capture_busy_s']:.2f}s "
+            f"({capture_util:.0%} of {stats['capture_workers']} workers) | inference busy "
+            f"{stats['inference_busy_s']:.2f}s ({inference_util:.0%} of {stats['llm_workers']} workers) "
+            f"| bottleneck: {bottleneck}")
+
+def read_jobs(path: str, default_prompt: str = None) -> List[Dict]:
+    """
+    Read jobs from a file ('-' for stdin): JSON lines with "url" and optional "prompt",
+    or plain lines holding just a URL.
+    """
+    lines = sys.stdin.read().splitlines() if path == '-' else open(path).read().splitlines()
+    jobs = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        job = json.loads(line) if line.startswith('{') else {"url": line}
+        job.setdefault("prompt", default_prompt)
+        if not job["prompt"]:
+            raise ValueError(f"No prompt for {job['url']}; pass --prompt or add one to the job")
+        jobs.append(job)
+    return jobs
+
+async def _main(args) -> int:
+    jobs = [{"url": url, "prompt": args.prompt} for url in args.urls]
+    if args.jobs:
+        jobs += read_jobs(args.jobs, args.prompt)
+    stats = {}
+    failed = 0
+    async for record in run_vision_pipeline(
+            jobs, provider=args.provider, model=args.model, capture_workers=args.capture_workers,
+            llm_workers=args.llm_workers, queue_size=args.queue_size, width=args.width,
+            height=args.height, stats=stats, image_format=args.image_format, quality=args.quality,
+            max_pixels=args.max_pixels, max_bytes=args.max_bytes):
+        failed += record["error"] is not None
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+    print(summarize(stats), file=sys.stderr)
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Screenshot URLs and query a vision model about each, emitting JSON lines')
+    parser.add_argument('urls', nargs='*', help='URLs to capture (use --prompt)')
+    parser.add_argument('--jobs', help="JSONL file of {\"url\", \"prompt\"} jobs ('-' reads stdin)")
+    parser.add_argument('--prompt', help='Prompt for URLs without their own')
+    parser.add_argument('--provider', choices=['openai', 'anthropic', 'gemini'], default='openai',
+                        help='Vision-capable API provider')
+    parser.add_argument('--model', help='The model to use (default depends on provider)')
+    parser.add_argument('--capture-workers', type=int, default=2, help='Concurrent browser pages (default: 2)')
+    parser.add_argument('--llm-workers', type=int, default=4, help='Concurrent LLM requests (default: 4)')
+    parser.add_argument('--queue-size', type=int, default=4,
+                        help='Captured images waiting for the LLM before capture pauses (default: 4)')
+    parser.add_argument('--width', '-w', type=int, default=DEFAULT_VIEWPORT[0], help='Viewport width')
+    parser.add_argument('--height', '-H', type=int, default=DEFAULT_VIEWPORT[1], help='Viewport height')
+    parser.add_argument('--format', '-f', dest='image_format', choices=sorted(IMAGE_FORMATS), default='jpeg',
+                        help='Image format sent to the model (default: jpeg)')
+    parser.add_argument('--quality', '-q', type=int, help='JPEG/WebP quality 1-100')
+    parser.add_argument('--max-pixels', type=int, default=1568 * 1568,
+                        help='Downscale screenshots to at most this many pixels (default: 1568x1568)')
+    parser.add_argument('--max-bytes', type=int, help='Shrink screenshots to at most this many bytes')
+    args = parser.parse_args()
+
+    if not args.urls and not args.jobs:
+        parser.error('provide URLs or --jobs')
+    if args.urls and not args.prompt:
+        parser.error('--prompt is required for URLs given on the command line')
+
+    failed = asyncio.run(_main(args))
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -2,36 +2,33 @@
 
 import asyncio
 import argparse
+import contextvars
 import sys
 import os
 from typing import List, Optional
-from playwright.async_api import async_playwright
 import html5lib
 from multiprocessing import Pool
 import time
 from urllib.parse import urlparse
 import logging
+from screenshot_utils import browser_session
+from search_index import DEFAULT_INDEX_PATH, SearchIndex, extract_title
+from tool_logging import configure_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    stream=sys.stderr
-)
 logger = logging.getLogger(__name__)
 
 async def fetch_page(url: str, context) -> Optional[str]:
     """Asynchronously fetch a webpage's content."""
     page = await context.new_page()
     try:
-        logger.info(f"Fetching {url}")
+        logger.info("Fetching %s", url)
         await page.goto(url)
         await page.wait_for_load_state('networkidle')
         content = await page.content()
-        logger.info(f"Successfully fetched {url}")
+        logger.info("Successfully fetched %s", url)
         return content
     except Exception as e:
-        logger.error(f"Error fetching {url}: {str(e)}")
+        logger.error("Error fetching %s: %s", url, e)
         return None
     finally:
         await page.close()
@@ -123,10 +120,17 @@ def parse_html(html_content: Optional[str]) -> str:
         logger.error(f"Error parsing HTML: {str(e)}")
         return ""
 
-async def process_urls(urls: List[str], max_concurrent: int = 5) -> List[str]:
-    """Process multiple URLs concurrently."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
+async def process_urls(urls: List[str], max_concurrent: int = 5, index=None,
+                       browser=None, pool=None) -> List[str]:
+    """Process multiple URLs concurrently.
+
+    If a SearchIndex is given, every page with text is added to it as it is parsed,
+    so later searches can be answered locally. A long-lived caller (tool_server.py)
+    can pass its own running browser and multiprocessing pool; otherwise both are
+    created for this call and torn down afterwards.
+    """
+    async with browser_session(browser) as browser:
+        contexts = []
         try:
             # Create browser contexts
             n_contexts = min(len(urls), max_concurrent)
@@ -142,9 +146,17 @@ async def process_urls(urls: List[str], max_concurrent: int = 5) -> List[str]:
             # Gather results
             html_contents = await asyncio.gather(*tasks)
             
-            # Parse HTML contents in parallel
-            with Pool() as pool:
-                results = pool.map(parse_html, html_contents)
+            # Parse HTML contents in parallel, off the event loop so a host's other requests keep running
+            loop = asyncio.get_running_loop()
+            if pool is not None:
+                results = await loop.run_in_executor(None, pool.map, parse_html, html_contents)
+            else:
+                with Pool() as pool:
+                    results = await loop.run_in_executor(None, pool.map, parse_html, html_contents)
+
+            if index is not None:
+                for url, html, text in zip(urls, html_contents, results):
+                    index.add_page(url, text, extract_title(html))
                 
             return results
             
@@ -152,7 +164,6 @@ async def process_urls(urls: List[str], max_concurrent: int = 5) -> List[str]:
             # Cleanup
             for context in contexts:
                 await context.close()
-            await browser.close()
 
 def validate_url(url: str) -> bool:
     """Validate if the given string is a valid URL."""
@@ -162,19 +173,37 @@ def validate_url(url: str) -> bool:
     except:
         return False
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Fetch and extract text content from webpages.')
     parser.add_argument('urls', nargs='+', help='URLs to process')
     parser.add_argument('--max-concurrent', type=int, default=5,
                        help='Maximum number of concurrent browser instances (default: 5)')
+    parser.add_argument('--index', nargs='?', const=str(DEFAULT_INDEX_PATH),
+                       help='Add scraped pages to the local search index '
+                            f'(default location: {DEFAULT_INDEX_PATH})')
     parser.add_argument('--debug', action='store_true',
                        help='Enable debug logging')
-    
-    args = parser.parse_args()
-    
-    if args.debug:
-        logger.setLevel(logging.DEBUG)
-    
+    return parser
+
+# --debug of the request being served; a resident host filters debug records with RequestDebugFilter
+_request_debug = contextvars.ContextVar("web_scraper_debug", default=False)
+
+class RequestDebugFilter(logging.Filter):
+    """Passes DEBUG records only for requests run with --debug, for a host that keeps this logger at DEBUG."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or _request_debug.get()
+
+async def run(args, browser=None, pool=None):
+    """The command line tool's behaviour for parsed `args`, optionally on an already running browser and pool."""
+    # main() sets the level for the command line; the logger's level is shared, so it is not changed here
+    token = _request_debug.set(args.debug)
+    try:
+        return await _run(args, browser, pool)
+    finally:
+        _request_debug.reset(token)
+
+async def _run(args, browser, pool):
     # Validate URLs
     valid_urls = []
     for url in args.urls:
@@ -189,7 +218,8 @@ def main():
     
     start_time = time.time()
     try:
-        results = asyncio.run(process_urls(valid_urls, args.max_concurrent))
+        index = SearchIndex(args.index) if args.index else None
+        results = await process_urls(valid_urls, args.max_concurrent, index, browser, pool)
         
         # Print results to stdout
         for url, text in zip(valid_urls, results):
@@ -203,5 +233,10 @@ def main():
         logger.error(f"Error during execution: {str(e)}")
         sys.exit(1)
 
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    configure_logging(logging.DEBUG if args.debug else None)
+    asyncio.run(run(args))
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Sharded execution of the 400-step plan across git worktrees.
+
+Each phase whose dependencies (step_scheduler.PHASE_DEPENDENCIES) are merged gets
+its own shard: a project root under PROJECT_ROOT/.shards/phase-N whose SummitAI
+directory is a `git worktree` on branch shard/phase-N, driven by its own executor
+in a worker process. Finished shards are merged back into the main tree in
+dependency order. Conflicts are detected with `git merge-tree` before the working
+tree is touched; a conflicting or failed shard fails its phase and every phase
+that depends on it, and its worktree is left in place for inspection.
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from step_ledger import StepLedger
+from step_scheduler import PHASE_DEPENDENCIES, phase_order
+from tool_logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+SHARDS_DIR = ".shards"
+BRANCH_PREFIX = "shard/phase-"
+# Read-only project-root files every shard reads; symlinked so edits to the plan are seen everywhere
+SHARED_FILES = ("SUMMITAI_PERFECT_EXECUTION_PLAN.md",)
+# Project-root files each shard's executor rewrites; copied, since shards run concurrently
+COPIED_FILES = ("execution_context.json",)
+
+@dataclass
+class ShardResult:
+    phase: int
+    success: bool
+    head: Optional[str] = None
+    completed_steps: List[Tuple[int, int]] = field(default_factory=list)
+    error: Optional[str] = None
+
+def _run_shard(executor_cls, shard_root: str, phase: int, executor_kwargs: Dict,
+               setup_logging: Optional[Callable[[], None]] = None) -> ShardResult:
+    """Worker process entry point: run one phase in its shard.
+
+    The executor's module is already loaded here, unpickled with `executor_cls` (as
+    __mp_main__ when the executor runs as a script); importing it again by name would
+    re-register its step handlers, so its logging setup arrives as `setup_logging`.
+    """
+    (setup_logging or configure_logging)()
+    executor = executor_cls(shard_root, **executor_kwargs)
+    try:
+        success = executor.execute_phase(phase)
+        return ShardResult(phase, success, executor.git.head_commit(),
+                           sorted(key for key in executor.completed_step_keys if key[0] == phase))
+    except Exception as e:
+        return ShardResult(phase, False, error=f"{type(e).__name__}: {e}")
+    finally:
+        executor.git.close()
+        executor.command_runner.close()
+
+class ShardedRun:
+    """
+    Runs the phases of `executor`'s project in worktree shards on `max_workers` processes.
+
+    Phases with no dependencies (phase 1, which creates the repository) run in the
+    main tree first. Everything else is sharded.
+    """
+
+    def __init__(self, executor, max_workers: int, dependencies: Dict[int, List[int]] = None,
+                 setup_logging: Optional[Callable[[], None]] = None):
+        self.executor = executor
+        self.setup_logging = setup_logging  # Picklable, module-level; run first in each worker process
+        self.max_workers = max(1, max_workers)
+        self.dependencies = dependencies or PHASE_DEPENDENCIES
+        self.shards_root = executor.project_root / SHARDS_DIR
+        self.merged: Set[int] = set()
+        self.failed: Set[int] = set()
+
+    def _phase_complete(self, phase: int) -> bool:
+        steps = self.executor.context["steps_per_phase"]
+        return all((phase, step) in self.executor.completed_step_keys for step in range(1, steps + 1))
+
+    def _shard_root(self, phase: int) -> Path:
+        return self.shards_root / f"phase-{phase}"
+
+    def _create_shard(self, phase: int) -> Path:
+        """Create (or recreate) the shard root and its worktree at the main tree's HEAD."""
+        git = self.executor.git
+        shard_root = self._shard_root(phase)
+        self._remove_shard(phase)
+        shard_root.mkdir(parents=True)
+        for name in SHARED_FILES:
+            source = self.executor.project_root / name
+            if source.exists():
+                os.symlink(source.resolve(), shard_root / name)
+        for name in COPIED_FILES:
+            source = self.executor.project_root / name
+            if source.exists():
+                shutil.copyfile(source, shard_root / name)
+        # Steps of this phase already committed on the main tree are skipped in the shard too
+        StepLedger(shard_root / "step_ledger.jsonl").absorb(self.executor.step_ledger, phase)
+        success, _, stderr = git.run("worktree", "add", "-B", f"{BRANCH_PREFIX}{phase}",
+                                     str(shard_root / "SummitAI"), "HEAD")
+        if not success:
+            raise RuntimeError(f"Could not create worktree for phase {phase}: {stderr.strip()}")
+        return shard_root
+
+    def _remove_shard(self, phase: int):
+        git = self.executor.git
+        shard_root = self._shard_root(phase)
+        if (shard_root / "SummitAI").exists():
+            git.run("worktree", "remove", "--force", str(shard_root / "SummitAI"))
+        shutil.rmtree(shard_root, ignore_errors=True)
+        git.run("worktree", "prune")
+
+    def _merge(self, result: ShardResult) -> bool:
+        """Merge a finished shard's branch into the main tree, refusing on conflicts."""
+        git = self.executor.git
+        branch = f"{BRANCH_PREFIX}{result.phase}"
+        with self.executor._repo_lock:
+            conflicts = git.merge_conflicts("HEAD", branch)
+            if conflicts:
+                logger.error(f"Phase {result.phase} shard conflicts with the main tree in: {', '.join(conflicts)}")
+                return False
+            success, _, stderr = git.run("merge", "--no-ff", "-m", f"Merge phase {result.phase} shard", branch)
+            if not success:
+                # Only reachable without merge-tree --write-tree (git < 2.38)
+                _, unmerged, _ = git.run("diff", "--name-only", "--diff-filter=U")
+                git.run("merge", "--abort")
+                logger.error(f"Phase {result.phase} shard did not merge cleanly "
+                             f"({', '.join(unmerged.split()) or stderr.strip()})")
+                return False
+        return True
+
+    def _absorb(self, result: ShardResult):
+        """Take over the shard's ledger entries, timing records and progress now that its commits are in HEAD."""
+        executor = self.executor
+        shard_root = self._shard_root(result.phase)
+        executor.step_ledger.absorb(StepLedger(shard_root / "step_ledger.jsonl"), result.phase)
+        # Before _remove_shard deletes them, so the dashboard and simulations see sharded steps
+        executor.profiler.absorb(shard_root / "step_timings.jsonl")
+        for key in map(tuple, result.completed_steps):
+            if key not in executor.completed_step_keys:
+                executor.completed_step_keys.add(key)
+                executor.completed_steps += 1
+        executor._save_progress()
+
+    def _blocked(self, phase: int) -> bool:
+        return any(dep in self.failed for dep in self.dependencies.get(phase, []))
+
+    def _ready(self, phase: int) -> bool:
+        return all(dep in self.merged for dep in self.dependencies.get(phase, []))
+
+    def run(self) -> bool:
+        executor = self.executor
+        pending = []
+        for phase in phase_order(self.dependencies):
+            if self._phase_complete(phase):
+                self.merged.add(phase)
+            elif not self.dependencies.get(phase):
+                if not executor.execute_phase(phase):
+                    return False
+                self.merged.add(phase)
+            else:
+                pending.append(phase)
+
+        running: Dict[Future, int] = {}
+        executor_kwargs = {"build_command": executor.build_command, "commit_every": executor.commit_every,
+                           "llm_provider": executor.llm_provider, "llm_model": executor.llm_model}
+        # spawn, not fork: the parent has command-runner and cat-file threads running
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(self.max_workers, mp_context=context) as pool:
+            while (pending or running) and executor.running:
+                for phase in list(pending):
+                    if self._blocked(phase):
+                        pending.remove(phase)
+                        self.failed.add(phase)
+                        logger.error(f"Phase {phase} skipped: a phase it depends on failed")
+                    elif self._ready(phase) and len(running) < self.max_workers:
+                        pending.remove(phase)
+                        shard_root = self._create_shard(phase)
+                        logger.info(f"=== PHASE {phase} STARTED IN SHARD {shard_root} ===")
+                        running[pool.submit(_run_shard, type(executor), str(shard_root), phase,
+                                            executor_kwargs, self.setup_logging)] = phase
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: phase_order(self.dependencies).index(running[f])):
+                    phase = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = ShardResult(phase, False, error=f"{type(e).__name__}: {e}")
+                    if result.success and self._merge(result):
+                        self._absorb(result)
+                        self.merged.add(phase)
+                        self._remove_shard(phase)
+                        executor.git.run("branch", "-D", f"{BRANCH_PREFIX}{phase}")
+                        logger.info(f"=== PHASE {phase} MERGED ({len(self.merged)}/{len(self.dependencies)}) ===")
+                    else:
+                        self.failed.add(phase)
+                        logger.error(f"Phase {phase} shard failed{': ' + result.error if result.error else ''}; "
+                                     f"worktree kept at {self._shard_root(phase)}")
+
+        if self.failed or pending:
+            logger.error(f"Sharded execution incomplete: failed phases {sorted(self.failed)}")
+            return False
+        return True